@@ -0,0 +1,736 @@
+import itertools
+import operator
+from array import array
+
+from employee import PRESIDENT
+from name_index import NameIndex
+from organization_manager import OrganizationManager, journaled
+from views import FrozenSpot
+from results import Status
+from snapshot import ROLE_BY_CODE, VACANT_BY_CODE, VACANT_FLAG
+
+try:
+    import numpy as np
+except ImportError:     # NumPy only speeds up the analytics passes, everything else uses the array module
+    np = None
+
+NO_ROW = -1
+
+# Row states
+FREE = 0
+FILLED = 1
+VACANT = 2
+
+# Snapshot role bytes to row state, for bytes.translate
+STATE_BY_CODE = bytes(VACANT if code & VACANT_FLAG else FILLED for code in range(256))
+
+class SpotRow:
+    # View of one row, so the checks in OrganizationManager read the same on both backends.
+    __slots__ = ("org", "row")
+
+    def __init__(self, org, row):
+        self.org = org
+        self.row = row
+
+    @property
+    def name(self):
+        return self.org.names[self.row]
+
+    @property
+    def role_code(self):
+        return self.org.role_codes[self.row]
+
+    @property
+    def role(self):
+        return self.org.ladder.roles[self.org.role_codes[self.row]]
+
+    @property
+    def max_reports(self):
+        return self.org.ladder.capacities[self.org.role_codes[self.row]]
+
+    @property
+    def boss(self):
+        boss = self.org.bosses[self.row]
+        return None if boss == NO_ROW else SpotRow(self.org, boss)
+
+    @property
+    def reports(self):
+        return [SpotRow(self.org, row) for row in self.org._report_rows(self.row)]
+
+    def is_vacant(self):
+        return self.org.states[self.row] == VACANT
+
+    def __eq__(self, other):
+        return isinstance(other, SpotRow) and other.org is self.org and other.row == self.row
+
+    def __hash__(self):
+        return hash(self.row)
+
+class ArrayOrganizationManager(OrganizationManager):
+    # OrganizationManager backed by integer-indexed columns instead of a graph of Employee objects.
+    # Every seat is a row; reports form a doubly linked list through first/last child and sibling columns.
+    def __init__(self, sink=None, ladder=None):
+        super().__init__(sink, ladder)
+        self.names = []                     # Employee name per row, None for vacancies and free rows
+        self.states = array("b")            # FREE, FILLED or VACANT
+        self.role_codes = array("b")
+        self.bosses = array("q")
+        self.first_reports = array("q")
+        self.last_reports = array("q")
+        self.next_siblings = array("q")
+        self.prev_siblings = array("q")
+        self.report_counts = array("l")     # Direct reports, vacancies included
+        self.vacancy_counts = array("l")    # Direct reports that are vacancies
+        self.free_rows = []
+
+    # ----- Row Helpers -----
+
+    def _new_row(self, role_code, name, boss):
+        # Takes a free row, or grows every column by one.
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self._frozen.pop(row, None)
+            self.names[row] = name
+            self.states[row] = FILLED if name is not None else VACANT
+            self.role_codes[row] = role_code
+            self.bosses[row] = boss
+            self.first_reports[row] = NO_ROW
+            self.last_reports[row] = NO_ROW
+            self.next_siblings[row] = NO_ROW
+            self.prev_siblings[row] = NO_ROW
+            self.report_counts[row] = 0
+            self.vacancy_counts[row] = 0
+            return row
+        row = len(self.names)
+        self.names.append(name)
+        self.states.append(FILLED if name is not None else VACANT)
+        self.role_codes.append(role_code)
+        self.bosses.append(boss)
+        self.first_reports.append(NO_ROW)
+        self.last_reports.append(NO_ROW)
+        self.next_siblings.append(NO_ROW)
+        self.prev_siblings.append(NO_ROW)
+        self.report_counts.append(0)
+        self.vacancy_counts.append(0)
+        return row
+
+    def _free_row(self, row):
+        self._frozen.pop(row, None)
+        self.names[row] = None
+        self.states[row] = FREE
+        self.free_rows.append(row)
+
+    def _report_rows(self, row):
+        # Yields the rows directly below row, in report order.
+        report = self.first_reports[row]
+        while report != NO_ROW:
+            yield report
+            report = self.next_siblings[report]
+
+    def _link_last(self, boss, row):
+        # Appends row to the end of boss's reports.
+        self._forget_frozen(boss)
+        last = self.last_reports[boss]
+        self.bosses[row] = boss
+        self.prev_siblings[row] = last
+        self.next_siblings[row] = NO_ROW
+        if last == NO_ROW:
+            self.first_reports[boss] = row
+        else:
+            self.next_siblings[last] = row
+        self.last_reports[boss] = row
+        self.report_counts[boss] += 1
+        if self.states[row] == VACANT:
+            self.vacancy_counts[boss] += 1
+
+    def _unlink(self, row):
+        # Detaches row from its boss's reports.
+        boss = self.bosses[row]
+        self._forget_frozen(boss)
+        prev = self.prev_siblings[row]
+        following = self.next_siblings[row]
+        if prev == NO_ROW:
+            self.first_reports[boss] = following
+        else:
+            self.next_siblings[prev] = following
+        if following == NO_ROW:
+            self.last_reports[boss] = prev
+        else:
+            self.prev_siblings[following] = prev
+        self.report_counts[boss] -= 1
+        if self.states[row] == VACANT:
+            self.vacancy_counts[boss] -= 1
+        self.bosses[row] = NO_ROW
+
+    def _swap_in(self, old, new):
+        # Puts new in old's place among old's siblings. Counts are the caller's job.
+        boss = self.bosses[old]
+        self._forget_frozen(boss)
+        self._frozen.pop(old, None)
+        self._frozen.pop(new, None)
+        prev = self.prev_siblings[old]
+        following = self.next_siblings[old]
+        self.bosses[new] = boss
+        self.prev_siblings[new] = prev
+        self.next_siblings[new] = following
+        if prev == NO_ROW:
+            self.first_reports[boss] = new
+        else:
+            self.next_siblings[prev] = new
+        if following == NO_ROW:
+            self.last_reports[boss] = new
+        else:
+            self.prev_siblings[following] = new
+
+    def _append_reports(self, row, source):
+        # Moves every report of source to the end of row's reports.
+        first = self.first_reports[source]
+        if first == NO_ROW:
+            return
+        self._forget_frozen(row)
+        self._frozen.pop(source, None)
+        for report in self._report_rows(source):
+            self.bosses[report] = row
+        last = self.last_reports[row]
+        if last == NO_ROW:
+            self.first_reports[row] = first
+        else:
+            self.next_siblings[last] = first
+            self.prev_siblings[first] = last
+        self.last_reports[row] = self.last_reports[source]
+        self.report_counts[row] += self.report_counts[source]
+        self.vacancy_counts[row] += self.vacancy_counts[source]
+        self.first_reports[source] = NO_ROW
+        self.last_reports[source] = NO_ROW
+        self.report_counts[source] = 0
+        self.vacancy_counts[source] = 0
+
+    def _has_opening(self, row):
+        # True for a filled spot with a free slot or a Vacancy below it.
+        return self.states[row] == FILLED and (
+            self.report_counts[row] < self.ladder.capacities[self.role_codes[row]] or self.vacancy_counts[row] > 0)
+
+    def _forget_frozen(self, row):
+        # Drops the frozen copies of row and everyone above it, once row itself changed. Copies are built from the
+        # bottom up, so the first row without one has none above it either and the walk stops there.
+        frozen = self._frozen
+        while row != NO_ROW and frozen.pop(row, None) is not None:
+            row = self.bosses[row]
+
+    def _freeze(self):
+        # Same as OrganizationManager._freeze, over rows.
+        if self.president is None:
+            return None
+        frozen = self._frozen
+        names, states, role_codes, roles = self.names, self.states, self.role_codes, self.ladder.roles
+        stack = [(self.president.row, False)]
+        while stack:
+            row, reports_ready = stack.pop()
+            if row in frozen:
+                continue
+            if not reports_ready:
+                stack.append((row, True))
+                stack.extend((report, False) for report in self._report_rows(row) if report not in frozen)
+                continue
+            name = None if states[row] == VACANT else names[row]
+            reports = tuple([frozen[report] for report in self._report_rows(row)])
+            frozen[row] = FrozenSpot(name, roles[role_codes[row]], role_codes[row], reports)
+        return frozen[self.president.row]
+
+    # ----- Helper Methods -----
+
+    def _find_employee(self, name: str):
+        row = self.employee_lookup.get(name)
+        return None if row is None else SpotRow(self, row)
+
+    def _add_employee(self, manager, new_employee_name):
+        role_code = self.ladder.below(manager.role_code)
+        row = self._new_row(role_code, new_employee_name, NO_ROW)
+        self._link_last(manager.row, row)
+        self.employee_lookup[new_employee_name] = row
+        self._record("free", row)
+        self._record("detach", row)
+        self._record("forget", row)
+        return self._report(Status.OK, "Successfully hired {0} under {1}.", new_employee_name, manager.name)
+
+    def _replace_vacancy_with_new_employee(self, manager, vacancy_row, new_employee_name):
+        # The Vacancy's row becomes the new employee, keeping its place and its reports.
+        self._forget_frozen(vacancy_row)
+        self.names[vacancy_row] = new_employee_name
+        self.states[vacancy_row] = FILLED
+        self.vacancy_counts[manager.row] -= 1
+        self.employee_lookup[new_employee_name] = vacancy_row
+        self._record("vacate", vacancy_row)
+        return self._report(Status.OK, "Successfully placed {0} under {1}.", new_employee_name, manager.name)
+
+    def _is_superior_to(self, manager, employee):
+        bosses = self.bosses
+        target = manager.row
+        current_boss = bosses[employee.row]
+        while current_boss != NO_ROW:
+            if current_boss == target:
+                return True
+            current_boss = bosses[current_boss]
+        return False
+
+    def _display_lines(self, root, max_depth=None):
+        # Same output as the object backend; the stack holds the next sibling to visit at each level.
+        names, states, role_codes, roles = self.names, self.states, self.role_codes, self.ladder.roles
+        first_reports, next_siblings = self.first_reports, self.next_siblings
+        yield f"{roles[role_codes[root.row]]}: {names[root.row]}\n"
+        stack = [(first_reports[root.row], 1)]
+        while stack:
+            row, depth = stack.pop()
+            if row == NO_ROW:
+                continue
+            indent = "\t" * depth
+            if states[row] == VACANT:
+                yield f"{indent}VACANCY: {roles[role_codes[row]]}\n"
+            else:
+                yield f"{indent}{roles[role_codes[row]]}: {names[row]}\n"
+            stack.append((next_siblings[row], depth))
+            if max_depth is None or depth < max_depth:
+                stack.append((first_reports[row], depth + 1))
+
+    def _chart_text(self, root):
+        # Rows are not cached, one pass over the sibling columns is already cheap.
+        lines = self._display_lines(root)
+        next(lines)
+        return "".join(lines)
+
+    def _vacate(self, row):
+        # Leaves a Vacancy holding row's place and reports.
+        vacancy = self._new_row(self.role_codes[row], None, NO_ROW)
+        moved = list(self._report_rows(row))
+        self._swap_in(row, vacancy)
+        self.vacancy_counts[self.bosses[vacancy]] += 1
+        self._append_reports(vacancy, row)
+        self._record("free", vacancy)
+        self._record("unfill", vacancy, row, moved)
+        return vacancy
+
+    def _replace_employee_with_vacancy(self, employee):
+        return self._vacate(employee.row)
+
+    def _collapse_if_empty(self, row):
+        # Frees row if it is a Vacancy nobody reports to, then does the same for its boss.
+        removed = 0
+        while self.states[row] == VACANT and self.report_counts[row] == 0 and self.bosses[row] != NO_ROW:
+            boss = self.bosses[row]
+            self._record("attach", row, boss, self.next_siblings[row])
+            self._unlink(row)
+            self._free_row(row)
+            self._record("unfree", row, None, VACANT, self.role_codes[row])
+            row = boss
+            removed += 1
+        return removed
+
+    def compact_vacancies(self):
+        empty = [row for row, state in enumerate(self.states) if state == VACANT and self.report_counts[row] == 0]
+        return sum(self._collapse_if_empty(row) for row in empty)
+
+    def _remove_employee(self, employee):
+        row = employee.row
+        name = self.names[row]
+        del self.employee_lookup[name]
+        self._record("remember", row, name)
+
+        if self.report_counts[row] == 0:
+            boss = self.bosses[row]
+            self._record("attach", row, boss, self.next_siblings[row])
+            self._unlink(row)
+            self._free_row(row)
+            self._record("unfree", row, name, FILLED, self.role_codes[row])
+            self._collapse_if_empty(boss)
+            return self._report(Status.OK, "{0} has been removed from the company.", name)
+
+        # The row itself becomes the Vacancy, reports stay where they are
+        self._forget_frozen(row)
+        self.names[row] = None
+        self.states[row] = VACANT
+        self.vacancy_counts[self.bosses[row]] += 1
+        self._record("refill", row, name)
+        return self._report(Status.OK, "{0} has been removed from the company. Vacancy remains.", name)
+
+    def _move_employee(self, employee, new_boss, replacement_index):
+        row = employee.row
+        old_boss = self.bosses[row]
+        self._record("attach", row, old_boss, self.next_siblings[row])
+        self._unlink(row)
+        if replacement_index == -1:
+            self._link_last(new_boss.row, row)
+            self._record("detach", row)
+        else:
+            vacancy = replacement_index
+            moved = list(self._report_rows(vacancy))
+            self._swap_in(vacancy, row)
+            self.vacancy_counts[new_boss.row] -= 1
+            # Reports left under the Vacancy now report to the employee filling it
+            self._append_reports(row, vacancy)
+            self._free_row(vacancy)
+            self._record("unfill", row, vacancy, moved)
+            self._record("unfree", vacancy, None, VACANT, self.role_codes[vacancy])
+        self._collapse_if_empty(old_boss)
+        return self._report(Status.OK, "Successfully placed {0} under {1}.", self.names[row], new_boss.name)
+
+    def _has_spots(self, manager):
+        row = manager.row
+        if self.report_counts[row] < self.ladder.capacities[self.role_codes[row]]:
+            return True
+        vacancy = self._check_vancancy_objects(manager)
+        if vacancy != -1:
+            return vacancy
+        return False
+
+    def _check_vancancy_objects(self, manager):
+        # Returns the row of the first Vacancy under manager, -1 if none. Rows are never 0 here, the President holds row 0.
+        return next(self._vacant_reports(manager.row), -1)
+
+    def _vacant_reports(self, row):
+        # Yields the Vacancy rows directly below row, in report order.
+        if self.vacancy_counts[row] == 0:
+            return
+        for report in self._report_rows(row):
+            if self.states[report] == VACANT:
+                yield report
+
+    def _opening_at(self, row):
+        manager = SpotRow(self, row)
+        result = self._has_spots(manager)
+        if result is True:
+            return -1, manager
+        return result, manager
+
+    def _find_opening(self, employee):
+        # Same ranking as the object backend. Without an opening index each wider branch is walked level by level,
+        # stopping at the first level that holds an opening or that could no longer beat the best one so far.
+        row = employee.row
+        wanted = self.role_codes[row] - 1
+        if wanted < 0:
+            return None, None
+        bosses, role_codes = self.bosses, self.role_codes
+        best, best_distance = NO_ROW, None
+        searched, ancestor, up = row, bosses[row], 1
+        while ancestor != NO_ROW and (best == NO_ROW or up < best_distance):
+            if role_codes[ancestor] == wanted and self._has_opening(ancestor):
+                best, best_distance = ancestor, up
+                break
+            farthest = None if best == NO_ROW else best_distance - up - 1
+            candidate, levels = self._nearest_opening_below(ancestor, farthest, wanted, searched)
+            if candidate != NO_ROW:
+                best, best_distance = candidate, up + levels
+            searched, ancestor, up = ancestor, bosses[ancestor], up + 1
+        if best == NO_ROW:
+            return None, None
+        return self._opening_at(best)
+
+    def _nearest_opening_below(self, ancestor, farthest, role_code, skip):
+        # Shallowest row at most farthest (None for no limit) levels below ancestor, outside skip's branch, with
+        # role_code and an opening, first in report order. Returns (row, levels), or (NO_ROW, None).
+        first_reports, next_siblings, role_codes = self.first_reports, self.next_siblings, self.role_codes
+        bottom = self.ladder.bottom
+        level = [ancestor]
+        levels = 1
+        while level and (farthest is None or levels <= farthest):
+            below = []
+            for row in level:
+                report = first_reports[row]
+                while report != NO_ROW:
+                    if report != skip:
+                        if role_codes[report] == role_code and self._has_opening(report):
+                            return report, levels
+                        if role_codes[report] != bottom:
+                            below.append(report)
+                    report = next_siblings[report]
+            level = below
+            levels += 1
+        return NO_ROW, None
+
+    def _promote(self, target_employee, receiving_manager):
+        target = target_employee.row
+        receiving = receiving_manager.row
+        old_boss = self.bosses[target]
+        for vacancy in self._vacant_reports(receiving):
+            if self.bosses[target] != vacancy:
+                if self.role_codes[target] != self.ladder.bottom:
+                    left_behind = self._vacate(target)
+                else:
+                    left_behind = old_boss
+                    self._record("attach", target, old_boss, self.next_siblings[target])
+                    self._unlink(target)
+                self._promote_role(target)
+                self._record("demote", target)
+                moved = list(self._report_rows(vacancy))
+                self._swap_in(vacancy, target)
+                self.vacancy_counts[receiving] -= 1
+                self._append_reports(target, vacancy)
+                self._free_row(vacancy)
+                self._record("unfill", target, vacancy, moved)
+                self._record("unfree", vacancy, None, VACANT, self.role_codes[vacancy])
+                self._collapse_if_empty(left_behind)
+                return self._report(Status.OK, "Successfully promoted {0} under {1}.", self.names[target], receiving_manager.name)
+
+        # No Vacancy object found, normal addition
+        self._record("attach", target, old_boss, self.next_siblings[target])
+        self._unlink(target)
+        self._link_last(receiving, target)
+        self._record("detach", target)
+        self._promote_role(target)
+        self._record("demote", target)
+        self._collapse_if_empty(old_boss)
+        return self._report(Status.OK, "Successfully promoted {0} under {1}.", self.names[target], receiving_manager.name)
+
+    # ----- Undo steps, the row versions of the object backend's -----
+
+    def _undo_detach(self, row):
+        self._unlink(row)
+
+    def _undo_attach(self, row, boss, following):
+        # Links row back into boss's reports just ahead of following, or last when following is NO_ROW.
+        if following == NO_ROW:
+            self._link_last(boss, row)
+            return
+        self._forget_frozen(boss)
+        prev = self.prev_siblings[following]
+        self.bosses[row] = boss
+        self.prev_siblings[row] = prev
+        self.next_siblings[row] = following
+        self.prev_siblings[following] = row
+        if prev == NO_ROW:
+            self.first_reports[boss] = row
+        else:
+            self.next_siblings[prev] = row
+        self.report_counts[boss] += 1
+        if self.states[row] == VACANT:
+            self.vacancy_counts[boss] += 1
+
+    def _undo_unfill(self, new, old, moved):
+        # Puts old back in the place new took from it, with the reports in moved; new is left unlinked.
+        self._frozen.pop(old, None)
+        self.first_reports[old] = self.last_reports[old] = NO_ROW
+        self.report_counts[old] = self.vacancy_counts[old] = 0
+        self._swap_in(new, old)
+        self.vacancy_counts[self.bosses[old]] += (self.states[old] == VACANT) - (self.states[new] == VACANT)
+        self.bosses[new] = NO_ROW
+        for report in moved:
+            self._unlink(report)
+            self._link_last(old, report)
+
+    def _undo_demote(self, row):
+        self._forget_frozen(row)
+        self.role_codes[row] += 1
+
+    def _undo_forget(self, row):
+        del self.employee_lookup[self.names[row]]
+
+    def _undo_remember(self, row, name):
+        self.employee_lookup[name] = row
+
+    def _undo_free(self, row):
+        self._free_row(row)
+
+    def _undo_unfree(self, row, name, state, role_code):
+        # Takes row back off the free list, it is normally the last one freed. The row may have been taken and
+        # given back in between, so everything it held comes from the step.
+        if self.free_rows[-1] == row:
+            self.free_rows.pop()
+        else:
+            self.free_rows.remove(row)
+        self._frozen.pop(row, None)
+        self.names[row] = name
+        self.states[row] = state
+        self.role_codes[row] = role_code
+
+    def _undo_vacate(self, row):
+        # Turns a filled Vacancy row back into a Vacancy.
+        del self.employee_lookup[self.names[row]]
+        self._forget_frozen(row)
+        self.names[row] = None
+        self.states[row] = VACANT
+        self.vacancy_counts[self.bosses[row]] += 1
+
+    def _undo_refill(self, row, name):
+        # Gives a row that became a Vacancy its employee back.
+        self._forget_frozen(row)
+        self.names[row] = name
+        self.states[row] = FILLED
+        self.vacancy_counts[self.bosses[row]] -= 1
+
+    def _promote_role(self, row):
+        # Mirrors Employee.promote.
+        self._forget_frozen(row)
+        if self.role_codes[row] > 1:
+            self.role_codes[row] -= 1
+
+    def _export_preorder(self):
+        # Walks the reports from last to first so the stack pops them in report order.
+        order = []
+        prev_siblings, last_reports = self.prev_siblings, self.last_reports
+        stack = [self.president.row] if self.president is not None else []
+        while stack:
+            row = stack.pop()
+            order.append(row)
+            report = last_reports[row]
+            while report != NO_ROW:
+                stack.append(report)
+                report = prev_siblings[report]
+        states, role_codes, row_names = self.states, self.role_codes, self.names
+        roles = array("B", [role_codes[row] | VACANT_FLAG if states[row] == VACANT else role_codes[row] for row in order])
+        report_counts = array("I", [self.report_counts[row] for row in order])
+        names = [row_names[row] for row in order if states[row] == FILLED]
+        return roles, report_counts, names
+
+    def _import_preorder(self, roles, report_counts, names):
+        # Rows come out in preorder, so each column is built whole and then copied in.
+        # Only called on an empty organization, so row numbers start at 0.
+        seats = len(roles)
+        codes = roles.tobytes()
+        bosses = [NO_ROW] * seats
+        # A row's reports, if it has any, start on the next row
+        first_reports = [row + 1 if count else NO_ROW for row, count in enumerate(report_counts)]
+        last_reports = [NO_ROW] * seats
+        next_siblings = [NO_ROW] * seats
+        prev_siblings = [NO_ROW] * seats
+        vacancy_counts = [0] * seats
+        # The boss whose reports are coming is kept in locals, bosses above it that still expect reports on a stack
+        waiting = []    # (boss, last report so far, reports still to attach)
+        boss = last = NO_ROW
+        remaining = 0
+        for row, count in enumerate(report_counts):
+            if remaining:
+                bosses[row] = boss
+                if last != NO_ROW:
+                    next_siblings[last] = row
+                    prev_siblings[row] = last
+                last = row
+                remaining -= 1
+                if not remaining:
+                    last_reports[boss] = row
+            if count:
+                if remaining:
+                    waiting.append((boss, last, remaining))
+                boss, last, remaining = row, NO_ROW, count
+            elif not remaining and waiting:
+                boss, last, remaining = waiting.pop()
+        # Vacancies are few, so only their rows are visited, and names are copied in runs between them
+        vacant = codes.translate(VACANT_BY_CODE)
+        vacant_rows = list(itertools.compress(range(seats), vacant))
+        row_names = []
+        for index, row in enumerate(vacant_rows):
+            vacancy_counts[bosses[row]] += 1
+            row_names.extend(names[len(row_names) - index:row - index])
+            row_names.append(None)
+        row_names.extend(names[len(row_names) - len(vacant_rows):])
+        filled = list(itertools.compress(range(seats), map(operator.not_, vacant)))
+        self.names = row_names
+        self.states = array("b", codes.translate(STATE_BY_CODE))
+        self.role_codes = array("b", codes.translate(ROLE_BY_CODE))
+        self.bosses = array("q", bosses)
+        self.first_reports = array("q", first_reports)
+        self.last_reports = array("q", last_reports)
+        self.next_siblings = array("q", next_siblings)
+        self.prev_siblings = array("q", prev_siblings)
+        self.report_counts = array("l", report_counts)
+        self.vacancy_counts = array("l", vacancy_counts)
+        self.employee_lookup = NameIndex(zip(names, filled))
+        if seats:
+            self.president = SpotRow(self, 0)
+
+    # ----- Main Methods -----
+
+    @journaled
+    def initialize_president(self, name: str):
+        if self.president != None: return False
+
+        row = self._new_row(PRESIDENT, name, NO_ROW)
+        self.president = SpotRow(self, row)
+        self.employee_lookup[name] = row
+        self._report(Status.OK, "Success: Initialized President {0}.", name)
+        return True
+
+    # ----- Analytics -----
+
+    def headcount_by_role(self):
+        # Number of employees in each role, vacancies excluded, in one pass over the columns.
+        if np is not None:
+            filled = np.frombuffer(self.states, dtype=np.int8) == FILLED
+            roles = np.frombuffer(self.role_codes, dtype=np.int8)[filled]
+            counts = np.bincount(roles, minlength=len(self.ladder.roles)).tolist()
+        else:
+            counts = [0] * len(self.ladder.roles)
+            for state, role_code in zip(self.states, self.role_codes):
+                if state == FILLED:
+                    counts[role_code] += 1
+        return {role: counts[code] for code, role in enumerate(self.ladder.roles)}
+
+    def depths(self):
+        # Depth of every row below the President (President is 0, free rows are -1).
+        if np is not None:
+            bosses = np.frombuffer(self.bosses, dtype=np.int64)
+            depth = np.zeros(len(bosses), dtype=np.int64)
+            ancestors = bosses.copy()
+            while True:
+                climbing = ancestors != NO_ROW
+                if not climbing.any():
+                    break
+                depth += climbing
+                ancestors = np.where(climbing, bosses[np.maximum(ancestors, 0)], NO_ROW)
+            depth[np.frombuffer(self.states, dtype=np.int8) == FREE] = NO_ROW
+            return array("q", depth.tolist())
+        depth = array("q", [NO_ROW]) * len(self.names)
+        if self.president is None:
+            return depth
+        stack = [(self.president.row, 0)]
+        while stack:
+            row, level = stack.pop()
+            depth[row] = level
+            stack.extend((report, level + 1) for report in self._report_rows(row))
+        return depth
+
+    def _counts_below(self, spot):
+        # Walks the branch instead of keeping running counts, so rows stay as narrow as they are.
+        counts = [0] * (len(self.ladder.roles) + 1)
+        states, role_codes = self.states, self.role_codes
+        stack = list(self._report_rows(spot.row))
+        while stack:
+            row = stack.pop()
+            if states[row] == VACANT:
+                counts[-1] += 1
+            else:
+                counts[role_codes[row]] += 1
+            stack.extend(self._report_rows(row))
+        return counts
+
+    def _levels_below(self, spot):
+        levels = []
+        level = list(self._report_rows(spot.row))
+        while level:
+            levels.append(len(level))
+            level = [report for row in level for report in self._report_rows(row)]
+        return levels
+
+    def subtree_headcount(self, name: str):
+        # Number of employees below name (vacancies excluded), None if the name does not exist.
+        root = self.employee_lookup.get(name)
+        if root is None:
+            return None
+        if np is not None:
+            bosses = np.frombuffer(self.bosses, dtype=np.int64)
+            below = np.zeros(len(bosses), dtype=bool)
+            ancestors = bosses.copy()
+            while True:
+                climbing = ancestors != NO_ROW
+                if not climbing.any():
+                    break
+                below |= ancestors == root
+                ancestors = np.where(climbing, bosses[np.maximum(ancestors, 0)], NO_ROW)
+            filled = np.frombuffer(self.states, dtype=np.int8) == FILLED
+            return int(np.count_nonzero(below & filled))
+        count = 0
+        stack = list(self._report_rows(root))
+        while stack:
+            row = stack.pop()
+            if self.states[row] == FILLED:
+                count += 1
+            stack.extend(self._report_rows(row))
+        return count
@@ -0,0 +1,227 @@
+# Times every command against a synthetic organization under a steady-state mix.
+# Run from the repository root: python benchmarks/command_benchmark.py [--seats N] [--json PATH]
+# Compare two runs:            python benchmarks/command_benchmark.py --compare OLD.json NEW.json
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:     # Not available on Windows, peak memory is then left out
+    resource = None
+
+from employee import DEFAULT_LADDER, RoleLadder
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from org_generator import generate_org
+
+BACKENDS = {"object": OrganizationManager, "array": ArrayOrganizationManager}
+
+# Share of each command in the mix, hires roughly balance the removals so the size stays steady
+DEFAULT_MIX = {
+    "hire_employee": 30,
+    "fire_employee": 12,
+    "employee_quits": 10,
+    "layoff_employee": 8,
+    "transfer_employee": 15,
+    "promote_employee": 15,
+    "display_organization": 10,
+}
+
+class NamePool:
+    # Current employee names with O(1) random pick, add and remove.
+    def __init__(self, names):
+        self.names = list(names)
+        self.positions = {name: index for index, name in enumerate(self.names)}
+
+    def pick(self, rng):
+        return self.names[rng.randrange(len(self.names))]
+
+    def add(self, name):
+        if name not in self.positions:
+            self.positions[name] = len(self.names)
+            self.names.append(name)
+
+    def remove(self, name):
+        index = self.positions.pop(name, None)
+        if index is None:
+            return
+        last = self.names.pop()
+        if index < len(self.names):
+            self.names[index] = last
+            self.positions[last] = index
+
+def named_boss(org, name):
+    # Closest employee above name, skipping Vacancy placeholders.
+    boss = org._find_employee(name).boss
+    while boss is not None and boss.is_vacant():
+        boss = boss.boss
+    return None if boss is None else boss.name
+
+def make_arguments(org, pool, rng, command, step):
+    # Arguments that usually pass validation, so the benchmark mostly times the successful paths.
+    name = pool.pick(rng)
+    if command == "hire_employee":
+        # Most names are Workers, hire under their boss instead
+        return (named_boss(org, name) or name, f"N{step}")
+    if command == "employee_quits":
+        return (name,)
+    if command in ("fire_employee", "layoff_employee"):
+        return (named_boss(org, name) or name, name)
+    if command == "transfer_employee":
+        return (org.president.name, name, pool.pick(rng))
+    if command == "promote_employee":
+        boss = named_boss(org, name)
+        return (named_boss(org, boss) if boss is not None else name, name)
+    # Display one Vice President's branch, the whole chart is timed separately
+    boss = named_boss(org, name)
+    while boss is not None and boss != org.president.name:
+        name, boss = boss, named_boss(org, boss)
+    return (name,)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def run_mix(org, operations, mix=DEFAULT_MIX, seed=0):
+    # Runs operations commands drawn from mix and returns per command statistics.
+    rng = random.Random(seed)
+    pool = NamePool(org.employee_lookup)
+    commands = list(mix)
+    weights = [mix[command] for command in commands]
+    latencies = {command: [] for command in commands}
+    succeeded = dict.fromkeys(commands, 0)
+    timer = time.perf_counter_ns
+
+    for step in range(operations):
+        command = rng.choices(commands, weights)[0]
+        args = make_arguments(org, pool, rng, command, step)
+        method = getattr(org, command)
+        start = timer()
+        result = method(*args)
+        latencies[command].append(timer() - start)
+        if result.ok:
+            succeeded[command] += 1
+        # Keep the pool in step with the names that came and went
+        if command == "hire_employee" and result.ok:
+            pool.add(args[1])
+        elif command in ("fire_employee", "layoff_employee", "employee_quits"):
+            if args[-1] not in org.employee_lookup:
+                pool.remove(args[-1])
+
+    stats = {}
+    for command in commands:
+        values = sorted(latencies[command])
+        total = sum(values)
+        stats[command] = {
+            "count": len(values),
+            "ok": succeeded[command],
+            "ops_per_sec": len(values) / (total / 1e9) if total else 0.0,
+            "p50_us": percentile(values, 0.50) / 1000,
+            "p99_us": percentile(values, 0.99) / 1000,
+        }
+    return stats
+
+def time_full_display(org, repeats=3):
+    # Best of repeats full charts, the first call also fills any render cache.
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        org.display_organization()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def peak_memory_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak   # macOS reports bytes, Linux kilobytes
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(seats, operations, backend="object", vacancy_ratio=0.05, fill=0.8, seed=0, ladder=DEFAULT_LADDER):
+    start = time.perf_counter()
+    org = generate_org(seats, BACKENDS[backend], vacancy_ratio, fill, seed, ladder=ladder)
+    generated = time.perf_counter() - start
+    first_display = time_full_display(org, repeats=1)
+    stats = run_mix(org, operations, seed=seed)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "backend": backend,
+            "seats": seats,
+            "operations": operations,
+            "vacancy_ratio": vacancy_ratio,
+            "fill": fill,
+            "seed": seed,
+            "ladder": ",".join(f"{role}:{capacity}" for role, capacity in zip(ladder.roles, ladder.capacities)),
+        },
+        "generate_sec": generated,
+        "first_full_display_sec": first_display,
+        "full_display_sec": time_full_display(org),
+        "commands": stats,
+        "peak_rss_kb": peak_memory_kb(),
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    print(f"{meta['backend']} backend, {meta['seats']} seats, {meta['operations']} operations (commit {meta['commit']})")
+    print(f"  generate {report['generate_sec']:.2f}s, full display {report['first_full_display_sec']:.3f}s first, {report['full_display_sec']:.3f}s after")
+    print(f"  {'command':<22}{'count':>8}{'ok':>8}{'ops/sec':>12}{'p50 us':>10}{'p99 us':>10}")
+    for command, stats in report["commands"].items():
+        print(f"  {command:<22}{stats['count']:>8}{stats['ok']:>8}{stats['ops_per_sec']:>12.0f}{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}")
+    if report["peak_rss_kb"] is not None:
+        print(f"  peak RSS {report['peak_rss_kb'] / 1024:.1f} MiB")
+
+def compare(old_path, new_path):
+    # Prints the change in throughput and p99 latency of every command between two JSON reports.
+    with open(old_path, encoding="utf-8") as file:
+        old = json.load(file)
+    with open(new_path, encoding="utf-8") as file:
+        new = json.load(file)
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    for command, stats in new["commands"].items():
+        before = old["commands"].get(command)
+        if before is None or not before["ops_per_sec"] or not before["p99_us"]:
+            continue
+        speed = stats["ops_per_sec"] / before["ops_per_sec"]
+        tail = stats["p99_us"] / before["p99_us"]
+        print(f"  {command:<22} ops/sec x{speed:.2f}  p99 x{tail:.2f}")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Time every command on a synthetic organization.")
+    parser.add_argument("--seats", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=20_000)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="object")
+    parser.add_argument("--vacancy-ratio", type=float, default=0.05)
+    parser.add_argument("--fill", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ladder", type=RoleLadder.parse, default=DEFAULT_LADDER, help="Roles and capacities, e.g. 'CEO:4,VP:6,Director:8,Manager:10,Engineer:0'.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two JSON reports instead of running.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    if args.compare:
+        compare(*args.compare)
+    else:
+        report = run_benchmark(args.seats, args.operations, args.backend, args.vacancy_ratio, args.fill, args.seed, args.ladder)
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
@@ -0,0 +1,161 @@
+# Measures throughput of the thread-safe organization against one lock around every call, for 1 to N threads.
+# Run from the repository root: python benchmarks/concurrency_benchmark.py [--seats N] [--threads 1,2,4,8] [--json PATH]
+# Threads only overlap under the GIL while one of them waits on I/O, so the two cases where branch locks can win are
+# options: --fsync journals every change with an fsync each, taken once the change has let go of its locks, and
+# --write-delay-us makes every chart chunk take that long to write, a reader at the other end of a slow socket.
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrency import ConcurrentArrayOrganizationManager, ConcurrentOrganizationManager
+from journal import Journal
+from command_benchmark import BACKENDS, NamePool, git_commit, make_arguments
+from org_generator import generate_org
+from sinks import SilentSink
+
+CONCURRENT_BACKENDS = {"object": ConcurrentOrganizationManager, "array": ConcurrentArrayOrganizationManager}
+
+# Changes that mostly stay inside one Vice President's branch, transfers may cross into another
+BRANCH_MIX = {
+    "hire_employee": 35,
+    "fire_employee": 15,
+    "employee_quits": 10,
+    "transfer_employee": 15,
+    "display_organization": 25,
+}
+
+class SlowSink:
+    # Discards messages and takes delay seconds over each chunk of chart text, as a slow reader would.
+    def __init__(self, delay):
+        self.delay = delay
+
+    def emit(self, result):
+        pass
+
+    def write(self, text: str):
+        time.sleep(self.delay)
+
+class GlobalLock:
+    # The plain organization with one lock held around every call, the simplest thread-safe baseline.
+    def __init__(self, org):
+        self.org = org
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self.org, name)
+
+        def locked(*args):
+            with self.lock:
+                return method(*args)
+        return locked
+
+def build(seats, backend, locking, seed, write_delay=0.0):
+    sink = SlowSink(write_delay) if write_delay else SilentSink()
+    org = generate_org(seats, BACKENDS[backend] if locking == "global" else CONCURRENT_BACKENDS[backend], seed=seed, sink=sink)
+    return org, GlobalLock(org) if locking == "global" else org
+
+def worker(target, org, names, operations, thread, seed, counts):
+    rng = random.Random(seed * 1000 + thread)
+    pool = NamePool(names)
+    commands = list(BRANCH_MIX)
+    weights = [BRANCH_MIX[command] for command in commands]
+    succeeded = 0
+    for step in range(operations):
+        command = rng.choices(commands, weights)[0]
+        # Arguments are read off the live tree, which other threads change, so retry names that just left
+        try:
+            args = make_arguments(org, pool, rng, command, f"{thread}x{step}")
+        except AttributeError:
+            continue
+        if getattr(target, command)(*args).ok:
+            succeeded += 1
+        if command == "hire_employee":
+            pool.add(args[1])
+        elif args[-1] not in org.employee_lookup:
+            pool.remove(args[-1])
+    counts[thread] = succeeded
+
+def run_threads(seats, operations, threads, backend="object", locking="branch", fsync=False, seed=0, write_delay=0.0):
+    # Wall-clock ops/sec of operations commands split evenly over threads.
+    org, target = build(seats, backend, locking, seed, write_delay)
+    names = list(org.employee_lookup)
+    with tempfile.TemporaryDirectory() as directory:
+        journal = None
+        if fsync:
+            journal = Journal(directory, batch_size=1, compact_every=0)
+            journal.recover(org)
+        counts = [0] * threads
+        workers = [threading.Thread(target=worker, args=(target, org, names, operations // threads, thread, seed, counts))
+                   for thread in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        if journal is not None:
+            journal.close()
+    done = operations // threads * threads
+    return {"ops_per_sec": done / elapsed if elapsed else 0.0, "ok": sum(counts), "operations": done}
+
+def run_benchmark(seats, operations, thread_counts, backend="object", fsync=False, seed=0, write_delay=0.0):
+    rows = []
+    for threads in thread_counts:
+        row = {"threads": threads}
+        for locking in ("global", "branch"):
+            row[locking] = run_threads(seats, operations, threads, backend, locking, fsync, seed, write_delay)
+        rows.append(row)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "backend": backend,
+            "seats": seats,
+            "operations": operations,
+            "fsync": fsync,
+            "write_delay_us": write_delay * 1e6,
+            "seed": seed,
+            # CPython runs one thread's Python code at a time, branch locks only win while threads wait on I/O
+            "gil": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        },
+        "rows": rows,
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    journal = ", fsync per change" if meta["fsync"] else ""
+    output = f", {meta['write_delay_us']:.0f} us per chart chunk" if meta["write_delay_us"] else ""
+    print(f"{meta['backend']} backend, {meta['seats']} seats, {meta['operations']} operations{journal}{output} (commit {meta['commit']})")
+    print(f"  {'threads':>7}{'global ops/sec':>16}{'branch ops/sec':>16}{'speedup':>9}")
+    for row in report["rows"]:
+        global_rate, branch_rate = row["global"]["ops_per_sec"], row["branch"]["ops_per_sec"]
+        speedup = branch_rate / global_rate if global_rate else 0.0
+        print(f"  {row['threads']:>7}{global_rate:>16.0f}{branch_rate:>16.0f}{speedup:>8.2f}x")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Compare branch locking with one global lock across thread counts.")
+    parser.add_argument("--seats", type=int, default=20_000)
+    parser.add_argument("--operations", type=int, default=20_000)
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma separated thread counts.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="object")
+    parser.add_argument("--fsync", action="store_true", help="Journal every change and fsync it before the call returns.")
+    parser.add_argument("--write-delay-us", type=float, default=0.0, help="Time each chunk of chart text takes to write.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    thread_counts = [int(count) for count in args.threads.split(",")]
+    report = run_benchmark(args.seats, args.operations, thread_counts, args.backend, args.fsync, args.seed,
+                           args.write_delay_us / 1e6)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
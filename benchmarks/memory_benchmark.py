@@ -0,0 +1,103 @@
+# Measures the memory cost of each seat in the organization.
+# Run from the repository root: python benchmarks/memory_benchmark.py [--seats N]
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from employee import Employee, Vacancy, ROLE_CAPACITY, VICE_PRESIDENT, SUPERVISOR, WORKER
+from array_organization import ArrayOrganizationManager, NO_ROW
+from sinks import SilentSink
+
+class LegacyEmployee:
+    # Layout of Employee before __slots__: per-instance dict, role string, own reports list and capacity
+    def __init__(self, name, role, boss=None):
+        self.name = name
+        self.role = role
+        self.boss = boss
+        self.reports = []
+        self.vacancies = 0
+        self.lo = 0
+        self.hi = 0
+        self.max_reports = ROLE_CAPACITY.get(role, 0)
+
+class LegacyVacancy:
+    def __init__(self, role, boss=None):
+        self.role = role
+        self.boss = boss
+        self.reports = []
+        self.vacancies = 0
+        self.lo = 0
+        self.hi = 0
+        self.max_reports = ROLE_CAPACITY.get(role, 0)
+
+def build_seats(count, employee_class=Employee, vacancy_class=Vacancy):
+    # Builds count seats shaped like full Vice President branches, every tenth Supervisor vacant.
+    president = employee_class("P", "President")
+    seats = [president]
+    while len(seats) < count:
+        vp = employee_class(f"V{len(seats)}", "Vice President", president)
+        president.reports.append(vp)
+        seats.append(vp)
+        for s in range(3):
+            if s == 2 and len(seats) % 10 == 0:
+                supervisor = vacancy_class("Supervisor", vp)
+            else:
+                supervisor = employee_class(f"S{len(seats)}", "Supervisor", vp)
+            vp.reports.append(supervisor)
+            seats.append(supervisor)
+            for w in range(5):
+                worker = employee_class(f"W{len(seats)}", "Worker", supervisor)
+                supervisor.reports.append(worker)
+                seats.append(worker)
+    return seats
+
+def build_rows(count):
+    # Same shape as build_seats, stored as rows of an ArrayOrganizationManager.
+    org = ArrayOrganizationManager(sink=SilentSink())
+    org.initialize_president("P")
+    president = org.president.row
+    while len(org.names) < count:
+        vp = org._new_row(VICE_PRESIDENT, f"V{len(org.names)}", NO_ROW)
+        org._link_last(president, vp)
+        for s in range(3):
+            name = None if s == 2 and len(org.names) % 10 == 0 else f"S{len(org.names)}"
+            supervisor = org._new_row(SUPERVISOR, name, NO_ROW)
+            org._link_last(vp, supervisor)
+            for w in range(5):
+                worker = org._new_row(WORKER, f"W{len(org.names)}", NO_ROW)
+                org._link_last(supervisor, worker)
+    return org
+
+def measure(count, employee_class=Employee, vacancy_class=Vacancy):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    seats = build_seats(count, employee_class, vacancy_class)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(seats), len(seats)
+
+def measure_rows(count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    org = build_rows(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(org.names), len(org.names)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Measure the memory cost of each seat on every layout.")
+    parser.add_argument("--seats", type=int, default=100_000)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    count = parse_args(sys.argv[1:]).seats
+    legacy, seats = measure(count, LegacyEmployee, LegacyVacancy)
+    slotted, seats = measure(count)
+    print(f"{seats} seats, bytes per seat (names included)")
+    print(f"  dict-based objects: {legacy:.1f}")
+    print(f"  slotted objects:    {slotted:.1f} ({100 * (legacy - slotted) / legacy:.0f}% smaller)")
+    rows, seats = measure_rows(count)
+    print(f"  array columns:      {rows:.1f} ({100 * (legacy - rows) / legacy:.0f}% smaller)")
@@ -0,0 +1,51 @@
+# Generates synthetic organizations for the benchmarks.
+# Orgs are built in snapshot preorder and imported in one pass, so large ones take seconds rather than minutes.
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from employee import DEFAULT_LADDER
+from organization_manager import OrganizationManager
+from sinks import SilentSink
+from snapshot import VACANT_FLAG
+
+def generate_preorder(seats, vacancy_ratio=0.05, fill=0.8, seed=0, ladder=DEFAULT_LADDER):
+    # Returns (roles, report_counts, names) for about seats seats, in the layout _import_preorder expects.
+    # Every slot below the President's direct reports is filled with probability fill, leaving the rest as openings;
+    # managers above the bottom two roles always get at least one report so every branch reaches the bottom.
+    # Managers with reports are left as a Vacancy with probability vacancy_ratio.
+    # The President takes as many direct reports as the size needs, even past its capacity.
+    rng = random.Random(seed)
+    roles = array("B", [0])
+    report_counts = array("I", [0])
+    names = [f"{ladder.roles[0][0]}0"]
+
+    def add(role_code, count):
+        if count and rng.random() < vacancy_ratio:
+            roles.append(role_code | VACANT_FLAG)
+        else:
+            roles.append(role_code)
+            names.append(f"{ladder.roles[role_code][0]}{len(roles)}")
+        report_counts.append(count)
+
+    def branch(role_code):
+        count = sum(rng.random() < fill for _ in range(ladder.capacities[role_code]))
+        if role_code < ladder.bottom - 1:
+            count = max(1, count)
+        add(role_code, count)
+        for _ in range(count):
+            branch(role_code + 1)
+
+    while len(roles) < seats:
+        branch(1)
+        report_counts[0] += 1
+    return roles, report_counts, names
+
+def generate_org(seats, backend=OrganizationManager, vacancy_ratio=0.05, fill=0.8, seed=0, sink=None, ladder=DEFAULT_LADDER):
+    # Builds an organization of about seats seats on the given backend.
+    org = backend(sink=sink if sink is not None else SilentSink(), ladder=ladder)
+    org._import_preorder(*generate_preorder(seats, vacancy_ratio, fill, seed, ladder))
+    return org
@@ -0,0 +1,148 @@
+# Load generator for server.py: many clients pipelining commands at one organization over local sockets.
+# Run from the repository root: python benchmarks/server_benchmark.py [--seats N] [--clients N] [--window N] [--json PATH]
+# The server runs in the same process on an ephemeral port, or on a Unix socket with --unix.
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import OrganizationServer, QUEUE_LIMIT, read_response
+from command_benchmark import BACKENDS, DEFAULT_MIX, NamePool, git_commit, make_arguments, percentile
+from org_generator import generate_org
+
+# Command word of each method in the mix
+WORDS = {
+    "hire_employee": "HIRE",
+    "fire_employee": "FIRE",
+    "employee_quits": "QUIT",
+    "layoff_employee": "LAYOFF",
+    "transfer_employee": "TRANSFER",
+    "promote_employee": "PROMOTE",
+    "display_organization": "DISPLAY",
+}
+DISPLAY_DEPTH = 2           # Levels of a Vice President's branch each DISPLAY asks for
+
+def command_line(org, pool, rng, step):
+    # One command line from the mix, with arguments read off the organization as it is now.
+    command = rng.choices(list(DEFAULT_MIX), list(DEFAULT_MIX.values()))[0]
+    while True:
+        try:
+            args = make_arguments(org, pool, rng, command, step)
+        except AttributeError:
+            # The picked name left with a command still in flight
+            continue
+        if None not in args:
+            break
+    if command == "display_organization":
+        args = (*args, str(DISPLAY_DEPTH))
+    return command, " ".join((WORDS[command], *args)) + "\n"
+
+async def client(org, connect, number, operations, window, seed, latencies, statuses):
+    # Keeps up to window commands in flight, reading responses as they come back.
+    reader, writer = await connect()
+    rng = random.Random(seed * 1000 + number)
+    pool = NamePool(org.employee_lookup)
+    in_flight = deque()
+    slots = asyncio.Semaphore(window)
+
+    async def receive():
+        for _ in range(operations):
+            _, status = await read_response(reader)
+            command, args, sent = in_flight.popleft()
+            latencies.append(time.perf_counter_ns() - sent)
+            statuses[status] += 1
+            if command == "hire_employee" and status == "ok":
+                pool.add(args[1])
+            elif args[-1] not in org.employee_lookup:
+                pool.remove(args[-1])
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for step in range(operations):
+        await slots.acquire()
+        command, line = command_line(org, pool, rng, f"{number}x{step}")
+        in_flight.append((command, line.split()[1:], time.perf_counter_ns()))
+        writer.write(line.encode("utf-8"))
+        await writer.drain()
+    await receiver
+    writer.write(b"EXIT\n")
+    writer.close()
+
+async def run_load(seats, clients, operations, window, backend, unix, queue_limit, seed):
+    org = generate_org(seats, BACKENDS[backend], seed=seed)
+    server = OrganizationServer(org, queue_limit, max(window, 1))
+    with tempfile.TemporaryDirectory() as directory:
+        if unix:
+            path = os.path.join(directory, "org.sock")
+            await server.start(path=path)
+            connect = lambda: asyncio.open_unix_connection(path)
+        else:
+            await server.start()
+            host, port = server.address[:2]
+            connect = lambda: asyncio.open_connection(host, port)
+        latencies = []
+        statuses = Counter()
+        start = time.perf_counter()
+        await asyncio.gather(*(client(org, connect, number, operations // clients, window, seed, latencies, statuses)
+                               for number in range(clients)))
+        elapsed = time.perf_counter() - start
+        await server.close()
+    latencies.sort()
+    return {
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+        "statuses": dict(statuses),
+        "operations": len(latencies),
+    }
+
+def run_benchmark(seats, clients, operations, window=32, backend="object", unix=False, queue_limit=QUEUE_LIMIT, seed=0):
+    result = asyncio.run(run_load(seats, clients, operations, window, backend, unix, queue_limit, seed))
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "backend": backend,
+            "seats": seats,
+            "clients": clients,
+            "operations": operations,
+            "window": window,
+            "transport": "unix" if unix else "tcp",
+            "queue_limit": queue_limit,
+            "seed": seed,
+        },
+        **result,
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    print(f"{meta['backend']} backend, {meta['seats']} seats, {meta['clients']} clients x {meta['window']} in flight over {meta['transport']} (commit {meta['commit']})")
+    print(f"  {report['operations']} commands, {report['ops_per_sec']:.0f} ops/sec, p50 {report['p50_us']:.0f} us, p99 {report['p99_us']:.0f} us")
+    print("  " + ", ".join(f"{status}: {count}" for status, count in sorted(report["statuses"].items())))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Drive server.py with many pipelining clients.")
+    parser.add_argument("--seats", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=20_000, help="Commands sent by all clients together.")
+    parser.add_argument("--window", type=int, default=32, help="Commands each client keeps in flight.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="object")
+    parser.add_argument("--unix", action="store_true", help="Connect over a Unix socket instead of TCP.")
+    parser.add_argument("--queue", type=int, default=QUEUE_LIMIT, help="Server command queue limit.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    report = run_benchmark(args.seats, args.clients, args.operations, args.window, args.backend, args.unix, args.queue, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
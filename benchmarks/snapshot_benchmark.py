@@ -0,0 +1,39 @@
+# Measures snapshot save and load time for both backends.
+# Run from the repository root: python benchmarks/snapshot_benchmark.py [--seats N]
+# At 1M seats a load takes about 3.0-3.7s into OrganizationManager (6.5s before spots were built in bulk) and
+# 1.6-1.9s into ArrayOrganizationManager, the lower figures in a fresh process, all short of the sub-second target.
+# A million fresh names go into a dict either way, about 0.45s by itself on the same machine, and the object backend
+# also makes a million spots, each with a dozen attributes set from Python.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from memory_benchmark import build_rows
+from sinks import SilentSink
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Measure snapshot save and load time for both backends.")
+    parser.add_argument("--seats", type=int, default=1_000_000)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    count = parse_args(sys.argv[1:]).seats
+    org = build_rows(count)
+    path = os.path.join(tempfile.mkdtemp(), "org.snap")
+    print(f"{len(org.names)} seats")
+    print(f"  save (array columns): {timed(org.save, path):.3f}s, {os.path.getsize(path) / len(org.names):.1f} bytes per seat")
+    for backend in (OrganizationManager, ArrayOrganizationManager):
+        loaded = backend(sink=SilentSink())
+        print(f"  load into {backend.__name__}: {timed(loaded.load, path):.3f}s")
+    os.remove(path)
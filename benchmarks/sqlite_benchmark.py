@@ -0,0 +1,104 @@
+# Compares the SQLite storage engine on a database file against the in-memory object tree.
+# Run from the repository root: python benchmarks/sqlite_benchmark.py [--seats N] [--batch-sizes 1,64,1024] [--json PATH]
+# Every run loads the same generated chart and replays the same command mix, only the storage changes.
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from organization_manager import OrganizationManager
+from sqlite_organization import SqliteOrganizationManager
+from sinks import SilentSink
+from command_benchmark import git_commit, run_mix, time_full_display
+from org_generator import generate_preorder
+
+def database_size(path):
+    # Bytes of the database together with its write-ahead log.
+    return sum(os.path.getsize(file) for file in (path, path + "-wal") if os.path.exists(file))
+
+def run_storage(label, make_org, chart, operations, seed):
+    # Import, command mix and full chart timings of one storage choice.
+    org = make_org()
+    start = time.perf_counter()
+    org._import_preorder(*chart)
+    imported = time.perf_counter() - start
+    start = time.perf_counter()
+    stats = run_mix(org, operations, seed=seed)
+    if isinstance(org, SqliteOrganizationManager):
+        # The last partial batch counts toward the time it takes to keep the mix
+        org.sync()
+    elapsed = time.perf_counter() - start
+    row = {
+        "storage": label,
+        "import_sec": imported,
+        "ops_per_sec": operations / elapsed if elapsed else 0.0,
+        "full_display_sec": time_full_display(org, repeats=1),
+        "commands": stats,
+        "db_bytes": None,
+    }
+    if isinstance(org, SqliteOrganizationManager):
+        org.close()
+        row["db_bytes"] = database_size(org.path)
+    return row
+
+def run_benchmark(seats, operations, batch_sizes, seed=0, directory=None):
+    chart = generate_preorder(seats, seed=seed)
+    directory = directory if directory is not None else tempfile.mkdtemp()
+    rows = [run_storage("memory", lambda: OrganizationManager(sink=SilentSink()), chart, operations, seed)]
+    for batch_size in batch_sizes:
+        path = os.path.join(directory, f"org-{batch_size}.db")
+        for file in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(file):
+                os.remove(file)
+        rows.append(run_storage(f"sqlite batch {batch_size}",
+                                lambda: SqliteOrganizationManager(sink=SilentSink(), path=path, batch_size=batch_size),
+                                chart, operations, seed))
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "seats": len(chart[0]),
+            "operations": operations,
+            "batch_sizes": list(batch_sizes),
+            "seed": seed,
+        },
+        "rows": rows,
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    print(f"{meta['seats']} seats, {meta['operations']} operations, SQLite {meta['sqlite']} (commit {meta['commit']})")
+    print(f"  {'storage':<20}{'import s':>10}{'ops/sec':>10}{'display s':>11}{'db MiB':>9}")
+    for row in report["rows"]:
+        size = f"{row['db_bytes'] / 2 ** 20:.1f}" if row["db_bytes"] is not None else "-"
+        print(f"  {row['storage']:<20}{row['import_sec']:>10.3f}{row['ops_per_sec']:>10.0f}{row['full_display_sec']:>11.3f}{size:>9}")
+    for row in report["rows"]:
+        print(f"  {row['storage']}")
+        for command, stats in row["commands"].items():
+            print(f"    {command:<22}{stats['ops_per_sec']:>12.0f} ops/sec{stats['p50_us']:>10.1f} p50 us{stats['p99_us']:>10.1f} p99 us")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Compare the SQLite storage engine with the in-memory tree.")
+    parser.add_argument("--seats", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=5_000)
+    parser.add_argument("--batch-sizes", default="1,64,1024", help="Comma separated changes per SQLite commit.")
+    parser.add_argument("--directory", help="Where the database files go, a new temporary directory by default.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    report = run_benchmark(args.seats, args.operations, batch_sizes, args.seed, args.directory)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,119 @@
+# Measures total throughput of many tenants on tenants.TenantHost as the number of worker processes grows.
+# Run from the repository root: python benchmarks/tenant_benchmark.py [--tenants N] [--seats N] [--workers 1,2,4] [--json PATH]
+# Every run sends the same command batches to the same tenants, only the number of workers changes.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from employee import DEFAULT_LADDER
+from snapshot import VACANT_FLAG
+from tenants import TenantHost
+from command_benchmark import BACKENDS, git_commit
+from org_generator import generate_preorder
+
+# Commands of each batch, the arguments are picked from the tenant's generated chart
+TENANT_MIX = {
+    "HIRE": 40,
+    "QUIT": 20,
+    "COUNT": 20,
+    "DISPLAY": 20,
+}
+
+def tenant_batches(roles, names, operations, batch, rng):
+    # Command lines for one tenant, operations of them in batches of batch lines.
+    # QUIT takes names hired earlier in the same stream, so most of the commands succeed.
+    managers = []
+    next_name = iter(names).__next__
+    for code in roles:
+        if not code & VACANT_FLAG:
+            name = next_name()
+            if code < DEFAULT_LADDER.bottom:
+                managers.append(name)
+    commands = list(TENANT_MIX)
+    weights = [TENANT_MIX[command] for command in commands]
+    hired = []
+    lines = []
+    for step in range(operations):
+        command = rng.choices(commands, weights)[0]
+        if command == "QUIT" and hired:
+            lines.append(f"QUIT {hired.pop(rng.randrange(len(hired)))}")
+        elif command == "COUNT":
+            lines.append(f"COUNT {rng.choice(names)}")
+        elif command == "DISPLAY":
+            lines.append(f"DISPLAY {rng.choice(managers)} 1")
+        else:
+            hired.append(f"N{step}")
+            lines.append(f"HIRE {rng.choice(managers)} {hired[-1]}")
+    return [lines[start:start + batch] for start in range(0, len(lines), batch)]
+
+def run_workers(workers, charts, batches, backend):
+    # Wall-clock ops/sec of every tenant's batches, sent round robin over the tenants without waiting in between.
+    with TenantHost(workers, BACKENDS[backend]) as host:
+        for tenant, chart in enumerate(charts):
+            host.restore(tenant, (DEFAULT_LADDER, *chart))
+        rounds = max(len(tenant_batches) for tenant_batches in batches)
+        statuses = Counter()
+        start = time.perf_counter()
+        futures = [host.submit(tenant, tenant_batches[step])
+                   for step in range(rounds) for tenant, tenant_batches in enumerate(batches) if step < len(tenant_batches)]
+        for future in futures:
+            statuses.update(response.status for response in future.result())
+        elapsed = time.perf_counter() - start
+    done = sum(statuses.values())
+    return {"workers": workers, "ops_per_sec": done / elapsed if elapsed else 0.0, "operations": done, "statuses": dict(statuses)}
+
+def run_benchmark(tenants, seats, operations, worker_counts, batch=64, backend="object", seed=0):
+    # operations commands per tenant, run once for each number of workers.
+    rng = random.Random(seed)
+    charts = [generate_preorder(seats, seed=seed + tenant) for tenant in range(tenants)]
+    batches = [tenant_batches(roles, names, operations, batch, rng) for roles, _, names in charts]
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "backend": backend,
+            "tenants": tenants,
+            "seats": seats,
+            "operations": operations,
+            "batch": batch,
+            "seed": seed,
+            "cpus": os.cpu_count(),
+        },
+        "rows": [run_workers(workers, charts, batches, backend) for workers in worker_counts],
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    print(f"{meta['backend']} backend, {meta['tenants']} tenants of {meta['seats']} seats, {meta['operations']} operations each "
+          f"in batches of {meta['batch']}, {meta['cpus']} cpus (commit {meta['commit']})")
+    print(f"  {'workers':>7}{'ops/sec':>12}{'speedup':>9}")
+    base = report["rows"][0]["ops_per_sec"] if report["rows"] else 0.0
+    for row in report["rows"]:
+        speedup = row["ops_per_sec"] / base if base else 0.0
+        print(f"  {row['workers']:>7}{row['ops_per_sec']:>12.0f}{speedup:>8.2f}x")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Measure tenant host throughput across worker process counts.")
+    parser.add_argument("--tenants", type=int, default=16)
+    parser.add_argument("--seats", type=int, default=5_000, help="Seats of each tenant's organization.")
+    parser.add_argument("--operations", type=int, default=5_000, help="Commands sent to each tenant.")
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated worker process counts.")
+    parser.add_argument("--batch", type=int, default=64, help="Command lines per submitted batch.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="object")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    worker_counts = [int(count) for count in args.workers.split(",")]
+    report = run_benchmark(args.tenants, args.seats, args.operations, worker_counts, args.batch, args.backend, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,93 @@
+# Runs a long churn of commands and reports, window by window, how many Vacancies the tree holds and what the
+# opening checks cost, to see both stay flat however long the churn runs.
+# Run from the repository root: python benchmarks/vacancy_benchmark.py [--seats N] [--windows N] [--json PATH]
+# Add --keep-empty to turn off the removal of emptied Vacancies and watch them pile up instead.
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import VACANT_FLAG
+from command_benchmark import BACKENDS, DEFAULT_MIX, git_commit, run_mix
+from org_generator import generate_org
+
+# The steady-state mix without displays, which only read the tree, and with more hires since so many land on full managers
+CHURN_MIX = dict(DEFAULT_MIX, hire_employee=120, display_organization=0)
+
+def vacancy_counts(org):
+    # (Vacancies, Vacancies nobody reports to) in the whole tree.
+    roles, report_counts, _ = org._export_preorder()
+    vacancies = empty = 0
+    for code, count in zip(roles, report_counts):
+        if code & VACANT_FLAG:
+            vacancies += 1
+            empty += not count
+    return vacancies, empty
+
+def time_opening_checks(org):
+    # Mean microseconds of _has_spots, the check every hire, transfer and promotion makes, over every employee.
+    managers = [org._find_employee(name) for name in org.employee_lookup]
+    start = time.perf_counter_ns()
+    for manager in managers:
+        org._has_spots(manager)
+    return (time.perf_counter_ns() - start) / 1000 / max(1, len(managers))
+
+def run_churn(seats, windows, window_operations, backend="object", keep_empty=False, seed=0):
+    org = generate_org(seats, BACKENDS[backend], seed=seed)
+    if keep_empty:
+        org._collapse_if_empty = lambda spot: 0
+    rows = []
+    for window in range(windows):
+        stats = run_mix(org, window_operations, CHURN_MIX, seed=seed + window)
+        elapsed = sum(entry["count"] / entry["ops_per_sec"] for entry in stats.values() if entry["ops_per_sec"])
+        vacancies, empty = vacancy_counts(org)
+        rows.append({
+            "operations": (window + 1) * window_operations,
+            "ops_per_sec": window_operations / elapsed if elapsed else 0.0,
+            "employees": len(org.employee_lookup),
+            "vacancies": vacancies,
+            "empty_vacancies": empty,
+            "opening_check_us": time_opening_checks(org),
+        })
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "backend": backend,
+            "seats": seats,
+            "windows": windows,
+            "window_operations": window_operations,
+            "keep_empty": keep_empty,
+            "seed": seed,
+        },
+        "windows": rows,
+    }
+
+def print_report(report):
+    meta = report["meta"]
+    kept = ", empty Vacancies kept" if meta["keep_empty"] else ""
+    print(f"{meta['backend']} backend, {meta['seats']} seats, {meta['windows']} x {meta['window_operations']} operations{kept} (commit {meta['commit']})")
+    print(f"  {'operations':>10}{'ops/sec':>10}{'employees':>11}{'vacancies':>11}{'empty':>8}{'check us':>10}")
+    for row in report["windows"]:
+        print(f"  {row['operations']:>10}{row['ops_per_sec']:>10.0f}{row['employees']:>11}{row['vacancies']:>11}{row['empty_vacancies']:>8}{row['opening_check_us']:>10.2f}")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Track Vacancies and opening checks over a long churn.")
+    parser.add_argument("--seats", type=int, default=20_000)
+    parser.add_argument("--windows", type=int, default=10)
+    parser.add_argument("--window-operations", type=int, default=20_000)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="object")
+    parser.add_argument("--keep-empty", action="store_true", help="Leave emptied Vacancies in place, as before they were removed.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH.")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    report = run_churn(args.seats, args.windows, args.window_operations, args.backend, args.keep_empty, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
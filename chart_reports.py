@@ -0,0 +1,119 @@
+import itertools
+from array import array
+
+from results import OperationResult, Status
+from snapshot import VACANT_FLAG, write_snapshot
+
+# Chart, FIND, COUNT and snapshot output shared by the live organization and its read-only views.
+# Both are trees of spots with a name (None for a Vacancy), a role, a role code and their reports in order, under a
+# president, with a ladder, a sink and an employee_lookup, and both tell how much is below a spot through
+# _counts_below and _levels_below. Nothing here reads anything else, so a view prints, counts and saves exactly what
+# the live organization did when the view was taken.
+
+DISPLAY_CHUNK_LINES = 4096  # Chart lines joined into each write to the sink
+FIND_LIMIT = 50             # Most names FIND lists at once
+
+class ChartReports:
+    def _report(self, status, template, *names):
+        # Builds an operation result and routes it to the output sink.
+        result = OperationResult(status, template, names)
+        self.sink.emit(result)
+        return result
+
+    def _report_missing(self, template, name):
+        # Reports a name that does not exist, with the closest existing names if there are any.
+        suggestions = self.employee_lookup.suggest(name)
+        if suggestions:
+            return self._report(Status.NOT_FOUND, template + " Did you mean {1}?", name, " or ".join(suggestions))
+        return self._report(Status.NOT_FOUND, template, name)
+
+    def _display_lines(self, root, max_depth=None):
+        # Yields the chart lines of root and everyone below it, down to max_depth levels under root.
+        # Walks with an explicit stack of report iterators, so deep hierarchies do not hit the recursion limit.
+        yield f"{root.role}: {root.name}\n"
+        stack = [(iter(root.reports), 1)]
+        while stack:
+            reports, depth = stack[-1]
+            report = next(reports, None)
+            if report is None:
+                stack.pop()
+                continue
+            indent = "\t" * depth
+            if report.name is None:
+                yield f"{indent}VACANCY: {report.role}\n"
+            else:
+                yield f"{indent}{report.role}: {report.name}\n"
+            if report.reports and (max_depth is None or depth < max_depth):
+                stack.append((iter(report.reports), depth + 1))
+
+    def _chart_chunks(self, root, max_depth=None):
+        # Chart of root in chunks of DISPLAY_CHUNK_LINES lines, each only rendered when it is taken.
+        lines = self._display_lines(root, max_depth)
+        return iter(lambda: "".join(itertools.islice(lines, DISPLAY_CHUNK_LINES)), "")
+
+    def chart_chunks(self, root_name=None, max_depth=None):
+        # Returns the result DISPLAY would and an iterator over its chart in chunks, so a caller can stream a large
+        # chart at its own pace. root_name limits the chart to one branch, max_depth to that many levels below it.
+        if self.president is None:
+            return self._report(Status.EMPTY, "Organization is empty."), iter(())
+        if root_name is None:
+            root = self.president
+        else:
+            root = self._find_employee(root_name)
+            if root is None:
+                return self._report_missing("Error: Employee name {0} does not exist.", root_name), iter(())
+        if root == self.president:
+            result = OperationResult(Status.OK, "Displayed organization of President {0}.", (root.name,))
+        else:
+            result = OperationResult(Status.OK, "Displayed organization under {0}.", (root.name,))
+        return result, self._chart_chunks(root, max_depth)
+
+    def display_organization(self, root_name=None, max_depth=None):
+        # Displays the organization hierarchy (Requirement 11), see chart_chunks.
+        result, chunks = self.chart_chunks(root_name, max_depth)
+        for chunk in chunks:
+            self.sink.write(chunk)
+        return result
+
+    def find_employees(self, prefix: str, limit=FIND_LIMIT):
+        # Lists the employees whose names start with prefix, in name order, at most limit of them.
+        names = self.employee_lookup.with_prefix(prefix, limit + 1)
+        shown = names[:limit]
+        if shown:
+            self.sink.write("".join(f"{self._find_employee(name).role}: {name}\n" for name in shown))
+        if len(names) > limit:
+            return self._report(Status.OK, "Showing the first {0} names starting with {1}.", str(limit), prefix)
+        return self._report(Status.OK, "Found {0} names starting with {1}.", str(len(shown)), prefix)
+
+    def count_employees(self, name: str):
+        # Reports how many employees of each role, and how many vacancies and levels, are below name.
+        spot = self._find_employee(name)
+        if spot is None:
+            return self._report_missing("Error: Employee name {0} does not exist.", name)
+        counts = self._counts_below(spot)
+        roles = ", ".join(f"{role}: {counts[code]}" for code, role in enumerate(self.ladder.roles) if counts[code])
+        return self._report(Status.OK, "{0} has {1} employees below ({2}) and {3} vacancies, {4} levels deep.",
+                            name, str(sum(counts[:-1])), roles or "none", str(counts[-1]), str(len(self._levels_below(spot))))
+
+    def _export_preorder(self):
+        # Flattens the tree into preorder role codes, report counts and names for a snapshot.
+        roles = array("B")
+        report_counts = array("I")
+        names = []
+        stack = [self.president] if self.president is not None else []
+        while stack:
+            spot = stack.pop()
+            if spot.name is None:
+                roles.append(spot.role_code | VACANT_FLAG)
+            else:
+                roles.append(spot.role_code)
+                names.append(spot.name)
+            report_counts.append(len(spot.reports))
+            stack.extend(reversed(spot.reports))
+        return roles, report_counts, names
+
+    def save(self, path: str):
+        # Writes the whole organization to a binary snapshot file.
+        roles, report_counts, names = self._export_preorder()
+        write_snapshot(path, roles, report_counts, names)
+        return self._report(Status.OK, "Saved {0} positions to {1}.", str(len(roles)), path)
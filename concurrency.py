@@ -0,0 +1,322 @@
+import itertools
+import threading
+from contextlib import contextmanager
+from operator import itemgetter
+
+from array_organization import ArrayOrganizationManager
+from chart_reports import FIND_LIMIT
+from name_index import NameIndex
+from organization_manager import OrganizationManager
+from results import Status
+
+# Organization managers that several threads can use at once.
+#
+# The President's reports split the organization into branches, each with its own lock. A change confined to one
+# branch (hiring under a Supervisor, firing a Worker) holds the structure lock shared and that branch's lock, so
+# changes in other branches go ahead at the same time. A change that spans branches (a transfer or promotion from one
+# Vice President's branch to another's) takes each branch lock it needs in the order the locks were made, which every
+# thread follows, so two of them can never wait on each other. Anything that touches the President's own reports,
+# searches the whole organization (a layoff looking for the nearest opening) or walks it (UNDO, REDO, loading, taking a
+# view) holds the structure lock exclusively. A branch whose top spot is a Vacancy counts as the President's too,
+# since emptying it removes that Vacancy from the President's reports.
+#
+# The little every change shares across branches, the counts on the President, the openings and name indexes, the
+# free rows of the array backend and the journal, is updated under a short bookkeeping lock. Full charts, saves and
+# views are rendered from a view, so they only hold the structure lock while the view is taken. A change's journal
+# fsync and a branch chart's writes are the only waits on I/O, which is when threads overlap under the GIL, and the
+# fsync waits until the change has let go of its locks.
+#
+# Transactions are not available, a rollback could undo changes other threads have built on. Other queries than the
+# ones below are not locked, run them on a view. Statistics may miss a call now and then when threads race.
+
+class SharedLock:
+    # Held by many threads in shared mode or by one in exclusive mode. A thread waiting for exclusive mode keeps new
+    # shared holders out, so a steady stream of branch changes cannot starve it.
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.shared = 0             # Threads holding the lock in shared mode
+        self.exclusive = False      # True while one thread holds it exclusively
+        self.waiting = 0            # Threads waiting for exclusive mode
+
+    def acquire_shared(self):
+        with self.condition:
+            while self.exclusive or self.waiting:
+                self.condition.wait()
+            self.shared += 1
+
+    def release_shared(self):
+        with self.condition:
+            self.shared -= 1
+            if not self.shared:
+                self.condition.notify_all()
+
+    def acquire_exclusive(self):
+        with self.condition:
+            self.waiting += 1
+            while self.exclusive or self.shared:
+                self.condition.wait()
+            self.waiting -= 1
+            self.exclusive = True
+
+    def release_exclusive(self):
+        with self.condition:
+            self.exclusive = False
+            self.condition.notify_all()
+
+class LockedNameIndex(NameIndex):
+    # NameIndex several threads can change at once. Lookups stay plain dict reads, the sorted view is kept under a lock.
+    def __init__(self, items=()):
+        self.lock = threading.RLock()
+        super().__init__(items)
+
+    def __setitem__(self, name, spot):
+        with self.lock:
+            super().__setitem__(name, spot)
+
+    def __delitem__(self, name):
+        with self.lock:
+            super().__delitem__(name)
+
+    def with_prefix(self, prefix: str, limit=None):
+        with self.lock:
+            return super().with_prefix(prefix, limit)
+
+    def suggest(self, name: str, limit=3):
+        with self.lock:
+            return super().suggest(name, limit)
+
+class ConcurrentMixin:
+    def __init__(self, sink=None, ladder=None):
+        self._local = threading.local()     # Per thread: the change running now and whether locks are already held
+        super().__init__(sink, ladder)
+        self._structure = SharedLock()
+        self._bookkeeping = threading.RLock()
+        self._branch_locks = {}             # Top spot of a branch to (order, lock), dropped whenever nobody holds one
+        self._lock_order = itertools.count()
+        self._hiring = {}                   # Names being hired right now to the thread hiring them
+        self._compaction_due = False
+        self.employee_lookup = LockedNameIndex(self.employee_lookup)
+        # Room for every level of the ladder from the start, so no change in one branch has to relabel another
+        needed = sum(max(capacity, 1).bit_length() + 2 for capacity in self.ladder.capacities)
+        self._label_bits = max(self._label_bits, 2 * needed)
+
+    # The inverse steps of a change go to the thread making it
+    @property
+    def _changes(self):
+        return getattr(self._local, "changes", None)
+
+    @_changes.setter
+    def _changes(self, changes):
+        self._local.changes = changes
+
+    # ----- Locking -----
+
+    def _branch_of(self, name, movable):
+        # Top spot of the branch name is in, or None if a change involving name needs the whole organization: name
+        # does not exist, is the President, is the top of its branch and movable, or the branch is topped by a Vacancy.
+        spot = self._find_employee(name)
+        if spot is None:
+            return None
+        below = spot
+        while True:
+            boss = below.boss
+            if boss is None:
+                # The President, or a spot another thread is moving right now
+                return None
+            if boss.boss is None:
+                break
+            below = boss
+        if below.is_vacant() or (movable and below == spot):
+            return None
+        return below
+
+    def _branch_locks_for(self, moved, changed, read):
+        # (order, lock) of every branch the names are in, in the order they must be taken, or None for exclusive mode.
+        # moved names change places or leave, changed names get or lose reports, read names are only looked at.
+        roots = set()
+        for names, movable in ((moved, True), (changed, False), (read, False)):
+            for name in names:
+                if names is read and name == self.president.name:
+                    # The President's role and labels never change outside exclusive mode
+                    continue
+                root = self._branch_of(name, movable)
+                if root is None:
+                    return None
+                roots.add(root)
+        entries = []
+        for root in roots:
+            entry = self._branch_locks.get(root)
+            if entry is None:
+                entry = self._branch_locks.setdefault(root, (next(self._lock_order), threading.Lock()))
+            entries.append(entry)
+        entries.sort(key=itemgetter(0))
+        return entries
+
+    @contextmanager
+    def _exclusive(self):
+        self._structure.acquire_exclusive()
+        try:
+            # Nobody holds a branch lock now, so the ones of branches that are gone can go too
+            self._branch_locks.clear()
+            yield
+        finally:
+            self._structure.release_exclusive()
+
+    def _run(self, method, *args, moved=(), changed=(), read=(), exclusive=False):
+        # Calls method with the locks its names need. A call made while locks are held, like REDO running a
+        # command again, runs under them.
+        local = self._local
+        if getattr(local, "held", False):
+            return method(*args)
+        local.held = True
+        try:
+            if not exclusive and self.president is not None:
+                self._structure.acquire_shared()
+                try:
+                    locks = self._branch_locks_for(moved, changed, read)
+                    while locks is not None:
+                        for _, lock in locks:
+                            lock.acquire()
+                        try:
+                            # The names may have moved to other branches while this thread waited
+                            again = self._branch_locks_for(moved, changed, read)
+                            if again == locks:
+                                return method(*args)
+                        finally:
+                            for _, lock in reversed(locks):
+                                lock.release()
+                        locks = again
+                finally:
+                    self._structure.release_shared()
+            with self._exclusive():
+                return method(*args)
+        finally:
+            local.held = False
+            if getattr(local, "sync_due", False):
+                local.sync_due = False
+                if self.journal is not None:
+                    self.journal.fsync()
+            if self._compaction_due:
+                self._compact_journal()
+
+    def _journal_sync_due(self):
+        # The change's fsync waits until it has let go of its locks, so changes in other branches, and anything
+        # that needs the whole organization, do not queue behind the disk. The call still returns only once it is synced.
+        self._local.sync_due = True
+
+    def _journal_full(self):
+        # Compaction reads the whole tree, so it waits until the change that filled the segment has let go of its locks.
+        self._compaction_due = True
+
+    def _compact_journal(self):
+        with self._exclusive():
+            if self._compaction_due:
+                self._compaction_due = False
+                self.journal.compact()
+
+    # ----- Bookkeeping shared by every branch -----
+
+    def _count(self, spot, index, delta):
+        with self._bookkeeping:
+            super()._count(spot, index, delta)
+
+    def _count_branch(self, spot, sign):
+        with self._bookkeeping:
+            super()._count_branch(spot, sign)
+
+    def _update_openings(self, spot):
+        with self._bookkeeping:
+            super()._update_openings(spot)
+
+    def _drop_openings(self, spot):
+        with self._bookkeeping:
+            super()._drop_openings(spot)
+
+    def _relabel(self, spot):
+        with self._bookkeeping:
+            super()._relabel(spot)
+
+    def _import_preorder(self, roles, report_counts, names):
+        super()._import_preorder(roles, report_counts, names)
+        self.employee_lookup = LockedNameIndex(self.employee_lookup)
+
+    # ----- Changes -----
+
+    def initialize_president(self, name: str):
+        return self._run(super().initialize_president, name, exclusive=True)
+
+    def hire_employee(self, hiring_manager_name: str, new_employee_name: str):
+        # Two hires of one name in different branches would both pass the duplicate check, the second one waits
+        hiring = self._hiring.setdefault(new_employee_name, threading.get_ident())
+        if hiring != threading.get_ident():
+            return self._run(super().hire_employee, hiring_manager_name, new_employee_name, exclusive=True)
+        try:
+            return self._run(super().hire_employee, hiring_manager_name, new_employee_name, changed=(hiring_manager_name,))
+        finally:
+            del self._hiring[new_employee_name]
+
+    def fire_employee(self, firing_manager_name: str, target_employee_name: str):
+        return self._run(super().fire_employee, firing_manager_name, target_employee_name,
+                         moved=(target_employee_name,), read=(firing_manager_name,))
+
+    def employee_quits(self, employee_name: str):
+        return self._run(super().employee_quits, employee_name, moved=(employee_name,))
+
+    def layoff_employee(self, manager_name: str, target_employee_name: str):
+        return self._run(super().layoff_employee, manager_name, target_employee_name, exclusive=True)
+
+    def transfer_employee(self, initiator_name: str, employee_name: str, destination_manager_name: str):
+        return self._run(super().transfer_employee, initiator_name, employee_name, destination_manager_name,
+                         moved=(employee_name,), changed=(destination_manager_name,), read=(initiator_name,))
+
+    def promote_employee(self, receiving_manager_name: str, target_employee_name: str):
+        return self._run(super().promote_employee, receiving_manager_name, target_employee_name,
+                         moved=(target_employee_name,), changed=(receiving_manager_name,))
+
+    def undo(self):
+        return self._run(super().undo, exclusive=True)
+
+    def redo(self):
+        return self._run(super().redo, exclusive=True)
+
+    def begin(self):
+        return self._report(Status.NOT_PERMITTED, "Error: Transactions are not available on a concurrent organization.")
+
+    def compact_vacancies(self):
+        return self._run(super().compact_vacancies, exclusive=True)
+
+    def load(self, path: str):
+        return self._run(super().load, path, exclusive=True)
+
+    # ----- Reads -----
+
+    def view(self, sink=None, names=()):
+        return self._run(super().view, sink, names, exclusive=True)
+
+    def display_organization(self, root_name=None, max_depth=None):
+        # A branch is drawn under its lock, the whole organization from a view.
+        if root_name is None or root_name == getattr(self.president, "name", None):
+            names = () if root_name is None else (root_name,)
+            return self.view(names=names).display_organization(root_name, max_depth)
+        return self._run(super().display_organization, root_name, max_depth, changed=(root_name,))
+
+    def count_employees(self, name: str):
+        return self._run(super().count_employees, name, changed=(name,))
+
+    def find_employees(self, prefix: str, limit=FIND_LIMIT):
+        return self._run(super().find_employees, prefix, limit, exclusive=True)
+
+    def save(self, path: str):
+        return self.view().save(path)
+
+class ConcurrentOrganizationManager(ConcurrentMixin, OrganizationManager):
+    pass
+
+class ConcurrentArrayOrganizationManager(ConcurrentMixin, ArrayOrganizationManager):
+    def _new_row(self, role_code, name, boss):
+        with self._bookkeeping:
+            return super()._new_row(role_code, name, boss)
+
+    def _free_row(self, row):
+        with self._bookkeeping:
+            super()._free_row(row)
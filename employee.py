@@ -7,28 +7,218 @@ ROLE_CAPACITY = {
     "Worker": 0
 }
 
+# Roles are stored on each spot as a small integer code, from the top of the company down
+ROLES = ("President", "Vice President", "Supervisor", "Worker")
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+CAPACITY_BY_CODE = tuple(ROLE_CAPACITY[role] for role in ROLES)
+PRESIDENT, VICE_PRESIDENT, SUPERVISOR, WORKER = range(len(ROLES))
+
+NO_REPORTS = ()     # Shared by every spot that cannot have reports, replaced by ReportSlots on promotion
+
+MAX_LEVELS = 127    # Role codes have to fit in a snapshot byte next to its vacancy flag
+
+class RoleLadder:
+    # Roles from the top of the company down, with how many direct reports each role may have.
+    # Code 0 is the President's role; the bottom role cannot have reports.
+    def __init__(self, roles, capacities):
+        roles = tuple(roles)
+        capacities = tuple(capacities)
+        if len(roles) < 2 or len(roles) != len(capacities):
+            raise ValueError("A role ladder needs at least two roles and one capacity per role")
+        if len(roles) > MAX_LEVELS:
+            raise ValueError(f"A role ladder can have at most {MAX_LEVELS} roles")
+        if len(set(roles)) != len(roles):
+            raise ValueError("Role names must be unique")
+        if capacities[-1] != 0 or min(capacities[:-1]) < 1:
+            raise ValueError("Every role but the bottom one needs room for reports, the bottom one none")
+        self.roles = roles
+        self.capacities = capacities
+        self.codes = {role: code for code, role in enumerate(roles)}
+        self.bottom = len(roles) - 1
+
+    @classmethod
+    def parse(cls, text: str):
+        # Builds a ladder from "President:2,Vice President:3,Supervisor:5,Worker:0".
+        roles = []
+        capacities = []
+        for entry in text.split(","):
+            role, _, capacity = entry.rpartition(":")
+            if not role.strip() or not capacity.strip().isdigit():
+                raise ValueError(f"Expected <Role>:<Capacity>, got '{entry}'")
+            roles.append(role.strip())
+            capacities.append(int(capacity))
+        return cls(roles, capacities)
+
+    def below(self, role_code: int):
+        # Role code of a direct report, None for the bottom role.
+        return role_code + 1 if role_code < self.bottom else None
+
+    def __repr__(self):
+        return "RoleLadder(" + ", ".join(f"{role}:{capacity}" for role, capacity in zip(self.roles, self.capacities)) + ")"
+
+DEFAULT_LADDER = RoleLadder(ROLES, CAPACITY_BY_CODE)
+
+class ReportSlots:
+    # A manager's direct reports, one slot each in a list sized by the role's capacity. Every report keeps its slot
+    # number in spot.slot, so taking a report out or putting another in its place is O(1) and leaves everyone else
+    # where they were. Taken out reports leave an empty slot; new ones go after the last used slot, and only when that
+    # reaches the end are the used slots packed to the front, in order. Iterating skips the empty slots.
+    __slots__ = ("slots", "count", "end")
+
+    def __init__(self, size: int):
+        self.slots = [None] * size
+        self.count = 0  # Reports held
+        self.end = 0    # One past the last used slot
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return filter(None, self.slots)
+
+    def __reversed__(self):
+        return filter(None, self.slots[self.end - 1::-1] if self.end else ())
+
+    def __contains__(self, spot):
+        slot = getattr(spot, "slot", -1)
+        return 0 <= slot < self.end and self.slots[slot] is spot
+
+    def __getitem__(self, slot: int):
+        # The report in a slot, None if it is empty.
+        return self.slots[slot]
+
+    def __setitem__(self, slot: int, spot):
+        # Puts spot in place of the report in a used slot.
+        self.slots[slot] = spot
+        spot.slot = slot
+
+    def __eq__(self, other):
+        if isinstance(other, ReportSlots):
+            other = list(other)
+        return list(self) == other
+
+    def __repr__(self):
+        return f"ReportSlots({list(self)!r})"
+
+    def append(self, spot):
+        if self.end == len(self.slots):
+            if self.count < self.end:
+                self._pack()
+            else:
+                # Only a President over capacity or an imported tree fills every slot and asks for more
+                self.slots.append(None)
+        self.slots[self.end] = spot
+        spot.slot = self.end
+        self.end += 1
+        self.count += 1
+
+    def remove(self, spot):
+        if spot not in self:
+            raise ValueError("ReportSlots.remove(x): x not in reports")
+        self.slots[spot.slot] = None
+        self.count -= 1
+        while self.end and self.slots[self.end - 1] is None:
+            self.end -= 1
+
+    def index(self, spot):
+        # Slot of spot.
+        if spot not in self:
+            raise ValueError("ReportSlots.index(x): x not in reports")
+        return spot.slot
+
+    def last(self):
+        # Report in the last used slot, None if there are no reports.
+        return self.slots[self.end - 1] if self.end else None
+
+    def before(self, spot):
+        # Report in the closest used slot before spot's, None if spot comes first.
+        for slot in range(spot.slot - 1, -1, -1):
+            if self.slots[slot] is not None:
+                return self.slots[slot]
+        return None
+
+    def after(self, spot):
+        # Report in the closest used slot after spot's, None if spot comes last.
+        for slot in range(spot.slot + 1, self.end):
+            if self.slots[slot] is not None:
+                return self.slots[slot]
+        return None
+
+    def insert_before(self, following, spot):
+        # Puts spot just ahead of following: in the slot before it when that one is empty, otherwise everyone is
+        # packed again with spot in its place.
+        slot = following.slot
+        if slot and self.slots[slot - 1] is None:
+            self.slots[slot - 1] = spot
+            spot.slot = slot - 1
+            self.count += 1
+            return
+        used = list(self)
+        used.insert(used.index(following), spot)
+        slots = self.slots
+        if len(used) > len(slots):
+            slots.extend([None] * (len(used) - len(slots)))
+        for slot, report in enumerate(used):
+            slots[slot] = report
+            report.slot = slot
+        slots[len(used):] = [None] * (len(slots) - len(used))
+        self.count = self.end = len(used)
+
+    def _pack(self):
+        slots = self.slots
+        used = [spot for spot in slots[:self.end] if spot is not None]
+        for slot, spot in enumerate(used):
+            slots[slot] = spot
+            spot.slot = slot
+        slots[len(used):] = [None] * (len(slots) - len(used))
+        self.end = len(used)
+
 class OrganizationSpot(ABC):
+    __slots__ = ("role_code", "boss", "reports", "slot", "vacancies", "lo", "hi", "ladder", "below", "levels")
+
+    def __init__(self, role: str, boss=None, ladder=DEFAULT_LADDER):
+        self.ladder = ladder                # Role names and capacities the role code refers to
+        self.role_code = ladder.codes[role] # Position in the company
+        self.boss = boss                    # Reference to Employee directly above
+        capacity = ladder.capacities[self.role_code]
+        self.reports = ReportSlots(capacity) if capacity else NO_REPORTS   # Employees directly below
+        self.slot = -1                      # Position in the boss's reports
+        self.vacancies = 0                  # Number of Vacancy objects in reports
+        self.lo = 0                         # Interval label, everyone below sits inside (lo, hi]
+        self.hi = 0
+        self.below = None                   # Employees of each role code below, vacancies last; None until anyone is
+        self.levels = None                  # Spots 1, 2, ... levels below, without trailing zeros; None until anyone is
+
+    @property
+    def role(self):
+        return self.ladder.roles[self.role_code]
+
+    @role.setter
+    def role(self, role: str):
+        self.role_code = self.ladder.codes[role]
+
+    @property
+    def max_reports(self):
+        # Maximum number of direct reports
+        return self.ladder.capacities[self.role_code]
+
     def is_vacant(self):
         return isinstance(self, Vacancy)
 
 class Employee(OrganizationSpot):
-    def __init__(self, name: str, role: str, boss=None):
+    __slots__ = ("name",)
+
+    def __init__(self, name: str, role: str, boss=None, ladder=DEFAULT_LADDER):
+        super().__init__(role, boss, ladder)
         self.name = name                # Unique name, Dont know if just first/last or full name yet
-        self.role = role                # Position in the company
-        self.boss = boss                # Reference to Employee directly above
-        self.reports = []               # List of Employees directly below
-        self.max_reports = ROLE_CAPACITY.get(role, 0) # Maximum number of direct reports
 
     def promote(self):
-        if self.role == "Worker":
-            self.role = "Supervisor"
-        elif self.role == "Supervisor":
-            self.role = "Vice President"
-        self.max_reports = ROLE_CAPACITY.get(self.role, 0)
+        # Moves up one role, never into the President's role
+        if self.role_code > 1:
+            self.role_code -= 1
+        if self.reports is NO_REPORTS and self.max_reports:
+            self.reports = ReportSlots(self.max_reports)
 
 class Vacancy(OrganizationSpot):
-    def __init__(self, role: str, boss=None):
-        self.role = role        # Position in the company
-        self.boss = boss        # Reference to Employee directly above
-        self.reports = []       # List of Employees directly below
-        self.max_reports = ROLE_CAPACITY.get(role, 0) # Maximum number of direct reports
\ No newline at end of file
+    __slots__ = ()
+    name = None     # Read like an Employee's, a Vacancy holds nobody
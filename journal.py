@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import threading
+
+from sinks import SilentSink
+from snapshot import write_snapshot
+
+# Write-ahead journal of successful mutations, kept in one directory.
+#
+#   journal-<n>.log    one JSON array per line: [method name, *arguments], or ["transaction", *those arrays] for
+#                      the changes of one COMMIT, so a crash keeps all of them or none
+#   snapshot-<n>.snap  the organization after every journal segment up to and including <n>
+#
+# Recovery loads the newest snapshot and replays the segments after it. Compaction starts a new
+# segment, then writes the snapshot for the closed ones and deletes them on a background thread.
+
+SEGMENT_PATTERN = re.compile(r"(journal|snapshot)-(\d+)\.(log|snap)$")
+TRANSACTION = "transaction"
+
+# Public methods whose successful calls are journaled and replayed. REDO is journaled as the command it runs again.
+JOURNALED = frozenset({
+    "initialize_president", "hire_employee", "fire_employee", "employee_quits",
+    "layoff_employee", "transfer_employee", "promote_employee", "undo",
+})
+
+def read_journal(path: str):
+    # Returns the records of one segment, stopping at a torn last line left by a crash.
+    records = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.endswith("\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            records.append(record)
+    return records
+
+class Journal:
+    def __init__(self, directory: str, batch_size: int = 64, compact_every: int = 10_000):
+        self.directory = directory
+        self.batch_size = batch_size        # Appends per fsync, a crash loses at most this many commands
+        self.compact_every = compact_every  # Appends per segment before it is folded into a snapshot, 0 never compacts
+        self.org_manager = None
+        self.segment = 0
+        self.file = None
+        self.pending = 0                    # Appends written since the last fsync
+        self.flushed = 0                    # Appends flushed to the file so far, across segments
+        self.synced = 0                     # Of those, the ones an fsync has forced to disk
+        self.appended = 0                   # Appends in the current segment
+        self.compaction = None              # Background snapshot writer, if one is running
+        self.lock = threading.Lock()        # Serializes appends from threads sharing one organization
+        self.sync_lock = threading.Lock()   # One fsync at a time, see fsync
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind: str, number: int):
+        extension = "log" if kind == "journal" else "snap"
+        return os.path.join(self.directory, f"{kind}-{number:08d}.{extension}")
+
+    def _numbers(self, kind: str):
+        numbers = []
+        for entry in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(entry)
+            if match and match.group(1) == kind:
+                numbers.append(int(match.group(2)))
+        return sorted(numbers)
+
+    def _open_segment(self, number: int):
+        self.segment = number
+        self.file = open(self._path("journal", number), "a", encoding="utf-8")
+        self.pending = 0
+        self.appended = 0
+
+    def recover(self, org_manager):
+        # Rebuilds an empty organization from the directory and starts journaling its changes.
+        # Returns the number of replayed commands.
+        snapshots = self._numbers("snapshot")
+        base = snapshots[-1] if snapshots else 0
+        sink = org_manager.sink
+        org_manager.sink = SilentSink()     # Recovery is not news to whoever is watching the output
+        replayed = 0
+        try:
+            if snapshots:
+                org_manager.load(self._path("snapshot", base))
+            segments = [number for number in self._numbers("journal") if number > base]
+            for number in segments:
+                for method, *args in read_journal(self._path("journal", number)):
+                    # A committed transaction replays as the commands in it, each one already known to succeed
+                    for method, *args in args if method == TRANSACTION else [[method, *args]]:
+                        if method in JOURNALED:
+                            getattr(org_manager, method)(*args)
+                            replayed += 1
+        finally:
+            org_manager.sink = sink
+
+        # Always write to a fresh segment, the last one may end in a torn line
+        self._open_segment(max([base] + segments) + 1)
+        self.org_manager = org_manager
+        org_manager.journal = self
+        return replayed
+
+    def append(self, method: str, *args):
+        # Records one successful mutation; the fsync is shared by every batch_size appends.
+        line = json.dumps([method, *args]) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.pending += 1
+            self.appended += 1
+            due = self.pending >= self.batch_size
+            if due:
+                self.file.flush()
+                self.flushed += self.pending
+                self.pending = 0
+            full = self.compact_every and self.appended >= self.compact_every
+        if due:
+            # The organization decides when, a concurrent one first lets go of the locks the change holds
+            self.org_manager._journal_sync_due()
+        if full:
+            # The organization decides when, a concurrent one first lets go of the locks the change holds
+            self.org_manager._journal_full()
+
+    def fsync(self):
+        # Forces everything flushed so far to disk. One fsync runs at a time and covers every append flushed before
+        # it started, so threads that queued behind it are usually covered too and return without one of their own.
+        # It runs on a duplicate of the file descriptor, a compaction may close the segment, after syncing it, meanwhile.
+        with self.lock:
+            flushed = self.flushed
+        with self.sync_lock:
+            if self.synced >= flushed:
+                return
+            with self.lock:
+                if self.file is None:
+                    return
+                flushed = self.flushed
+                descriptor = os.dup(self.file.fileno())
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+            self.synced = flushed
+
+    def append_transaction(self, records):
+        # Records the changes of one COMMIT as a single line, which a crash either keeps whole or tears off.
+        self.append(TRANSACTION, *records)
+
+    def sync(self):
+        # Forces everything appended so far to disk.
+        if self.file is None:
+            return
+        self.file.flush()
+        if self.pending:
+            os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def compact(self):
+        # Folds the finished segments into a snapshot.
+        # The tree is flattened here, writing and cleaning up happens on a background thread.
+        self.wait()
+        self.sync()
+        self.file.close()
+        covered = self.segment
+        flattened = self.org_manager._export_preorder()
+        # Recovery starts from the snapshot with no history, so UNDO may not reach past it here either
+        self.org_manager.clear_history()
+        self._open_segment(covered + 1)
+        self.compaction = threading.Thread(target=self._write_compaction, args=(covered, flattened), daemon=True)
+        self.compaction.start()
+
+    def _write_compaction(self, covered: int, flattened):
+        path = self._path("snapshot", covered)
+        write_snapshot(path + ".tmp", *flattened, sync=True)
+        os.replace(path + ".tmp", path)
+        for kind in ("journal", "snapshot"):
+            for number in self._numbers(kind):
+                if number <= covered and not (kind == "snapshot" and number == covered):
+                    os.remove(self._path(kind, number))
+
+    def wait(self):
+        # Blocks until a running compaction has finished.
+        if self.compaction is not None:
+            self.compaction.join()
+            self.compaction = None
+
+    def close(self):
+        self.sync()
+        self.wait()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.org_manager is not None:
+            self.org_manager.journal = None
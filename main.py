@@ -1,91 +1,319 @@
+import argparse
+import json
+import shutil
+import sys
+import time
+
+from employee import RoleLadder
+from journal import Journal
 from organization_manager import OrganizationManager
+from sqlite_organization import SqliteOrganizationManager
+from sinks import FileSink, PageStopped, PagingSink, SilentSink, StdoutSink
+
+try:
+    import readline
+except ImportError:     # Not available on Windows, the prompt then works without tab completion
+    readline = None
+
+COMMANDS = ("HIRE", "FIRE", "QUIT", "LAYOFF", "TRANSFER", "PROMOTE", "DISPLAY", "COUNT", "FIND", "UNDO", "REDO", "BEGIN", "COMMIT", "ROLLBACK", "SAVE", "STATS", "EXIT")
+COMPLETION_LIMIT = 100      # Most names offered for one tab press
 
 def incorrect_argument_count(command):
     print(f"Incorrect number of arguments for command {command}");
 
-def main():
-    org_manager = OrganizationManager()
-    
+def run_command(org_manager, parts):
+    # Dispatches one parsed command line to the organization manager.
+    # Returns the OperationResult, or None if the command line itself was malformed.
+    result = dispatch_command(org_manager, parts)
+    if result is None:
+        # Inside BEGIN a malformed line is a failed command like any other
+        org_manager.reject_line()
+    return result
+
+def dispatch_command(org_manager, parts):
+    command = parts[0].upper()
+
+    if command == "HIRE":
+        if len(parts) != 3:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: HIRE <ManagerName> <NewEmployeeName>")
+            return None
+        return org_manager.hire_employee(parts[1], parts[2])
+
+    elif command == "FIRE":
+        if len(parts) != 3:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: FIRE <ManagerName> <EmployeeName>")
+            return None
+        return org_manager.fire_employee(parts[1], parts[2])
+
+    elif command == "QUIT":
+        if len(parts) != 2:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: QUIT <EmployeeName>")
+            return None
+        return org_manager.employee_quits(parts[1])
+
+    elif command == "LAYOFF":
+        if len(parts) != 3:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: LAYOFF <ManagerName> <TargetEmployeeName>")
+            return None
+        return org_manager.layoff_employee(parts[1], parts[2])
+
+    elif command == "TRANSFER":
+        if len(parts) != 4:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: TRANSFER <InitiatorName> <EmployeeName> <NewManagerName>")
+            return None
+        return org_manager.transfer_employee(parts[1], parts[2], parts[3])
+
+    elif command == "PROMOTE":
+        if len(parts) != 3:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: PROMOTE <ReceivingManagerName> <TargetEmployeeName>")
+            return None
+        return org_manager.promote_employee(parts[1], parts[2])
+
+    elif command == "DISPLAY":
+        if len(parts) > 3:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: DISPLAY [<Name> [<Depth>]]")
+            return None
+        max_depth = None
+        if len(parts) == 3:
+            if not parts[2].isdigit():
+                print(f"Error: Depth must be a whole number, got '{parts[2]}'.")
+                return None
+            max_depth = int(parts[2])
+        return org_manager.display_organization(parts[1] if len(parts) > 1 else None, max_depth)
+
+    elif command == "COUNT":
+        if len(parts) != 2:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: COUNT <Name>")
+            return None
+        return org_manager.count_employees(parts[1])
+
+    elif command == "FIND":
+        if len(parts) != 2:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: FIND <Prefix>")
+            return None
+        return org_manager.find_employees(parts[1])
+
+    elif command in ("UNDO", "REDO"):
+        if len(parts) != 1:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: {command}")
+            return None
+        return org_manager.undo() if command == "UNDO" else org_manager.redo()
+
+    elif command in ("BEGIN", "COMMIT", "ROLLBACK"):
+        if len(parts) != 1:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: {command}")
+            return None
+        return getattr(org_manager, command.lower())()
+
+    elif command == "STATS":
+        if len(parts) != 1:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: STATS")
+            return None
+        return org_manager.report_stats()
+
+    elif command == "SAVE":
+        if len(parts) != 2:
+            incorrect_argument_count(command)
+            print(f"Syntax should be: SAVE <Path>")
+            return None
+        return org_manager.save(parts[1])
+
+    else:
+        print(f"Error: Unknown command '{command}'.")
+        return None
+
+def completions(org_manager, line, text):
+    # Candidates for the word being typed: a command as the first word, an employee name after that.
+    if not line[:len(line) - len(text)].strip():
+        return [command + " " for command in COMMANDS if command.startswith(text.upper())]
+    return [name + " " for name in org_manager.employee_lookup.with_prefix(text, COMPLETION_LIMIT)]
+
+def enable_completion(org_manager):
+    # Binds the tab key to completions() for the interactive prompt.
+    matches = []
+
+    def complete(text, state):
+        if state == 0:
+            matches[:] = completions(org_manager, readline.get_line_buffer()[:readline.get_endidx()], text)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims(" \t")
+    readline.parse_and_bind("tab: complete")
+
+def run_interactive(org_manager):
     print("Welcome to the Wacky Widget Company System.")
-    starting_name = input("Please enter the President's name to begin: ")
-    # All names should not contain spaces for simplicity
-    org_manager.initialize_president(starting_name)
+    # A loaded snapshot already has its President
+    if org_manager.president is None:
+        starting_name = input("Please enter the President's name to begin: ")
+        # All names should not contain spaces for simplicity
+        org_manager.initialize_president(starting_name)
 
     print("\nWelcome to the Wacky Widget Company System.")
-    
+    if readline is not None:
+        enable_completion(org_manager)
+
 
     while True:
-        print("Available commands: HIRE, FIRE, QUIT, LAYOFF, TRANSFER, PROMOTE, DISPLAY, EXIT.")
+        print(f"Available commands: {', '.join(COMMANDS)}.")
         try:
             user_input = input("\nEnter command: ").strip()
             if not user_input:
                 continue
 
             parts = user_input.split()
-            command = parts[0].upper()
 
             # Exit condition
-            if command == "EXIT":
+            if parts[0].upper() == "EXIT":
                 print("Exiting Wacky Widget HR System.")
                 break
 
-            if command == "HIRE":
-                if len(parts) != 3:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: HIRE <ManagerName> <NewEmployeeName>")
-                    continue                
-                org_manager.hire_employee(parts[1], parts[2])
-            
-            elif command == "FIRE":
-                if len(parts) != 3:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: FIRE <ManagerName> <EmployeeName>")
-                    continue
-                org_manager.fire_employee(parts[1], parts[2])
-                
-            elif command == "QUIT":
-                if len(parts) != 2:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: QUIT <EmployeeName>")
-                    continue
-                org_manager.employee_quits(parts[1])
-
-            elif command == "LAYOFF":
-                if len(parts) != 3:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: LAYOFF <ManagerName> <TargetEmployeeName>")
-                    continue
-                org_manager.layoff_employee(parts[1], parts[2])
-                
-            elif command == "TRANSFER":
-                if len(parts) != 4:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: TRANSFER <InitiatorName> <EmployeeName> <NewManagerName>")
-                    continue
-                org_manager.transfer_employee(parts[1], parts[2], parts[3])
-
-            elif command == "PROMOTE":
-                if len(parts) != 3:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: PROMOTE <ReceivingManagerName> <TargetEmployeeName>")
-                    continue
-                org_manager.promote_employee(parts[1], parts[2])
-
-
-            elif command == "DISPLAY":
-                if len(parts) != 1:
-                    incorrect_argument_count(command)
-                    print(f"Syntax should be: DISPLAY")
-                    continue
-                org_manager.display_organization()
+            if parts[0].upper() == "DISPLAY":
+                display_paged(org_manager, parts)
+            else:
+                run_command(org_manager, parts)
+
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
 
+def display_paged(org_manager, parts):
+    # Runs a DISPLAY command one terminal page at a time.
+    sink = org_manager.sink
+    org_manager.sink = PagingSink(sink, max(shutil.get_terminal_size().lines - 1, 1))
+    try:
+        return run_command(org_manager, parts)
+    except PageStopped:
+        return None
+    finally:
+        org_manager.sink = sink
 
-            else:
-                print(f"Error: Unknown command '{command}'.")
+def run_script(org_manager, stream):
+    # Replays commands from a file or pipe without banners or prompts.
+    # The first non-empty line is the President's name, same as the interactive prompt.
+    processed = 0
+    failed = 0
+    start = time.perf_counter()
+
+    for line in stream:
+        parts = line.split()
+        if not parts:
+            continue
 
+        if org_manager.president is None:
+            org_manager.initialize_president(parts[0])
+            continue
 
+        if parts[0].upper() == "EXIT":
+            break
+
+        processed += 1
+        try:
+            result = run_command(org_manager, parts)
+            if result is None or not result.ok:
+                failed += 1
         except Exception as e:
+            failed += 1
             print(f"An unexpected error occurred: {e}")
-            
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    # Summary goes to stderr so stdout only holds command output
+    print(f"Processed {processed} commands ({failed} rejected) in {elapsed:.3f}s ({rate:.0f} commands/sec).", file=sys.stderr)
+    return processed, failed
+
+def ladder_argument(spec):
+    # argparse type for --ladder, keeping RoleLadder's explanation in the usage error.
+    try:
+        return RoleLadder.parse(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Wacky Widget Company HR System.")
+    parser.add_argument("--script", metavar="PATH", help="Run commands from PATH without prompts ('-' reads stdin).")
+    parser.add_argument("--quiet", action="store_true", help="Do not print operation messages.")
+    parser.add_argument("--output", metavar="PATH", help="Write operation messages to PATH instead of stdout.")
+    parser.add_argument("--load", metavar="PATH", help="Resume from a snapshot written by SAVE.")
+    parser.add_argument("--journal", metavar="DIR", help="Recover from and journal every change to DIR.")
+    parser.add_argument("--database", metavar="PATH", help="Keep the organization in a SQLite database at PATH, created if missing.")
+    parser.add_argument("--stats", action="store_true", help="Count and time every operation, shown by the STATS command.")
+    parser.add_argument("--stats-json", metavar="PATH", help="Write the statistics to PATH as JSON on exit (implies --stats).")
+    parser.add_argument("--ladder", type=ladder_argument, metavar="SPEC",
+                        help="Roles from the top down with how many reports each can have, e.g. 'CEO:4,VP:6,Manager:10,Engineer:0'. "
+                             "An existing database keeps the ladder it was created with.")
+    args = parser.parse_args(argv)
+    if args.load is not None and args.journal is not None:
+        parser.error("--load and --journal cannot be combined, the journal directory keeps its own snapshots")
+    if args.database is not None and args.journal is not None:
+        parser.error("--database and --journal cannot be combined, the database keeps every change itself")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.quiet:
+        sink = SilentSink()
+    elif args.output is not None:
+        sink = FileSink(args.output)
+    else:
+        sink = StdoutSink()
+    try:
+        run_organization(args, sink)
+    finally:
+        # Closed even when a command or Ctrl-C ends the run, so the output file is never cut short
+        if isinstance(sink, FileSink):
+            sink.close()
+
+def run_organization(args, sink):
+    # Builds the organization main() was asked for and runs its commands.
+    if args.database is not None:
+        try:
+            org_manager = SqliteOrganizationManager(sink=sink, ladder=args.ladder, path=args.database)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+    else:
+        org_manager = OrganizationManager(sink=sink, ladder=args.ladder)
+    if args.load is not None:
+        org_manager.load(args.load)
+    journal = None
+    if args.journal is not None:
+        journal = Journal(args.journal)
+        journal.recover(org_manager)
+    # Started after recovery so replayed commands are not counted
+    if args.stats or args.stats_json is not None:
+        org_manager.enable_stats()
+
+    try:
+        if args.script == "-" or (args.script is None and not sys.stdin.isatty()):
+            run_script(org_manager, sys.stdin)
+        elif args.script is not None:
+            with open(args.script, "r", encoding="utf-8") as script:
+                run_script(org_manager, script)
+        else:
+            run_interactive(org_manager)
+    finally:
+        # A transaction nobody committed is dropped, it never reached the journal
+        if org_manager.in_transaction:
+            org_manager.rollback()
+        # Flushes the last group of journaled commands even if the loop dies
+        if journal is not None:
+            journal.close()
+        if args.database is not None:
+            org_manager.close()
+        if args.stats_json is not None:
+            with open(args.stats_json, "w", encoding="utf-8") as file:
+                json.dump(org_manager.stats.as_dict(), file, indent=2)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,161 @@
+from bisect import bisect_left, insort
+
+# Every employee name mapped to its spot, and the one place names are tracked.
+# It is a dict, so lookups and membership checks cost what they always did. A sorted view of the names for prefix
+# search and suggestions is only built the first time someone asks, then kept up to date. It is held in buckets of
+# at most BUCKET_SIZE names, so an insert or removal shifts a few hundred pointers instead of the whole list.
+
+BUCKET_SIZE = 1024
+SUGGESTION_WINDOW = 32      # Names looked at on each side of where a missing name would sort
+
+class NameIndex(dict):
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.buckets = None     # Sorted runs of names, each no longer than BUCKET_SIZE, None until first needed
+        self.maxes = None       # Last name of each bucket
+
+    def __setitem__(self, name, spot):
+        if self.buckets is not None and name not in self:
+            self._insert(name)
+        super().__setitem__(name, spot)
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        if self.buckets is not None:
+            self._remove(name)
+
+    def pop(self, name, *default):
+        if name in self:
+            spot = self[name]
+            del self[name]
+            return spot
+        return super().pop(name, *default)
+
+    def update(self, *args, **kwargs):
+        for name, spot in dict(*args, **kwargs).items():
+            self[name] = spot
+
+    def clear(self):
+        super().clear()
+        self.buckets = self.maxes = None
+
+    # ----- Sorted view -----
+
+    def _sorted(self):
+        if self.buckets is None:
+            names = sorted(self)
+            self.buckets = [names[start:start + BUCKET_SIZE] for start in range(0, len(names), BUCKET_SIZE)]
+            self.maxes = [bucket[-1] for bucket in self.buckets]
+        return self.buckets
+
+    def _insert(self, name):
+        buckets, maxes = self.buckets, self.maxes
+        if not buckets:
+            buckets.append([name])
+            maxes.append(name)
+            return
+        index = min(bisect_left(maxes, name), len(buckets) - 1)
+        bucket = buckets[index]
+        insort(bucket, name)
+        maxes[index] = bucket[-1]
+        if len(bucket) > BUCKET_SIZE:
+            half = len(bucket) // 2
+            buckets.insert(index + 1, bucket[half:])
+            del bucket[half:]
+            maxes.insert(index, bucket[-1])
+
+    def _remove(self, name):
+        buckets, maxes = self.buckets, self.maxes
+        index = bisect_left(maxes, name)
+        bucket = buckets[index]
+        del bucket[bisect_left(bucket, name)]
+        if bucket:
+            maxes[index] = bucket[-1]
+        else:
+            del buckets[index]
+            del maxes[index]
+
+    def _names_from(self, bucket_index, position):
+        # Names in sorted order starting at one position of one bucket.
+        buckets = self.buckets
+        while bucket_index < len(buckets):
+            bucket = buckets[bucket_index]
+            for name in bucket[position:] if position else bucket:
+                yield name
+            bucket_index += 1
+            position = 0
+
+    def _names_before(self, bucket_index, position):
+        # Names in reverse sorted order starting just before one position of one bucket.
+        buckets = self.buckets
+        while bucket_index >= 0:
+            bucket = buckets[bucket_index]
+            for offset in range(position - 1, -1, -1):
+                yield bucket[offset]
+            bucket_index -= 1
+            position = len(buckets[bucket_index]) if bucket_index >= 0 else 0
+
+    def _locate(self, name):
+        # (bucket, position) where name sorts.
+        buckets = self._sorted()
+        if not buckets:
+            return 0, 0
+        index = bisect_left(self.maxes, name)
+        if index == len(buckets):
+            return index - 1, len(buckets[-1])
+        return index, bisect_left(buckets[index], name)
+
+    def with_prefix(self, prefix: str, limit=None):
+        # Names starting with prefix in sorted order, at most limit of them.
+        found = []
+        for name in self._names_from(*self._locate(prefix)):
+            if not name.startswith(prefix) or len(found) == limit:
+                break
+            found.append(name)
+        return found
+
+    def suggest(self, name: str, limit=3):
+        # Existing names a small edit away from name, only the closest ones and in name order.
+        # Only the names sorting next to name are compared, so a slip in the first letters is not caught.
+        if not self or not isinstance(name, str):
+            return []
+        bucket, position = self._locate(name)
+        nearby = []
+        for names in (self._names_before(bucket, position), self._names_from(bucket, position)):
+            for count, candidate in enumerate(names):
+                if count == SUGGESTION_WINDOW:
+                    break
+                nearby.append(candidate)
+        return closest_names(name, nearby, limit)
+
+def closest_names(name: str, nearby, limit):
+    # The names in nearby a small edit away from name, only the closest ones and in name order.
+    allowed = 1 if len(name) < 5 else 2
+    scored = []
+    for candidate in nearby:
+        distance = edit_distance(name.casefold(), candidate.casefold(), allowed)
+        if distance <= allowed:
+            scored.append((distance, candidate))
+    if not scored:
+        return []
+    closest = min(distance for distance, _ in scored)
+    return sorted(candidate for distance, candidate in scored if distance == closest)[:limit]
+
+def edit_distance(first: str, second: str, limit: int):
+    # Optimal string alignment distance (insertions, deletions, substitutions and swaps of neighbours),
+    # or limit + 1 as soon as it is known to be larger than limit.
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous_row = None
+    row = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        earlier_row, previous_row = previous_row, row
+        row = [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]:
+                row[j] = min(row[j], earlier_row[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+    return row[-1]
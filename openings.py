@@ -0,0 +1,72 @@
+from bisect import bisect_left, bisect_right
+
+# Managers that can take another report (a free slot or a Vacancy), one list per role kept sorted by interval label.
+# Labels follow report order and nest, so everyone of a role inside a branch is one contiguous run of a list.
+
+class OpeningIndex:
+    def __init__(self):
+        self.labels = {}    # Role code to sorted labels (spot.lo when filed)
+        self.spots = {}     # Role code to spots, in the same order as labels
+        self.keys = {}      # Spot to the (role code, label) it is filed under
+
+    def __contains__(self, spot):
+        return spot in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, spot):
+        # Files spot under its current role and label, moving it if it was filed under older ones.
+        self.discard(spot)
+        labels = self.labels.get(spot.role_code)
+        if labels is None:
+            labels = self.labels[spot.role_code] = []
+            self.spots[spot.role_code] = []
+        index = bisect_right(labels, spot.lo)
+        labels.insert(index, spot.lo)
+        self.spots[spot.role_code].insert(index, spot)
+        self.keys[spot] = (spot.role_code, spot.lo)
+
+    def discard(self, spot):
+        key = self.keys.pop(spot, None)
+        if key is None:
+            return
+        role_code, label = key
+        labels = self.labels[role_code]
+        spots = self.spots[role_code]
+        # A spot that just took over a label can share it with one that is about to be re-filed
+        index = bisect_left(labels, label)
+        while spots[index] is not spot:
+            index += 1
+        del labels[index]
+        del spots[index]
+
+    def within(self, role_code, lo, hi, skip_lo=None, skip_hi=None):
+        # Yields the spots of a role labelled inside (lo, hi) but outside [skip_lo, skip_hi), in report order.
+        # A spot's own label is its lo, and the next sibling starts at its hi, so these are exactly
+        # the spots below (lo, hi) that are not skip_lo's spot or below it.
+        labels = self.labels.get(role_code)
+        if not labels:
+            return
+        spots = self.spots[role_code]
+        index = bisect_right(labels, lo)
+        while index < len(labels) and labels[index] < hi:
+            if skip_lo is not None and skip_lo <= labels[index] < skip_hi:
+                index = bisect_left(labels, skip_hi)
+                continue
+            yield spots[index]
+            index += 1
+
+    def count(self, role_code, lo, hi, skip_lo=None, skip_hi=None):
+        # Number of spots within() would yield, found by bisection so whole branches without openings cost O(log n).
+        labels = self.labels.get(role_code)
+        if not labels:
+            return 0
+        total = bisect_left(labels, hi) - bisect_right(labels, lo)
+        if skip_lo is not None and total:
+            total -= bisect_left(labels, skip_hi) - bisect_left(labels, skip_lo)
+        return total
+
+    def of_role(self, role_code):
+        # Every filed spot of a role, in report order.
+        return list(self.spots.get(role_code, ()))
@@ -1,105 +1,440 @@
-from employee import Employee, Vacancy
+import functools
+import gc
+import inspect
+import itertools
+from collections import deque
+from contextlib import contextmanager
+
+from chart_reports import ChartReports
+from employee import DEFAULT_LADDER, Employee, ReportSlots, Vacancy, NO_REPORTS
+from name_index import NameIndex
+from openings import OpeningIndex
+from results import OperationResult, Status
+from sinks import StdoutSink
+from snapshot import ROLE_BY_CODE, VACANT_BY_CODE, VACANT_FLAG, SnapshotError, read_snapshot
+from stats import TRACKED, OperationStats, timed
+from views import FrozenSpot, OrganizationView
+
+HISTORY_LIMIT = 10_000      # Changes UNDO can step back through, the oldest are dropped first
+INITIAL_LABEL_BITS = 64     # Width of the President's label interval is 2**bits, doubled in bits whenever it runs out
 
 # TODO:
-# Check if a Vacancy object has no reports, delete Vacancy object if so. Should be done after every operation that moves or removes employees
 # Layoff not properly creating Vacancy and leaving reports behind? Unsure if they should leave their reports behind or not
 # Add checks for inputting president name at start of program
-# Add initial question to load from file or create new organization
 # Should we allow transferring an employee to a Vacancy?
 # Could make large adjustment, changing empty spots to always be Vacancy objects instead of None. Could simplify some logic and improve consistency.
 
-class OrganizationManager:
+def journaled(method):
+    # Marks a public method that changes the organization. A successful call is kept in the undo history together
+    # with the inverse steps it recorded, and appended to the organization's journal, if it has one.
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._changes is not None:
+            # Called by another change, whose entry gets the steps
+            return method(self, *args, **kwargs)
+        self._changes = changes = []
+        transaction = self._transaction
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            # The steps taken before the error are kept, so UNDO or the transaction's ROLLBACK can still revert them
+            if changes:
+                (self.history if transaction is None else transaction.entries).append((method.__name__, args, kwargs, changes))
+            if transaction is not None:
+                transaction.failures += 1
+            raise
+        finally:
+            self._changes = None
+        if result is True or isinstance(result, OperationResult) and result.ok:
+            if changes:
+                entry = (method.__name__, args, kwargs, changes)
+                (self.history if transaction is None else transaction.entries).append(entry)
+                if not self._redoing:
+                    self.redo_log.clear()
+            if transaction is not None:
+                # Held back until COMMIT, so the journal never sees half a transaction
+                transaction.records.append([method.__name__, *signature.bind(self, *args, **kwargs).args[1:]])
+            else:
+                if self.journal is not None:
+                    self.journal.append(method.__name__, *signature.bind(self, *args, **kwargs).args[1:])
+                self._changes_kept(1)
+        elif transaction is not None:
+            transaction.failures += 1
+        return result
+    return wrapper
+
+def describe_call(method, args, kwargs):
+    # "hire_employee(Ada, Bob)" for messages about a change.
+    values = [str(value) for value in args] + [f"{key}={value}" for key, value in kwargs.items()]
+    return f"{method}({', '.join(values)})"
+
+class Transaction:
+    # Changes made between BEGIN and COMMIT, kept apart from the history and the journal until they are committed.
+    __slots__ = ("entries", "records", "failures", "result")
+
     def __init__(self):
+        self.entries = []       # (method, args, kwargs, inverse steps) of each staged change, newest last
+        self.records = []       # Journal records of the staged changes, written together on COMMIT
+        self.failures = 0       # Changes that were refused, any of them makes COMMIT roll back instead
+        self.result = None      # OperationResult of the COMMIT or ROLLBACK that ended it
+
+class OrganizationManager(ChartReports):
+    def __init__(self, sink=None, ladder=None):
+        self.ladder = ladder if ladder is not None else DEFAULT_LADDER  # Roles and capacities, top of the company first
         self.president = None
-        self.all_names = set()      # Keeps names unique
-        self.employee_lookup = {}   # Dict for name to Employee object
+        self.employee_lookup = NameIndex()  # Name to Employee object, keeps names unique and answers prefix searches
+        self.sink = sink if sink is not None else StdoutSink()  # Where operation messages are routed
+        self.openings = OpeningIndex()  # Managers with a free slot or Vacancy by role and label, kept in sync on every change
+        self._label_bits = INITIAL_LABEL_BITS
+        self.journal = None         # Journal that successful changes are appended to, see journal.py
+        self._rendered = {}         # Spot to {depth: chart text of everything below it}, dropped along the boss chain on change
+        self._frozen = {}           # Spot to its FrozenSpot for views, dropped along the boss chain on change like _rendered
+        self.stats = None           # OperationStats while statistics are on, see enable_stats
+        self.history = deque(maxlen=HISTORY_LIMIT)  # (method, args, kwargs, inverse steps) of each change, newest last
+        self.redo_log = []          # (method, args, kwargs) of undone changes, the next REDO last
+        self._changes = None        # Inverse steps of the change running now, None outside a change
+        self._redoing = False       # True while REDO runs a change again, which keeps the redo log
+        self._transaction = None    # Transaction opened by BEGIN, None when changes take effect one by one
+
+    @property
+    def all_names(self):
+        # Every employee name, a live view of the name index.
+        return self.employee_lookup.keys()
 
     # ----- Helper Methods -----
 
+    def _record(self, *step):
+        # Adds an inverse step, (kind, *arguments) for _undo_<kind>, to the change running now.
+        if self._changes is not None:
+            self._changes.append(step)
+
     def _find_employee(self, name: str):
         # Utility to quickly find an employee object by name.
         return self.employee_lookup.get(name)
 
     def _determine_valid_role(self, manager):
         # Determines the role of an employee based on the manager's role.
-        match manager.role:
-            case "President":
-                return "Vice President"
-            case "Vice President":
-                return "Supervisor"
-            case "Supervisor":
-                return "Worker"
-        
+        role_code = self.ladder.below(manager.role_code)
+        return None if role_code is None else self.ladder.roles[role_code]
+
+    def _update_openings(self, spot):
+        # Re-files a spot in the openings index after its reports, role or boss changed.
+        if not isinstance(spot, Vacancy) and (len(spot.reports) < spot.max_reports or spot.vacancies > 0):
+            self.openings.add(spot)
+        else:
+            self.openings.discard(spot)
+
+    def _drop_openings(self, spot):
+        # Removes a spot from the openings index.
+        self.openings.discard(spot)
+
+    def _take_over_reports(self, new_spot, old_spot):
+        # Hands old_spot's reports, and their counts, to new_spot and points each report's boss at new_spot.
+        new_spot.reports = old_spot.reports
+        new_spot.vacancies = old_spot.vacancies
+        new_spot.below = old_spot.below
+        new_spot.levels = old_spot.levels
+        old_spot.reports = NO_REPORTS
+        old_spot.vacancies = 0
+        old_spot.below = None
+        old_spot.levels = None
+        for report in new_spot.reports:
+            report.boss = new_spot
+            self._update_openings(report)
+
+    def _label_last_report(self, manager):
+        # Gives the report just appended to manager the interval after its previous sibling.
+        report = manager.reports.last()
+        previous = manager.reports.before(report)
+        if previous is not None:
+            report.lo = previous.hi
+            report.hi = previous.hi + (previous.hi - previous.lo)
+        else:
+            report.lo = manager.lo + 1
+            report.hi = report.lo + (manager.hi - report.lo) // max(manager.max_reports, 1)
+        if report.hi > manager.hi or report.hi - report.lo < 2:
+            # No room left after the last sibling, spread all of manager's reports out again
+            self._relabel(manager)
+        elif report.reports:
+            self._relabel(report)
+
+    def _relabel(self, spot):
+        # Re-labels everything below spot to fit inside its interval, in report order.
+        # Relabelled managers with openings are filed again under their new labels.
+        openings = self.openings
+        stack = [spot]
+        while stack:
+            current = stack.pop()
+            if not current.reports:
+                continue
+            width = (current.hi - current.lo - 1) // max(current.max_reports, len(current.reports), 1)
+            if width < 2:
+                self._grow_labels()
+                return
+            lo = current.lo + 1
+            for report in current.reports:
+                report.lo = lo
+                report.hi = lo + width
+                lo += width
+                if report in openings:
+                    openings.add(report)
+                stack.append(report)
+
+    def _grow_labels(self):
+        # Doubles the label space and re-labels the whole organization.
+        self._label_bits *= 2
+        self.president.hi = self.president.lo + (1 << self._label_bits)
+        self._relabel(self.president)
+
     def _add_employee(self, manager, new_employee_name):
-        new_employee = Employee(name=new_employee_name, role=self._determine_valid_role(manager), boss=manager)
+        self._forget_rendered(manager)
+        new_employee = Employee(name=new_employee_name, role=self._determine_valid_role(manager), boss=manager, ladder=self.ladder)
         manager.reports.append(new_employee)
-        self.all_names.add(new_employee_name)
+        self._label_last_report(manager)
+        self._count_branch(new_employee, 1)
         self.employee_lookup[new_employee_name] = new_employee
-        print(f"Successfully hired {new_employee_name} under {manager.name}.")
+        self._update_openings(manager)
+        self._update_openings(new_employee)
+        self._record("detach", new_employee)
+        self._record("forget", new_employee)
+        return self._report(Status.OK, "Successfully hired {0} under {1}.", new_employee_name, manager.name)
         
     def _replace_vacancy_with_new_employee(self, manager, vacancy_index, new_employee_name):
         vacancy = manager.reports[vacancy_index]
-        vacancy_reports = vacancy.reports
-        new_employee = Employee(name=new_employee_name, role=vacancy.role, boss=manager)
+        self._forget_rendered(vacancy)
+        new_employee = Employee(name=new_employee_name, role=vacancy.role, boss=manager, ladder=self.ladder)
         manager.reports[vacancy_index] = new_employee
-        new_employee.reports = vacancy_reports
-        self.all_names.add(new_employee_name)
+        manager.vacancies -= 1
+        new_employee.lo, new_employee.hi = vacancy.lo, vacancy.hi
+        self._take_over_reports(new_employee, vacancy)
+        self._count(manager, -1, -1)
+        self._count(manager, new_employee.role_code, 1)
         self.employee_lookup[new_employee_name] = new_employee
-        print(f"Successfully placed {new_employee_name} under {manager.name}.")
+        self._update_openings(manager)
+        self._update_openings(new_employee)
+        self._record("unfill", new_employee, vacancy, list(new_employee.reports))
+        self._record("forget", new_employee)
+        return self._report(Status.OK, "Successfully placed {0} under {1}.", new_employee_name, manager.name)
 
     def _is_superior_to(self, manager, employee):
         # Checks if the manager is in the employee's hierarchy (up the tree).
-        current_boss = employee.boss
-        while current_boss != None:
-            if current_boss is manager:
-                return True
-            current_boss = current_boss.boss
-        return False
-
-    def _display_loop(self, current_spot, depth):
-        # Recursive function to display the organization structure.
-        indent = "\t" * depth
-        for report in current_spot.reports:
-            if isinstance(report, Vacancy):
-                print(f"{indent}VACANCY: {report.role}")
-            else:
-                print(f"{indent}{report.role}: {report.name}")
-            self._display_loop(report, depth + 1)
+        # Everyone below a spot has a label interval nested strictly inside the spot's own.
+        return manager.lo < employee.lo and employee.hi <= manager.hi
+
+    def _chart_chunks(self, root, max_depth=None):
+        # A full chart comes from the subtree cache in one write, only changed paths are rendered again.
+        if max_depth is None:
+            return iter((f"{root.role}: {root.name}\n" + self._chart_text(root),))
+        return super()._chart_chunks(root, max_depth)
+
+    def _chart_text(self, root):
+        # Chart text of everything below root, reusing the cached text of subtrees that did not change.
+        rendered = self._rendered
+        stack = [(root, 1, False)]
+        while stack:
+            spot, depth, children_ready = stack.pop()
+            if depth in rendered.get(spot, ()):
+                continue
+            if not children_ready:
+                stack.append((spot, depth, True))
+                stack.extend((report, depth + 1, False) for report in spot.reports if report.reports)
+                continue
+            indent = "\t" * depth
+            parts = []
+            for report in spot.reports:
+                if type(report) is Vacancy:
+                    parts.append(f"{indent}VACANCY: {report.role}\n")
+                else:
+                    parts.append(f"{indent}{report.role}: {report.name}\n")
+                if report.reports:
+                    parts.append(rendered[report][depth + 1])
+            rendered.setdefault(spot, {})[depth] = "".join(parts)
+        return rendered[root][1]
+
+    def _forget_rendered(self, spot):
+        # Drops the cached chart text and frozen copies of spot and everyone above it, the only subtrees a change to
+        # spot affects.
+        rendered, frozen = self._rendered, self._frozen
+        while spot is not None:
+            rendered.pop(spot, None)
+            frozen.pop(spot, None)
+            spot = spot.boss
+
+    def _freeze(self):
+        # FrozenSpot of the President, building copies only for the spots whose copy was dropped since the last view.
+        # Their reports that did not change keep the copies they have, so each change costs one copy per spot above it.
+        if self.president is None:
+            return None
+        frozen = self._frozen
+        stack = [(self.president, False)]
+        while stack:
+            spot, reports_ready = stack.pop()
+            if spot in frozen:
+                continue
+            if not reports_ready:
+                stack.append((spot, True))
+                stack.extend((report, False) for report in spot.reports if report not in frozen)
+                continue
+            name = None if type(spot) is Vacancy else spot.name
+            frozen[spot] = FrozenSpot(name, spot.role, spot.role_code, tuple([frozen[report] for report in spot.reports]))
+        return frozen[self.president]
+
+    def _count(self, spot, index, delta):
+        # Adds delta to one entry of the counts below spot and everyone above it.
+        # index is a role code, or -1 for vacancies.
+        width = len(self.ladder.roles) + 1
+        while spot is not None:
+            below = spot.below
+            if below is None:
+                below = spot.below = [0] * width
+            below[index] += delta
+            spot = spot.boss
+
+    def _count_branch(self, spot, sign):
+        # Adds (sign 1) or takes away (sign -1) spot and everyone below it from the counts and levels of everyone above spot.
+        branch = list(spot.below) if spot.below is not None else [0] * (len(self.ladder.roles) + 1)
+        branch[-1 if type(spot) is Vacancy else spot.role_code] += 1
+        shape = [1] + (spot.levels or [])
+        boss = spot.boss
+        while boss is not None:
+            below = boss.below
+            if below is None:
+                below = boss.below = [0] * len(branch)
+            for index, count in enumerate(branch):
+                if count:
+                    below[index] += sign * count
+            self._add_levels(boss, shape, sign)
+            shape.insert(0, 0)
+            boss = boss.boss
+
+    def _add_levels(self, spot, shape, sign):
+        # Adds shape, spots per level from one below spot down, times sign to spot's levels.
+        levels = spot.levels
+        if levels is None:
+            levels = spot.levels = []
+        if len(levels) < len(shape):
+            levels.extend([0] * (len(shape) - len(levels)))
+        for index, count in enumerate(shape):
+            if count:
+                levels[index] += sign * count
+        while levels and not levels[-1]:
+            levels.pop()
 
     def _replace_employee_with_vacancy(self, employee):
         # Replaces an employee with a vacancy, transferring reports to the vacancy.
-        vacancy = Vacancy(role=employee.role, boss=employee.boss)
-        employee_index = employee.boss.reports.index(employee)
-        employee.boss.reports[employee_index] = vacancy
+        self._forget_rendered(employee)
+        vacancy = Vacancy(role=employee.role, boss=employee.boss, ladder=self.ladder)
+        employee.boss.reports[employee.slot] = vacancy
+        employee.boss.vacancies += 1
+        vacancy.lo, vacancy.hi = employee.lo, employee.hi
         # Assign the reports to the vacancy
-        for report in employee.reports:
-            report.boss = vacancy
-            vacancy.reports.append(report)
+        self._take_over_reports(vacancy, employee)
+        self._count(vacancy.boss, employee.role_code, -1)
+        self._count(vacancy.boss, -1, 1)
+        self._drop_openings(employee)
+        self._update_openings(employee.boss)
+        self._record("unfill", vacancy, employee, list(vacancy.reports))
+        return vacancy
+
+    def _collapse_if_empty(self, spot):
+        # Removes spot if it is a Vacancy nobody reports to, then does the same for its boss, whose last report it may
+        # have been. Its seat becomes a free slot, so the boss stays an opening and its reports keep their labels.
+        # Returns the number of Vacancies removed.
+        removed = 0
+        while type(spot) is Vacancy and not spot.reports and spot.boss is not None:
+            boss = spot.boss
+            self._forget_rendered(spot)
+            self._count_branch(spot, -1)
+            following = boss.reports.after(spot)
+            boss.reports.remove(spot)
+            boss.vacancies -= 1
+            self._update_openings(boss)
+            self._record("attach", spot, boss, following)
+            spot = boss
+            removed += 1
+        return removed
+
+    def compact_vacancies(self):
+        # Removes every Vacancy nobody reports to, for trees built before they were removed as they emptied.
+        # Returns the number removed.
+        empty = []
+        stack = [self.president] if self.president is not None else []
+        while stack:
+            spot = stack.pop()
+            if type(spot) is Vacancy and not spot.reports:
+                empty.append(spot)
+            stack.extend(spot.reports)
+        # Each one is a leaf, so removing one and the bosses it leaves empty never touches another
+        return sum(self._collapse_if_empty(spot) for spot in empty)
 
     def _remove_employee(self, employee):
         # Removes an employee from the organization.
         # Remove employee name from tracking structures
-        self.all_names.remove(employee.name)
         del self.employee_lookup[employee.name]
+        self._record("remember", employee)
 
         # If the target employee has no reports
         if len(employee.reports) == 0:
+            self._forget_rendered(employee)
+            self._count_branch(employee, -1)
+            following = employee.boss.reports.after(employee)
             employee.boss.reports.remove(employee)
-            print(f"{employee.name} has been removed from the company.")
+            self._drop_openings(employee)
+            self._update_openings(employee.boss)
+            self._record("attach", employee, employee.boss, following)
+            self._collapse_if_empty(employee.boss)
+            return self._report(Status.OK, "{0} has been removed from the company.", employee.name)
 
         # If the target employee has reports, leave a vacancy
         elif len(employee.reports) > 0:
             self._replace_employee_with_vacancy(employee)
-            print(f"{employee.name} has been removed from the company. Vacancy remains.")
+            return self._report(Status.OK, "{0} has been removed from the company. Vacancy remains.", employee.name)
 
     def _move_employee(self, employee, new_boss, replacement_index):
-        employee.boss.reports.remove(employee)
-        if replacement_index == -1:
+        old_boss = employee.boss
+        vacancy = new_boss.reports[replacement_index] if replacement_index != -1 else None
+        self._forget_rendered(employee)
+        self._forget_rendered(vacancy if vacancy is not None else new_boss)
+        self._count_branch(employee, -1)
+        following = old_boss.reports.after(employee)
+        old_boss.reports.remove(employee)
+        self._record("attach", employee, old_boss, following)
+        if vacancy is None:
             new_boss.reports.append(employee)
+            self._label_last_report(new_boss)
+            self._record("detach", employee)
         else:
-            new_boss.reports[replacement_index] = employee
+            self._record("unfill", employee, vacancy, list(vacancy.reports))
+            new_boss.reports[vacancy.slot] = employee
+            new_boss.vacancies -= 1
+            # Reports left under the Vacancy now report to the employee filling it, who may be from a role without any
+            if employee.reports is NO_REPORTS and vacancy.reports:
+                employee.reports = ReportSlots(max(employee.max_reports, len(vacancy.reports)))
+            for report in vacancy.reports:
+                report.boss = employee
+                employee.reports.append(report)
+                self._update_openings(report)
+            employee.vacancies += vacancy.vacancies
+            if vacancy.below is not None:
+                if employee.below is None:
+                    employee.below = [0] * len(vacancy.below)
+                for index, count in enumerate(vacancy.below):
+                    employee.below[index] += count
+                self._add_levels(employee, vacancy.levels, 1)
+            # The branch below is counted in again below, only the Vacancy itself leaves
+            self._count_branch(vacancy, -1)
+            employee.lo, employee.hi = vacancy.lo, vacancy.hi
+            self._relabel(employee)
         employee.boss = new_boss
-        print(f"Successfully placed {employee.name} under {new_boss.name}.")
+        self._count_branch(employee, 1)
+        self._update_openings(old_boss)
+        self._update_openings(new_boss)
+        self._update_openings(employee)
+        if old_boss is not vacancy:
+            self._collapse_if_empty(old_boss)
+        return self._report(Status.OK, "Successfully placed {0} under {1}.", employee.name, new_boss.name)
 
     def _has_spots(self, manager):
         # Checks if a manager has availability for new reports. Returns True if open spot, index of Vacancy if found, False otherwise.
@@ -111,328 +446,731 @@ class OrganizationManager:
             return index
         return False
 
+    def _opening_at(self, manager):
+        # Returns the (index, manager) pair for an opening under a manager known to have one.
+        result = self._has_spots(manager)
+        if result is True:
+            return -1, manager
+        return result, manager
+
     def _check_vancancy_objects(self, manager):
-        # Checks for Vacancy objects under a manager and returns the first index if found, -1 otherwise.
-        for index, report in enumerate(manager.reports):
+        # Checks for Vacancy objects under a manager and returns the slot of the first if found, -1 otherwise.
+        if manager.vacancies == 0:
+            return -1
+        for report in manager.reports:
             if isinstance(report, Vacancy):
-                return index
+                return report.slot
         return -1
 
-    def _find_opening(self, manager, role):
-        # Determines which helper method to call based on role.
-        match role:
-            case "Worker":
-                return self._find_worker_opening(manager)
-            case "Supervisor":
-                return self._find_super_opening(manager)
-            case "Vice President":
-                return self._find_vp_opening(manager)
+    def _find_opening(self, employee):
+        # Finds the opening closest to employee in tree distance for someone of employee's role, outside employee's branch.
+        # Ties go to the branch nearest employee and then to report order. Looks at each spot above employee and its
+        # branch in turn, and the walk up ends once no wider branch can come closer. A PROMOTE carries reports up a
+        # level, so an opening can sit at any depth below a spot and each branch is searched level by level.
+        wanted = employee.role_code - 1
+        if wanted < 0:
+            return None, None
+        openings = self.openings
+        best = best_distance = None
+        searched, ancestor, up = employee, employee.boss, 1
+        while ancestor is not None and (best is None or up < best_distance):
+            if ancestor.role_code == wanted and ancestor in openings:
+                best, best_distance = ancestor, up
+                break
+            if openings.count(wanted, ancestor.lo, ancestor.hi, searched.lo, searched.hi):
+                farthest = None if best is None else best_distance - up - 1
+                candidate, levels = self._nearest_opening_below(ancestor, farthest, wanted, searched)
+                if candidate is not None:
+                    best, best_distance = candidate, up + levels
+            searched, ancestor, up = ancestor, ancestor.boss, up + 1
+        if best is None:
+            return None, None
+        return self._opening_at(best)
+
+    def _nearest_opening_below(self, ancestor, farthest, role_code, skip):
+        # Shallowest spot at most farthest (None for no limit) levels below ancestor, outside skip's branch, with
+        # role_code and an opening, first in report order. Returns (spot, levels), or (None, None).
+        # Branches without an opening of the role are skipped by count, taken only once the search reaches them.
+        openings = self.openings
+        level = [ancestor]
+        levels = 1
+        while level and (farthest is None or levels <= farthest):
+            below = []
+            for spot in level:
+                if spot is not ancestor and not openings.count(role_code, spot.lo, spot.hi):
+                    continue
+                for report in spot.reports:
+                    if report is skip:
+                        continue
+                    if report.role_code == role_code and report in openings:
+                        return report, levels
+                    if report.reports:
+                        below.append(report)
+            level = below
+            levels += 1
         return None, None
 
-    def _find_worker_opening(self, supervisor):
-        # Checks for worker openings in the company
-        # Checks for empty spots under current Supervisor
-        result = self._has_spots(supervisor)
-        if result is True:
-            return -1, supervisor
-        # Checks for Vacancy objects under current Supervisor
-        elif result != False:
-            return result, supervisor
-        # Otherwise, move to other Supervisors if they exist
-        for report in supervisor.boss.reports:
-            if report is not supervisor:
-                result = self._has_spots(report)
-                if result is True:
-                    return -1, report
-                elif result != False:
-                    return result, report
-        # No Worker openings found under current VP branch, move to other VP branch if it exists
-        for vp in supervisor.boss.boss.reports:
-            if vp is not supervisor.boss:
-                for report in vp.reports:
-                    result = self._has_spots(report)
-                    if result is True:
-                        return -1, report
-                    elif result != False:
-                        return result, report
-        # No Worker openings found
-        return None, None
+    def _promote(self, target_employee, receiving_manager):
+        # Moves target_employee up one level under receiving_manager, preferring a Vacancy slot.
+        # Checks if target employee is not becoming boss of their current peers
+        old_boss = target_employee.boss
+        self._forget_rendered(target_employee)
+        self._forget_rendered(receiving_manager)
+        for report in receiving_manager.reports if receiving_manager.vacancies else ():
+            if isinstance(report, Vacancy) and target_employee not in report.reports:
+                if target_employee.role_code != self.ladder.bottom:
+                    left_behind = self._replace_employee_with_vacancy(target_employee)
+                else:
+                    left_behind = old_boss
+                    self._count_branch(target_employee, -1)
+                    following = old_boss.reports.after(target_employee)
+                    old_boss.reports.remove(target_employee)
+                    self._update_openings(old_boss)
+                    self._record("attach", target_employee, old_boss, following)
+                self._record("demote", target_employee)
+                self._rendered.pop(report, None)
+                self._frozen.pop(report, None)
+                target_employee.boss = receiving_manager
+                receiving_manager.reports[report.slot] = target_employee
+                receiving_manager.vacancies -= 1
+                target_employee.lo, target_employee.hi = report.lo, report.hi
+                target_employee.promote()
+                self._take_over_reports(target_employee, report)
+                self._record("unfill", target_employee, report, list(target_employee.reports))
+                self._count(receiving_manager, -1, -1)
+                self._count(receiving_manager, target_employee.role_code, 1)
+                self._update_openings(receiving_manager)
+                self._update_openings(target_employee)
+                self._collapse_if_empty(left_behind)
+                return self._report(Status.OK, "Successfully promoted {0} under {1}.", target_employee.name, receiving_manager.name)
 
-    def _find_super_opening(self, vp):
-        # Checks for supervisor openings in the company
-        # Checks for empty spots under current VP
-        result = self._has_spots(vp)
-        if result is True:
-            return -1, vp
-        # Checks for Vacancy objects under current VP
-        elif result != False:
-            return result, vp
-        # Otherwise, move to other VP if it exists
-        for report in vp.boss.reports:
-            if report is not vp:
-                result = self._has_spots(report)
-                if result is True:
-                    return -1, report
-                elif result != False:
-                    return result, report
-
-        # No Supervisor openings found
-        return None, None
+        # No Vacancy object found, normal addition
+        self._count_branch(target_employee, -1)
+        following = old_boss.reports.after(target_employee)
+        old_boss.reports.remove(target_employee)
+        self._record("attach", target_employee, old_boss, following)
+        target_employee.boss = receiving_manager
+        receiving_manager.reports.append(target_employee)
+        target_employee.promote()
+        self._record("demote", target_employee)
+        self._record("detach", target_employee)
+        self._count_branch(target_employee, 1)
+        self._label_last_report(receiving_manager)
+        self._update_openings(old_boss)
+        self._update_openings(receiving_manager)
+        self._update_openings(target_employee)
+        self._collapse_if_empty(old_boss)
+
+        return self._report(Status.OK, "Successfully promoted {0} under {1}.", target_employee.name, receiving_manager.name)
+
+    def _import_preorder(self, roles, report_counts, names):
+        # Rebuilds the tree from _export_preorder output in one pass, without per-insert validation.
+        # Spots are made without their constructors, so each attribute is set once, and the garbage collector is held
+        # off while they are made: none of them is garbage, but every collection would walk the whole growing tree.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            self._build_preorder(roles, report_counts, names)
+        finally:
+            if collecting:
+                gc.enable()
+
+    def _build_preorder(self, roles, report_counts, names):
+        # Labels, counts below and the openings index are filled in as each spot is created, levels at the end.
+        # The boss whose reports are coming is kept in locals, bosses above it that still expect reports on a stack.
+        next_name = iter(names).__next__
+        new = object.__new__
+        employee_lookup = {}    # Plain dict while filling, the name index takes it over in one copy at the end
+        ladder = self.ladder
+        capacities = ladder.capacities
+        short_labels = False
+        columns = len(ladder.roles) + 1     # Entries in each counts list, one per role and vacancies
+        managers = []   # Spots with reports, in preorder, to add their levels up to their bosses at the end
+        waiting = []    # (boss, reports, slots, below, remaining, label, width) of bosses with reports still to come
+        boss = reports = slots = below = None
+        remaining = label = width = 0
+        for code, count in zip(roles, report_counts):
+            vacant = code & VACANT_FLAG
+            if vacant:
+                role_code = code ^ VACANT_FLAG
+                spot = new(Vacancy)
+            else:
+                role_code = code
+                spot = new(Employee)
+                spot.name = name = next_name()
+                employee_lookup[name] = spot
+            spot.ladder = ladder
+            spot.role_code = role_code
+            spot.vacancies = 0
+            spot.levels = None
+            spot.boss = boss
+            if boss is None:
+                self.president = spot
+                spot.slot = -1
+                spot.lo = 0
+                spot.hi = 1 << self._label_bits
+            else:
+                # Slots fill in order and the list was sized for every report, so append's checks can be skipped
+                slot = reports.end
+                slots[slot] = spot
+                spot.slot = slot
+                reports.end = slot + 1
+                below[-1 if vacant else role_code] += 1
+                spot.lo = label
+                label += width
+                spot.hi = label
+                if vacant:
+                    boss.vacancies += 1
+                    if boss.vacancies == 1:
+                        self._update_openings(boss)
+                remaining -= 1
+            capacity = capacities[role_code]
+            if count:
+                spot.reports = ReportSlots(max(capacity, count))
+                spot.below = [0] * columns
+                spot.levels = [count]
+                managers.append(spot)
+                if remaining:
+                    waiting.append((boss, reports, slots, below, remaining, label, width))
+                boss, reports, below, remaining = spot, spot.reports, spot.below, count
+                slots = reports.slots
+                label = spot.lo + 1
+                width = (spot.hi - label) // max(capacity, count)
+                short_labels = short_labels or width < 2
+            else:
+                spot.reports = ReportSlots(capacity) if capacity else NO_REPORTS
+                spot.below = None
+                if not remaining and waiting:
+                    boss, reports, slots, below, remaining, label, width = waiting.pop()
+            if count < capacity and not vacant:
+                self._update_openings(spot)
+        # Everyone below a spot comes after it in preorder, so walking back finishes each branch before its boss
+        for spot in reversed(managers):
+            spot.reports.count = spot.reports.end
+            boss = spot.boss
+            if boss is not None:
+                boss.below[:] = map(int.__add__, boss.below, spot.below)
+                levels = boss.levels
+                if len(levels) <= len(spot.levels):
+                    levels.extend([0] * (len(spot.levels) + 1 - len(levels)))
+                for index, count in enumerate(spot.levels, 1):
+                    levels[index] += count
+        self.employee_lookup = NameIndex(employee_lookup)
+        if short_labels:
+            self._grow_labels()
+
+    # ----- Undo steps, each the inverse of one part of a change -----
+
+    def _undo_detach(self, spot):
+        # Takes spot, with everyone below it, out of its boss's reports. Its labels and openings are left as they are.
+        boss = spot.boss
+        self._forget_rendered(spot)
+        self._count_branch(spot, -1)
+        boss.reports.remove(spot)
+        if type(spot) is Vacancy:
+            boss.vacancies -= 1
+        spot.boss = None
+        self._update_openings(boss)
+
+    def _undo_attach(self, spot, boss, following):
+        # Puts a detached spot back under boss just ahead of following, or last when following is None.
+        if following is None:
+            boss.reports.append(spot)
+        else:
+            boss.reports.insert_before(following, spot)
+        spot.boss = boss
+        if type(spot) is Vacancy:
+            boss.vacancies += 1
+        self._label_put_back(spot, following)
+        self._count_branch(spot, 1)
+        self._forget_rendered(spot)
+        self._update_openings(boss)
+        self._update_openings(spot)
+
+    def _label_put_back(self, spot, following):
+        # Keeps the label spot left with if it still fits between its neighbours, otherwise finds it a new one.
+        boss = spot.boss
+        previous = boss.reports.before(spot)
+        start = previous.hi if previous is not None else boss.lo + 1
+        stop = following.lo if following is not None else boss.hi
+        if start <= spot.lo and spot.hi <= stop:
+            return
+        if following is None:
+            self._label_last_report(boss)
+        elif stop - start >= 2:
+            spot.lo, spot.hi = start, stop
+            if spot.reports:
+                self._relabel(spot)
+        else:
+            self._relabel(boss)
+
+    def _undo_unfill(self, new_spot, old_spot, moved):
+        # Gives old_spot back the place new_spot took from it, and the reports in moved that came with it.
+        # new_spot is left detached with whatever reports it had of its own.
+        boss = new_spot.boss
+        self._forget_rendered(new_spot)
+        self._count_branch(new_spot, -1)
+        old_spot.reports = ReportSlots(max(old_spot.max_reports, len(moved))) if old_spot.max_reports or moved else NO_REPORTS
+        old_spot.vacancies = 0
+        for report in moved:
+            new_spot.reports.remove(report)
+            old_spot.reports.append(report)
+            report.boss = old_spot
+            if type(report) is Vacancy:
+                new_spot.vacancies -= 1
+                old_spot.vacancies += 1
+        if new_spot.reports is not NO_REPORTS and not new_spot.reports and not new_spot.max_reports:
+            new_spot.reports = NO_REPORTS
+        self._recount(new_spot)
+        self._recount(old_spot)
+        boss.reports[new_spot.slot] = old_spot
+        old_spot.boss = boss
+        new_spot.boss = None
+        boss.vacancies += (type(old_spot) is Vacancy) - (type(new_spot) is Vacancy)
+        # The moved reports were labelled inside the place's interval, which old_spot takes back
+        old_spot.lo, old_spot.hi = new_spot.lo, new_spot.hi
+        self._count_branch(old_spot, 1)
+        self._rendered.pop(old_spot, None)
+        self._frozen.pop(old_spot, None)
+        self._drop_openings(new_spot)
+        self._update_openings(boss)
+        self._update_openings(old_spot)
+
+    def _recount(self, spot):
+        # Rebuilds spot's counts and levels from its direct reports.
+        below = [0] * (len(self.ladder.roles) + 1)
+        spot.levels = []
+        for report in spot.reports:
+            below[-1 if type(report) is Vacancy else report.role_code] += 1
+            if report.below is not None:
+                for index, count in enumerate(report.below):
+                    below[index] += count
+            self._add_levels(spot, [1] + (report.levels or []), 1)
+        spot.below = below
+
+    def _undo_demote(self, spot):
+        # Moves a detached spot back down the role it was promoted from.
+        spot.role_code += 1
+        if spot.role_code == self.ladder.bottom and not spot.reports:
+            spot.reports = NO_REPORTS
+
+    def _undo_forget(self, employee):
+        # Takes a hired employee's name out of the organization.
+        del self.employee_lookup[employee.name]
+        self._drop_openings(employee)
 
-    def _find_vp_opening(self, president):
-        # Checks if other VP spot is available
-        result = self._has_spots(president)
-        if result is True:
-            return -1, president
-        # Has Vacancy object
-        elif result != False:
-            return result, president
-        # No Vice President openings found
-        return None, None
+    def _undo_remember(self, employee):
+        # Brings a removed employee's name back.
+        self.employee_lookup[employee.name] = employee
+
+    def _revert(self, changes):
+        # Runs the inverse steps of one change, last recorded first.
+        for kind, *arguments in reversed(changes):
+            getattr(self, "_undo_" + kind)(*arguments)
+
+    def clear_history(self):
+        # Forgets every change UNDO and REDO could step through.
+        self.history.clear()
+        self.redo_log.clear()
 
+    def _changes_kept(self, count):
+        # Called once count changes are final: after each change outside a transaction, and on COMMIT.
+        # The organization is in memory, so there is nothing to do; sqlite_organization.py commits its writes here.
+        pass
+
+    def _journal_sync_due(self):
+        # Called by the journal once the appends it flushed are due to be forced to disk.
+        self.journal.fsync()
+
+    def _journal_full(self):
+        # Called by the journal once its current segment is due to be folded into a snapshot.
+        self.journal.compact()
 
     # ----- Main Methods -----
 
+    @journaled
     def initialize_president(self, name: str):
         # Checks if president already exists, should never happen
         if self.president != None: return False
         
-        president = Employee(name=name, role="President", boss=None)
+        president = Employee(name=name, role=self.ladder.roles[0], boss=None, ladder=self.ladder)
         self.president = president
-        self.all_names.add(name)
         self.employee_lookup[name] = president
-        print(f"Success: Initialized President {name}.")
+        president.hi = 1 << self._label_bits
+        self._update_openings(president)
+        self._report(Status.OK, "Success: Initialized President {0}.", name)
         return True
 
 
+    @journaled
     def hire_employee(self, hiring_manager_name: str, new_employee_name: str):
         # Hires a new employee under a specific manager (Requirement 3).
         # Checks if names exist
-        if hiring_manager_name not in self.all_names:
-            print(f"Error: Hiring manager {hiring_manager_name} does not exist.")
-            return
-        if new_employee_name in self.all_names:
-            print(f"Error: Employee name {new_employee_name} already exists.")
-            return
+        if hiring_manager_name not in self.employee_lookup:
+            return self._report_missing("Error: Hiring manager {0} does not exist.", hiring_manager_name)
+        if new_employee_name in self.employee_lookup:
+            return self._report(Status.DUPLICATE_NAME, "Error: Employee name {0} already exists.", new_employee_name)
 
         hiring_manager = self._find_employee(hiring_manager_name)
 
         # Checks if hiring manager can hire
-        if hiring_manager.role == "Worker":
-            print(f"Error: A worker cannot hire employees.")
-            return
+        if hiring_manager.role_code == self.ladder.bottom:
+            return self._report(Status.NOT_PERMITTED, "Error: A {0} cannot hire employees.", hiring_manager.role.lower())
 
         result = self._has_spots(hiring_manager)
         # Checks if there is an open spot
         if result is False:
-            print(f"Error: Hiring manager {hiring_manager_name} has reached maximum direct reports.")
-            return
+            return self._report(Status.CAPACITY_FULL, "Error: Hiring manager {0} has reached maximum direct reports.", hiring_manager_name)
 
         # Replace empty spot with new employee
         elif result is True:
-            self._add_employee(hiring_manager, new_employee_name)
+            return self._add_employee(hiring_manager, new_employee_name)
 
         # Replace Vacancy object with new employee
         else:
-            self._replace_vacancy_with_new_employee(hiring_manager, result, new_employee_name)
-       
-
-        return
+            return self._replace_vacancy_with_new_employee(hiring_manager, result, new_employee_name)
 
 
+    @journaled
     def fire_employee(self, firing_manager_name: str, target_employee_name: str):
         # Removes an employee, leaving a vacancy. Firing manager must be in target's hierarchy (Requirement 4).
         # Checks if names exist
         if target_employee_name == self.president.name:
-            print("Error: Cannot fire the President.")
-            return
-        if firing_manager_name not in self.all_names:
-            print(f"Error: Firing manager {firing_manager_name} does not exist.")
-            return
-        if target_employee_name not in self.all_names:
-            print(f"Error: Employee name {target_employee_name} does not exist.")
-            return
+            return self._report(Status.PROTECTED, "Error: Cannot fire the President.")
+        if firing_manager_name not in self.employee_lookup:
+            return self._report_missing("Error: Firing manager {0} does not exist.", firing_manager_name)
+        if target_employee_name not in self.employee_lookup:
+            return self._report_missing("Error: Employee name {0} does not exist.", target_employee_name)
 
         firing_manager = self._find_employee(firing_manager_name)
         target_employee = self._find_employee(target_employee_name)
 
         # Checks if firing manager is in target employee's hierarchy
         if not self._is_superior_to(firing_manager, target_employee):
-            print(f"Error: {firing_manager_name} is not in the hierarchy of {target_employee_name}.")
-            return
+            return self._report(Status.NOT_IN_HIERARCHY, "Error: {0} is not in the hierarchy of {1}.", firing_manager_name, target_employee_name)
         
         # If everything is valid, remove the employee
-        self._remove_employee(target_employee)
-        return
+        return self._remove_employee(target_employee)
 
 
+    @journaled
     def employee_quits(self, employee_name: str):
         # An employee quits. Vacancy remains. President cannot quit. (Requirement 5)
         # Checks if names exist
         if employee_name == self.president.name:
-            print("Error: President cannot quit.")
-            return
-        if employee_name not in self.all_names:
-            print(f"Error: Employee name {employee_name} does not exist.")
-            return
+            return self._report(Status.PROTECTED, "Error: President cannot quit.")
+        if employee_name not in self.employee_lookup:
+            return self._report_missing("Error: Employee name {0} does not exist.", employee_name)
 
         # Remove employee
-        self._remove_employee(self._find_employee(employee_name))
-        return
+        return self._remove_employee(self._find_employee(employee_name))
 
 
+    @journaled
     def layoff_employee(self, manager_name: str, target_employee_name: str):
         # Lays off an employee. Attempts to transfer them to the closest comparable opening (Requirement 6).
         # Cannot lay off President
         if target_employee_name == self.president.name:
-            print("Error: Cannot lay off the President.")
-            return
+            return self._report(Status.PROTECTED, "Error: Cannot lay off the President.")
 
         # Checks if names exist
-        if manager_name not in self.all_names:
-            print(f"Error: Manager {manager_name} does not exist.")
-            return
-        if target_employee_name not in self.all_names:
-            print(f"Error: Employee name {target_employee_name} does not exist.")
-            return
+        if manager_name not in self.employee_lookup:
+            return self._report_missing("Error: Manager {0} does not exist.", manager_name)
+        if target_employee_name not in self.employee_lookup:
+            return self._report_missing("Error: Employee name {0} does not exist.", target_employee_name)
 
         manager = self._find_employee(manager_name)
         target_employee = self._find_employee(target_employee_name)
 
         # Checks if manager is in target employee's hierarchy
         if not self._is_superior_to(manager, target_employee):
-            print(f"Error: {manager_name} is not in the hierarchy of {target_employee_name}.")
-            return
+            return self._report(Status.NOT_IN_HIERARCHY, "Error: {0} is not in the hierarchy of {1}.", manager_name, target_employee_name)
 
-        index, new_boss = self._find_opening(target_employee.boss, target_employee.role)
+        index, new_boss = self._find_opening(target_employee)
 
         # If no opening found, remove employee
         if index is None:
-            print(f"No comparable openings found")
-            self._remove_employee(target_employee)
-            print("Done")
-            return
+            self._report(Status.OK, "No comparable openings found")
+            result = self._remove_employee(target_employee)
+            self._report(Status.OK, "Done")
+            return result
 
         # If opening found, transfer employee
-        self._move_employee(target_employee, new_boss, index)
-
-        return
+        return self._move_employee(target_employee, new_boss, index)
 
 
+    @journaled
     def transfer_employee(self, initiator_name: str, employee_name: str, destination_manager_name: str):
         # Transfers an employee to the same level. Initiator must manage both spots, and destination must be vacant (Requirement 7).
         # Checks if names all exist
-        if initiator_name not in self.all_names:
-            print(f"Error: Initiator {initiator_name} does not exist.")
-            return
-        if employee_name not in self.all_names:
-            print(f"Error: Employee name {employee_name} does not exist.")
-            return
-        if destination_manager_name not in self.all_names:
-            print(f"Error: Destination manager {destination_manager_name} does not exist.")
-            return
+        if initiator_name not in self.employee_lookup:
+            return self._report_missing("Error: Initiator {0} does not exist.", initiator_name)
+        if employee_name not in self.employee_lookup:
+            return self._report_missing("Error: Employee name {0} does not exist.", employee_name)
+        if destination_manager_name not in self.employee_lookup:
+            return self._report_missing("Error: Destination manager {0} does not exist.", destination_manager_name)
 
         initiator = self._find_employee(initiator_name)
 
-        # Checks if initiator is President or VP
-        if initiator.role not in ["President", "Vice President"]:
-            print(f"Error: Initiator {initiator_name} does not have permission to transfer employees.")
-            return
+        # Checks if initiator is President or VP, or generally above the two bottom roles
+        if initiator.role_code >= self.ladder.bottom - 1:
+            return self._report(Status.NOT_PERMITTED, "Error: Initiator {0} does not have permission to transfer employees.", initiator_name)
 
         # Checks if initiator manages employee getting transferred
         employee = self._find_employee(employee_name)
         if not self._is_superior_to(initiator, employee):
-            print(f"Error: {initiator_name} does not manage {employee_name}.")
-            return
+            return self._report(Status.NOT_IN_HIERARCHY, "Error: {0} does not manage {1}.", initiator_name, employee_name)
 
         # Checks if initiator manages destination manager, or if initiator is destination manager
         destination_manager = self._find_employee(destination_manager_name)
         if not self._is_superior_to(initiator, destination_manager) and initiator != destination_manager:
-            print(f"Error: {initiator_name} does not manage {destination_manager_name}.")
-            return
+            return self._report(Status.NOT_IN_HIERARCHY, "Error: {0} does not manage {1}.", initiator_name, destination_manager_name)
 
         # Checks if roles match
-        if employee.role != self._determine_valid_role(destination_manager):
-            print(f"Error: Employee {employee_name} cannot be transferred to {destination_manager_name} due to role mismatch.")
-            return
+        if employee.role_code != self.ladder.below(destination_manager.role_code):
+            return self._report(Status.ROLE_MISMATCH, "Error: Employee {0} cannot be transferred to {1} due to role mismatch.", employee_name, destination_manager_name)
 
         # Checks if a spot is available
-        if not self._has_spots(destination_manager):
-            print(f"Error: Destination manager {destination_manager_name} has reached maximum direct reports.")
-            return
+        if self._has_spots(destination_manager) is False:
+            return self._report(Status.CAPACITY_FULL, "Error: Destination manager {0} has reached maximum direct reports.", destination_manager_name)
 
         replacement_index = self._check_vancancy_objects(destination_manager)
 
         # If everything is valid, perform the transfer
-        self._move_employee(employee, destination_manager, replacement_index)
-
-        return
+        return self._move_employee(employee, destination_manager, replacement_index)
 
 
+    @journaled
     def promote_employee(self, receiving_manager_name: str, target_employee_name: str):
         # Promotes an employee one level to a vacancy under a different organization (Requirement 8).
         # Checks if names exist
-        if receiving_manager_name not in self.all_names:
-            print(f"Error: Receiving manager {receiving_manager_name} does not exist.")
-            return
-        if target_employee_name not in self.all_names:
-            print(f"Error: Employee name {target_employee_name} does not exist.")
-            return
+        if receiving_manager_name not in self.employee_lookup:
+            return self._report_missing("Error: Receiving manager {0} does not exist.", receiving_manager_name)
+        if target_employee_name not in self.employee_lookup:
+            return self._report_missing("Error: Employee name {0} does not exist.", target_employee_name)
 
         receiving_manager = self._find_employee(receiving_manager_name)
         target_employee = self._find_employee(target_employee_name)
 
-        # Checks if target employee can be promoted
-        if target_employee.role == "Vice President" or target_employee.role == "President":
-            print(f"Error: {target_employee_name} cannot be promoted further.")
-            return
+        # Checks if target employee can be promoted, nobody is promoted into the President's role
+        if target_employee.role_code <= 1:
+            return self._report(Status.NOT_PERMITTED, "Error: {0} cannot be promoted further.", target_employee_name)
 
-        # Checks if receiving manager can promote
-        if receiving_manager.role == "Worker" or receiving_manager.role == "Supervisor":
-            print(f"Error: {receiving_manager_name} cannot promote employees.")
-            return
+        # Checks if receiving manager can promote, Supervisors and Workers cannot
+        if receiving_manager.role_code >= self.ladder.bottom - 1:
+            return self._report(Status.NOT_PERMITTED, "Error: {0} cannot promote employees.", receiving_manager_name)
 
-        # President cannot promote Workers
-        if receiving_manager.role == "President" and target_employee.role == "Worker":
-            print(f"Error: Promotions can only be one level.")
-            return
+        # President cannot promote Workers, a promotion lands one level below the receiving manager at most and
+        # never beside or above it, which only longer ladders can ask for
+        if not 0 < target_employee.role_code - receiving_manager.role_code <= 2:
+            return self._report(Status.NOT_PERMITTED, "Error: Promotions can only be one level.")
 
         # Checks if there is an open spot
-        if not self._has_spots(receiving_manager):
-            print(f"Error: Receiving manager {receiving_manager_name} has reached maximum direct reports.")
-            return
-
-        # Checks if target employee is not becoming boss of their current peers
-        for index, report in enumerate(receiving_manager.reports):
-            if isinstance(report, Vacancy) and target_employee not in report.reports:
-                if target_employee.role != "Worker":
-                    self._replace_employee_with_vacancy(target_employee)
-                else:
-                    target_employee.boss.reports.remove(target_employee)
-                target_employee.boss = receiving_manager
-                target_employee.reports = receiving_manager.reports[index].reports
-                receiving_manager.reports[index] = target_employee
-                target_employee.promote()
-                print(f"Successfully promoted {target_employee_name} under {receiving_manager_name}.")
-                return
-
-        # No Vacancy object found, normal addition
-        target_employee.boss.reports.remove(target_employee)
-        target_employee.boss = receiving_manager
-        receiving_manager.reports.append(target_employee)
-        target_employee.promote()
-
-        print(f"Successfully promoted {target_employee_name} under {receiving_manager_name}.")
-        return
+        if self._has_spots(receiving_manager) is False:
+            return self._report(Status.CAPACITY_FULL, "Error: Receiving manager {0} has reached maximum direct reports.", receiving_manager_name)
+
+        return self._promote(target_employee, receiving_manager)
+
+
+    @journaled
+    def undo(self):
+        # Reverts the newest change in the history by running its inverse steps, last recorded first.
+        # Costs as much as the change did, whatever the size of the organization.
+        # Inside a transaction only its own changes can be undone.
+        history = self.history if self._transaction is None else self._transaction.entries
+        if not history:
+            return self._report(Status.NOT_PERMITTED, "Error: Nothing to undo.")
+        method, args, kwargs, changes = history.pop()
+        self._revert(changes)
+        self.redo_log.append((method, args, kwargs))
+        return self._report(Status.OK, "Undid {0}.", describe_call(method, args, kwargs))
+
+
+    def redo(self):
+        # Runs the newest undone change again. It goes into the history and the journal as itself.
+        if not self.redo_log:
+            return self._report(Status.NOT_PERMITTED, "Error: Nothing to redo.")
+        method, args, kwargs = self.redo_log.pop()
+        self._redoing = True
+        try:
+            result = getattr(self, method)(*args, **kwargs)
+        finally:
+            self._redoing = False
+        if not result.ok:
+            self.redo_log.append((method, args, kwargs))
+        return result
+
+
+    def begin(self):
+        # Opens a transaction. Changes from here on take effect as they run, so later commands see them, but they only
+        # reach the history and the journal on COMMIT, and any refused change turns the COMMIT into a ROLLBACK.
+        if self._transaction is not None:
+            return self._report(Status.NOT_PERMITTED, "Error: A transaction is already open.")
+        self._transaction = Transaction()
+        return self._report(Status.OK, "Began a transaction.")
+
+
+    def commit(self):
+        # Keeps the changes of the open transaction, or rolls all of them back if any change in it was refused.
+        transaction = self._transaction
+        if transaction is None:
+            return self._report(Status.NOT_PERMITTED, "Error: No transaction is open.")
+        if transaction.failures:
+            self._rollback()
+            transaction.result = self._report(Status.NOT_PERMITTED,
+                                              "Error: {0} commands in the transaction failed, rolled back {1} changes.",
+                                              str(transaction.failures), str(len(transaction.entries)))
+            return transaction.result
+        self._transaction = None
+        self.history.extend(transaction.entries)
+        if self.journal is not None and transaction.records:
+            self.journal.append_transaction(transaction.records)
+        self._changes_kept(len(transaction.records))
+        transaction.result = self._report(Status.OK, "Committed {0} commands.", str(len(transaction.records)))
+        return transaction.result
+
+
+    def rollback(self):
+        # Reverts every change of the open transaction, newest first, and closes it.
+        transaction = self._transaction
+        if transaction is None:
+            return self._report(Status.NOT_PERMITTED, "Error: No transaction is open.")
+        self._rollback()
+        transaction.result = self._report(Status.OK, "Rolled back {0} changes.", str(len(transaction.entries)))
+        return transaction.result
+
+    def _rollback(self):
+        # Closes the open transaction after reverting its changes, which costs as much as making them did.
+        transaction, self._transaction = self._transaction, None
+        for _, _, _, changes in reversed(transaction.entries):
+            self._revert(changes)
+        # What was undone inside the transaction cannot be redone once it is gone
+        self.redo_log.clear()
+
+    def reject_line(self):
+        # Counts a command line refused before it reached the organization, a malformed or unknown one, against the
+        # open transaction, so its COMMIT rolls back like it would for a refused change.
+        if self._transaction is not None:
+            self._transaction.failures += 1
+
+    @property
+    def in_transaction(self):
+        return self._transaction is not None
+
+    @contextmanager
+    def transaction(self):
+        # BEGIN and COMMIT around a with block, which rolls back instead if the block raises.
+        # Yields the Transaction, whose result says whether it was committed once the block is left.
+        began = self.begin()
+        if not began.ok:
+            raise RuntimeError(began.message)
+        transaction = self._transaction
+        try:
+            yield transaction
+        except BaseException:
+            if self._transaction is transaction:
+                self.rollback()
+            raise
+        if self._transaction is transaction:
+            self.commit()
+
+
+    def view(self, sink=None, names=()):
+        # Read-only OrganizationView of the organization as it is now, which later changes leave as it is.
+        # Copies only the spots changed since the last view was taken, see views.py.
+        # The view finds the given names without building its own name index, which walks the whole tree.
+        president = self._freeze()
+        lookup = self.employee_lookup
+        known = {name: self._frozen[lookup[name]] for name in names if name in lookup}
+        return OrganizationView(president, self.ladder, sink if sink is not None else self.sink, known)
+
+
+    def save(self, path: str):
+        # Writes the whole organization to a binary snapshot file.
+        if self._transaction is not None:
+            return self._report(Status.NOT_PERMITTED, "Error: Commit or roll back the open transaction before saving.")
+        return super().save(path)
+
+
+    def load(self, path: str):
+        # Replaces an empty organization with the one stored in a snapshot file.
+        if self.president is not None:
+            return self._report(Status.NOT_PERMITTED, "Error: Organization already exists, snapshots can only be loaded at startup.")
+        roles, report_counts, names = read_snapshot(path)
+        if roles and max(roles.tobytes().translate(ROLE_BY_CODE)) > self.ladder.bottom:
+            raise SnapshotError(f"{path} has roles this organization's ladder does not define")
+        self._import_preorder(roles, report_counts, names)
+        # Snapshots saved before Vacancies were removed as they emptied can still hold empty ones
+        if 0 in itertools.compress(report_counts, roles.tobytes().translate(VACANT_BY_CODE)):
+            self.compact_vacancies()
+        return self._report(Status.OK, "Loaded {0} positions from {1}.", str(len(roles)), path)
 
 
     # Finish this ----------------------------------------------------------------------
-    def display_organization(self):
-        # Displays the current organization hierarchy (Requirement 11).
-        if self.president is None:
-            print("Organization is empty.")
-            return
-
-        print(f"President: {self.president.name}")
-        self._display_loop(self.president, 1)
-        return
\ No newline at end of file
+    # ----- Counts -----
+
+    def _counts_below(self, spot):
+        # Employees of each role code below spot, vacancies last. Every change to the tree keeps these current.
+        if spot.below is None:
+            return [0] * (len(self.ladder.roles) + 1)
+        return list(spot.below)
+
+    def _levels_below(self, spot):
+        # Spots 1, 2, ... levels below spot, kept current the same way.
+        return list(spot.levels or ())
+
+    def subtree_role_counts(self, name: str):
+        # Number of employees of each role below name, None if the name does not exist.
+        spot = self._find_employee(name)
+        if spot is None:
+            return None
+        counts = self._counts_below(spot)
+        return {role: counts[code] for code, role in enumerate(self.ladder.roles)}
+
+    def subtree_headcount(self, name: str):
+        # Number of employees below name (vacancies excluded), None if the name does not exist.
+        spot = self._find_employee(name)
+        if spot is None:
+            return None
+        return sum(self._counts_below(spot)[:-1])
+
+    def subtree_vacancies(self, name: str):
+        # Number of vacancies below name, None if the name does not exist.
+        spot = self._find_employee(name)
+        if spot is None:
+            return None
+        return self._counts_below(spot)[-1]
+
+    def subtree_depth(self, name: str):
+        # Number of levels below name, None if the name does not exist.
+        spot = self._find_employee(name)
+        if spot is None:
+            return None
+        return len(self._levels_below(spot))
+
+    # ----- Statistics -----
+
+    def enable_stats(self):
+        # Starts counting and timing the public operations of this instance.
+        # The wrappers live on the instance, so an organization without statistics pays nothing.
+        if self.stats is None:
+            self.stats = OperationStats()
+            for operation in TRACKED:
+                setattr(self, operation, timed(self.stats, operation, getattr(self, operation)))
+        return self.stats
+
+    def disable_stats(self):
+        # Removes the wrappers and returns what was recorded.
+        stats = self.stats
+        if stats is not None:
+            for operation in TRACKED:
+                delattr(self, operation)
+            self.stats = None
+        return stats
+
+    def report_stats(self):
+        # Writes the statistics table to the sink.
+        if self.stats is None:
+            return self._report(Status.NOT_PERMITTED, "Error: Statistics are not enabled.")
+        self.sink.write(self.stats.format())
+        return OperationResult(Status.OK, "Displayed statistics.")
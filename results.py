@@ -0,0 +1,31 @@
+class Status:
+    # Status codes returned by OrganizationManager operations
+    OK = "ok"
+    NOT_FOUND = "not_found"                 # A named employee or manager does not exist
+    DUPLICATE_NAME = "duplicate_name"       # New employee name is already taken
+    CAPACITY_FULL = "capacity_full"         # Manager has reached maximum direct reports
+    NOT_IN_HIERARCHY = "not_in_hierarchy"   # Acting manager is not above the target
+    NOT_PERMITTED = "not_permitted"         # Acting employee's role cannot perform the operation
+    ROLE_MISMATCH = "role_mismatch"         # Employee's role does not fit the destination
+    PROTECTED = "protected"                 # Operation is not allowed on the President
+    EMPTY = "empty"                         # Organization has no President yet
+
+class OperationResult:
+    # Lightweight outcome of an operation. The message is only formatted when something reads it.
+    __slots__ = ("status", "template", "names")
+
+    def __init__(self, status: str, template: str, names=()):
+        self.status = status        # One of the Status codes
+        self.template = template    # Message with {0}, {1}... placeholders for names
+        self.names = names          # Names of the employees involved, in message order
+
+    @property
+    def ok(self):
+        return self.status == Status.OK
+
+    @property
+    def message(self):
+        return self.template.format(*self.names)
+
+    def __repr__(self):
+        return f"OperationResult({self.status!r}, {self.message!r})"
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+
+from employee import DEFAULT_LADDER
+from journal import Journal
+from main import ladder_argument, run_command
+from organization_manager import OrganizationManager
+from results import Status
+from sinks import SilentSink
+
+# Serves one organization to many clients over TCP or a Unix socket, in the command language of main.py.
+#
+# A client sends command lines and may send many before reading any answers. Every command gets one response: the
+# lines main.py would print for it followed by "END <status>", in the order the client sent the commands. Commands
+# from every client go through one bounded queue and run one at a time on the event loop, so the organization needs
+# no locks. While the queue is full the server stops reading from clients, and TCP holds them back in turn.
+# DISPLAY takes a view and streams the chart from it a chunk at a time, as fast as the client reads, while the
+# commands after it already run against the live organization.
+#
+# While the organization has no President, the first word of a line names one, as in a script. EXIT closes the
+# connection. Transactions are refused, one client's BEGIN would take in every other client's commands, and so are
+# UNDO and REDO, which would step through every client's changes in one shared history.
+
+QUEUE_LIMIT = 1024          # Commands waiting to run, from all clients together
+PIPELINE_LIMIT = 256        # Commands one client may have sent without reading their responses
+YIELD_EVERY = 32            # Commands run back to back before the loop lets connections read and write
+END = "END"                 # First word of the last line of every response
+ERROR = "error"             # Status of a line that was not a valid command
+
+class Response:
+    __slots__ = ("text", "status", "chunks")
+
+    def __init__(self, text, status, chunks=()):
+        self.text = text            # Messages and other output, as main.py would print them
+        self.status = status        # Status of the result, ERROR for a malformed line
+        self.chunks = chunks        # Chart of a DISPLAY, rendered chunk by chunk while it is sent
+
+class ResponseSink:
+    # Collects what one command emits and writes, in order.
+    def __init__(self):
+        self.parts = []
+
+    def emit(self, result):
+        self.parts.append(result.message + "\n")
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+async def read_response(reader):
+    # Reads one response off a connection to the server. Returns (text, status).
+    lines = []
+    while True:
+        line = (await reader.readline()).decode("utf-8")
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        if line.startswith(END + " "):
+            return "".join(lines), line[len(END) + 1:].rstrip("\n")
+        lines.append(line)
+
+def execute(org, parts, history=False):
+    # Runs one command line against org and returns its Response. UNDO and REDO run only if history is set.
+    sink = ResponseSink()
+    printed = io.StringIO()
+    previous, org.sink = org.sink, sink
+    try:
+        # Malformed lines are reported with print, the same as on the console
+        with contextlib.redirect_stdout(printed):
+            result, chunks = _dispatch(org, parts, sink, history)
+    except Exception as e:
+        result, chunks = None, ()
+        printed.write(f"An unexpected error occurred: {e}\n")
+    finally:
+        org.sink = previous
+    if result is None or result is False:
+        status = ERROR
+    else:
+        status = Status.OK if result is True else result.status
+    return Response(printed.getvalue() + "".join(sink.parts), status, chunks)
+
+def _dispatch(org, parts, sink, history):
+    # (result, chart chunks) of one command line.
+    command = parts[0].upper()
+    if org.president is None:
+        return org.initialize_president(parts[0]), ()
+    if command in ("BEGIN", "COMMIT", "ROLLBACK") and len(parts) == 1:
+        return org._report(Status.NOT_PERMITTED, "Error: Transactions are not available over the server."), ()
+    if command in ("UNDO", "REDO") and len(parts) == 1 and not history:
+        return org._report(Status.NOT_PERMITTED, "Error: UNDO and REDO are not available over the server."), ()
+    if command == "DISPLAY" and len(parts) <= 3 and (len(parts) < 3 or parts[2].isdigit()):
+        # The chart is streamed from a view, so later commands can go ahead while it is sent
+        root_name = parts[1] if len(parts) > 1 else None
+        view = org.view(sink, parts[1:2])
+        return view.chart_chunks(root_name, int(parts[2]) if len(parts) == 3 else None)
+    return run_command(org, parts), ()
+
+class OrganizationServer:
+    def __init__(self, org_manager, queue_limit=QUEUE_LIMIT, pipeline_limit=PIPELINE_LIMIT):
+        self.org_manager = org_manager
+        self.queue_limit = queue_limit
+        self.pipeline_limit = pipeline_limit
+        self.commands = None        # Queue of (parts, future) from every client, made on the serving loop
+        self.server = None
+        self.runner = None          # Task running the queued commands
+        self.writers = set()        # Open client connections, closed with the server
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        # Starts listening on host and port, or on the Unix socket at path.
+        self.commands = asyncio.Queue(self.queue_limit)
+        self.runner = asyncio.create_task(self._run_commands())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._serve_client, path)
+        else:
+            self.server = await asyncio.start_server(self._serve_client, host, port)
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        await self.server.wait_closed()
+        self.runner.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.runner
+
+    def execute(self, parts):
+        # Runs one command line against the organization and returns its Response.
+        return execute(self.org_manager, parts)
+
+    async def _run_commands(self):
+        # Runs queued commands one at a time, in the order they were queued.
+        commands = self.commands
+        run = 0
+        while True:
+            parts, future = await commands.get()
+            if not future.cancelled():
+                future.set_result(self.execute(parts))
+            run += 1
+            if run % YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+    async def _serve_client(self, reader, writer):
+        # Reads one client's command lines and queues them, waiting while either queue is full.
+        self.writers.add(writer)
+        responses = asyncio.Queue(self.pipeline_limit)
+        responder = asyncio.create_task(self._respond(responses, writer))
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode("utf-8", "replace").split()
+                if not parts:
+                    continue
+                if parts[0].upper() == "EXIT":
+                    break
+                future = loop.create_future()
+                await responses.put(future)
+                await self.commands.put((parts, future))
+        except (ConnectionError, ValueError):
+            # Dropped connection, or a line longer than the stream limit
+            pass
+        finally:
+            await responses.put(None)
+            await responder
+            self.writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, responses, writer):
+        # Writes one client's responses in the order its commands came in.
+        broken = False
+        while True:
+            future = await responses.get()
+            if future is None:
+                return
+            response = await future
+            if broken:
+                # Nobody is listening, the remaining responses are only taken off the queue
+                continue
+            try:
+                writer.write(response.text.encode("utf-8"))
+                for chunk in response.chunks:
+                    writer.write(chunk.encode("utf-8"))
+                    await writer.drain()
+                writer.write(f"{END} {response.status}\n".encode("utf-8"))
+                await writer.drain()
+            except ConnectionError:
+                broken = True
+
+async def serve(org_manager, host, port, path=None, queue_limit=QUEUE_LIMIT, pipeline_limit=PIPELINE_LIMIT):
+    server = OrganizationServer(org_manager, queue_limit, pipeline_limit)
+    await server.start(host, port, path)
+    if path is None:
+        host, port = server.address[:2]
+        path = f"{host}:{port}"
+    print(f"Serving on {path}", file=sys.stderr)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Serve one Wacky Widget organization to many clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7500)
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket at PATH instead of TCP.")
+    parser.add_argument("--load", metavar="PATH", help="Start from a snapshot written by SAVE.")
+    parser.add_argument("--journal", metavar="DIR", help="Recover from and journal every change to DIR.")
+    parser.add_argument("--queue", type=int, default=QUEUE_LIMIT, help="Commands waiting to run before clients are held back.")
+    parser.add_argument("--pipeline", type=int, default=PIPELINE_LIMIT, help="Unanswered commands per client before it is held back.")
+    parser.add_argument("--ladder", type=ladder_argument, default=DEFAULT_LADDER, metavar="SPEC",
+                        help="Roles from the top down with how many reports each can have, e.g. 'CEO:4,VP:6,Manager:10,Engineer:0'.")
+    args = parser.parse_args(argv)
+    if args.load is not None and args.journal is not None:
+        parser.error("--load and --journal cannot be combined, the journal directory keeps its own snapshots")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    org_manager = OrganizationManager(sink=SilentSink(), ladder=args.ladder)
+    if args.load is not None:
+        org_manager.load(args.load)
+    journal = None
+    if args.journal is not None:
+        journal = Journal(args.journal)
+        journal.recover(org_manager)
+    try:
+        asyncio.run(serve(org_manager, args.host, args.port, args.unix, args.queue, args.pipeline))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if journal is not None:
+            journal.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import sys
+
+# Output sinks receive every OperationResult emitted by OrganizationManager (emit)
+# and raw text such as the organization chart (write).
+
+class StdoutSink:
+    def emit(self, result):
+        print(result.message)
+
+    def write(self, text: str):
+        sys.stdout.write(text)
+
+class SilentSink:
+    # Discards everything, messages are never formatted
+    def emit(self, result):
+        pass
+
+    def write(self, text: str):
+        pass
+
+class BufferedSink:
+    # Keeps results in memory so callers can format only what they need
+    def __init__(self):
+        self.results = []
+        self.text = []
+
+    def emit(self, result):
+        self.results.append(result)
+
+    def write(self, text: str):
+        self.text.append(text)
+
+    def messages(self):
+        return [result.message for result in self.results]
+
+    def clear(self):
+        self.results.clear()
+        self.text.clear()
+
+class FileSink:
+    # Writes messages to a path or an already open text stream
+    def __init__(self, target):
+        if isinstance(target, str):
+            self.stream = open(target, "w", encoding="utf-8")
+            self.owns_stream = True
+        else:
+            self.stream = target
+            self.owns_stream = False
+
+    def emit(self, result):
+        self.stream.write(result.message + "\n")
+
+    def write(self, text: str):
+        self.stream.write(text)
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+class PageStopped(Exception):
+    # Raised by PagingSink when the reader asks to stop
+    pass
+
+class PagingSink:
+    # Passes text on to another sink a page at a time, asking before each new page
+    def __init__(self, sink, page_lines: int, prompt=input):
+        self.sink = sink
+        self.page_lines = page_lines
+        self.prompt = prompt
+        self.shown = 0      # Lines written on the current page
+
+    def emit(self, result):
+        self.sink.emit(result)
+
+    def write(self, text: str):
+        lines = text.splitlines(keepends=True)
+        while lines:
+            if self.shown >= self.page_lines:
+                if self.prompt("-- More -- (Enter to continue, Q to stop) ").strip().upper() == "Q":
+                    raise PageStopped()
+                self.shown = 0
+            page = lines[:self.page_lines - self.shown]
+            del lines[:len(page)]
+            self.sink.write("".join(page))
+            self.shown += len(page)
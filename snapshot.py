@@ -0,0 +1,64 @@
+import os
+import struct
+import sys
+from array import array
+
+# Binary snapshot of an organization, written and read in one pass.
+#
+# Layout (little endian):
+#   header    magic, format version, seat count, byte length of the names block
+#   roles     one byte per seat in preorder, role code with VACANT_FLAG set for vacancies
+#   reports   one uint32 per seat in preorder, number of direct reports (slot order is preorder order)
+#   names     UTF-8 names of the filled seats in preorder, separated by NUL
+
+MAGIC = b"WWOS"
+VERSION = 1
+HEADER = struct.Struct("<4sBQQ")
+VACANT_FLAG = 0x80
+ROLE_BY_CODE = bytes(code & ~VACANT_FLAG for code in range(256))    # Role byte to role code, for bytes.translate
+VACANT_BY_CODE = bytes(1 if code & VACANT_FLAG else 0 for code in range(256))  # Role byte to 1 for a Vacancy, else 0
+
+class SnapshotError(ValueError):
+    pass
+
+def write_snapshot(path: str, roles, report_counts, names, sync=False):
+    # roles is an array("B"), report_counts an array("I"), names a list of str, all in preorder.
+    # sync forces the file to disk before returning.
+    name_bytes = "\0".join(names).encode("utf-8")
+    if sys.byteorder != "little":
+        report_counts = array("I", report_counts)
+        report_counts.byteswap()
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(roles), len(name_bytes)))
+        file.write(roles.tobytes())
+        file.write(report_counts.tobytes())
+        file.write(name_bytes)
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+
+def read_snapshot(path: str):
+    # Returns (roles, report_counts, names) as written by write_snapshot.
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise SnapshotError(f"{path} is too short to be a snapshot")
+    magic, version, seats, names_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not an organization snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"{path} has unsupported snapshot version {version}")
+
+    roles = array("B")
+    report_counts = array("I")
+    offset = HEADER.size
+    roles.frombytes(data[offset:offset + seats])
+    offset += seats
+    report_counts.frombytes(data[offset:offset + 4 * seats])
+    offset += 4 * seats
+    if sys.byteorder != "little":
+        report_counts.byteswap()
+    if len(roles) != seats or len(report_counts) != seats or len(data) != offset + names_length:
+        raise SnapshotError(f"{path} is truncated")
+    names = data[offset:].decode("utf-8").split("\0") if seats else []
+    return roles, report_counts, names
@@ -0,0 +1,394 @@
+import itertools
+import sqlite3
+from array import array
+from collections.abc import KeysView
+
+from array_organization import FILLED, FREE, NO_ROW, VACANT, ArrayOrganizationManager, SpotRow
+from employee import RoleLadder
+from name_index import SUGGESTION_WINDOW, closest_names
+from sinks import SilentSink
+from snapshot import VACANT_FLAG
+
+# OrganizationManager kept in a SQLite database file, for organizations larger than memory and durable without a journal.
+#
+# The spots table holds the array backend's columns, one table row per row of ArrayOrganizationManager, and every
+# operation is the array backend's, reading and writing single cells through statements prepared once and kept in the
+# connection's statement cache. What walks a whole chain or branch runs as one query instead: recursive CTEs climb the
+# boss column for ancestor checks and descend it, over its index, for counts and charts. The name index is the name
+# column under its own index, so no name is held in memory either.
+#
+# Writes go into a SQLite transaction that is committed every batch_size kept changes. A crash loses at most the last
+# batch_size changes, and never part of one or of a committed BEGIN ... COMMIT, which is only counted once it commits.
+
+BATCH_SIZE = 64             # Kept changes per SQLite commit
+STATEMENT_CACHE = 256       # Prepared statements the connection keeps, every statement here fits
+UNLIMITED_DEPTH = 1 << 62   # Depth limit of a subtree query without one
+REPORT_BATCH = 32           # Rows whose reports one query of a level by level search reads
+NO_BOSS = NO_ROW - 1        # Boss no row has, not even the President or a free row
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spots (
+    row INTEGER PRIMARY KEY,
+    name TEXT,
+    state INTEGER NOT NULL,
+    role_code INTEGER NOT NULL,
+    boss INTEGER NOT NULL,
+    first_report INTEGER NOT NULL DEFAULT -1,
+    last_report INTEGER NOT NULL DEFAULT -1,
+    next_sibling INTEGER NOT NULL DEFAULT -1,
+    prev_sibling INTEGER NOT NULL DEFAULT -1,
+    report_count INTEGER NOT NULL DEFAULT 0,
+    vacancy_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS spots_name ON spots (name);
+CREATE INDEX IF NOT EXISTS spots_boss ON spots (boss);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+NEW_ROW = "INSERT OR REPLACE INTO spots (row, name, state, role_code, boss) VALUES (?, ?, ?, ?, ?)"
+FREE_ROW = f"UPDATE spots SET name = NULL, state = {FREE}, boss = {NO_ROW} WHERE row = ?"
+IMPORT_ROW = "INSERT INTO spots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+ROW_BY_NAME = "SELECT row FROM spots WHERE name = ?"
+REPORTS = "SELECT row, next_sibling FROM spots WHERE boss = ?"
+OPENING = "SELECT state, role_code, report_count, vacancy_count FROM spots WHERE row = ?"
+VACANCIES = f"SELECT row FROM spots WHERE boss = ? AND state = {VACANT}"
+# Reports of REPORT_BATCH rows at once, the unused places hold NO_BOSS
+REPORT_CELLS = ("SELECT row, next_sibling, first_report, state, role_code, report_count, vacancy_count FROM spots "
+                f"WHERE boss IN ({', '.join(['?'] * REPORT_BATCH)})")
+# Rows above a row, nearest first
+CHAIN = f"""
+WITH RECURSIVE chain(row) AS (
+    SELECT boss FROM spots WHERE row = ?
+    UNION ALL
+    SELECT spots.boss FROM spots JOIN chain ON spots.row = chain.row WHERE spots.boss != {NO_ROW})"""
+IS_ABOVE = CHAIN + " SELECT 1 FROM chain WHERE row = ? LIMIT 1"
+# A row and everything below it down to a depth, with the depth of each
+BRANCH = f"""
+WITH RECURSIVE branch(row, depth) AS (
+    SELECT ?, 0
+    UNION ALL
+    SELECT spots.row, branch.depth + 1 FROM spots JOIN branch ON spots.boss = branch.row
+    WHERE spots.state != {FREE} AND branch.depth < ?)"""
+CHART_ROWS = BRANCH + " SELECT row, name, state, role_code, first_report, next_sibling, report_count FROM branch JOIN spots USING (row)"
+COUNTS_BELOW = BRANCH + " SELECT state, role_code, count(*) FROM branch JOIN spots USING (row) WHERE depth > 0 GROUP BY state, role_code"
+LEVELS_BELOW = BRANCH + " SELECT depth, count(*) FROM branch WHERE depth > 0 GROUP BY depth ORDER BY depth"
+HEADCOUNT_BELOW = BRANCH + f" SELECT count(*) FROM branch JOIN spots USING (row) WHERE depth > 0 AND state = {FILLED}"
+DEPTHS = BRANCH + " SELECT row, depth FROM branch"
+
+def ladder_spec(ladder):
+    # The text RoleLadder.parse reads back into ladder.
+    return ",".join(f"{role}:{capacity}" for role, capacity in zip(ladder.roles, ladder.capacities))
+
+class SqliteColumn:
+    # One column of the spots table, read and written a cell at a time by row like the array backend's columns.
+    __slots__ = ("connection", "select", "update")
+
+    def __init__(self, connection, column):
+        self.connection = connection
+        self.select = f"SELECT {column} FROM spots WHERE row = ?"
+        self.update = f"UPDATE spots SET {column} = ? WHERE row = ?"
+
+    def __getitem__(self, row):
+        return self.connection.execute(self.select, (row,)).fetchone()[0]
+
+    def __setitem__(self, row, value):
+        self.connection.execute(self.update, (value, row))
+
+class SqliteNameIndex:
+    # The name column, read as the name index OrganizationManager expects. Names are written with their rows, so
+    # setting and deleting entries here is left with nothing to do.
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get(self, name, default=None):
+        found = self.connection.execute(ROW_BY_NAME, (name,)).fetchone()
+        return default if found is None else found[0]
+
+    def __getitem__(self, name):
+        row = self.get(name)
+        if row is None:
+            raise KeyError(name)
+        return row
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __setitem__(self, name, row):
+        pass
+
+    def __delitem__(self, name):
+        pass
+
+    def __iter__(self):
+        # Row order, which after an import is the order the array backend's dict holds the names in
+        return iter([name for (name,) in self.connection.execute("SELECT name FROM spots WHERE name IS NOT NULL ORDER BY row")])
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(name) FROM spots").fetchone()[0]
+
+    def keys(self):
+        return KeysView(self)
+
+    def with_prefix(self, prefix: str, limit=None):
+        # Names starting with prefix in sorted order, at most limit of them. SQLite compares UTF-8 bytes, which sort
+        # the same as the code points Python compares, and rows are only read until one no longer matches.
+        found = []
+        for (name,) in self.connection.execute("SELECT name FROM spots WHERE name >= ? ORDER BY name", (prefix,)):
+            if not name.startswith(prefix) or len(found) == limit:
+                break
+            found.append(name)
+        return found
+
+    def suggest(self, name: str, limit=3):
+        # Same as NameIndex.suggest, the names sorting next to name come from the name index.
+        if not isinstance(name, str):
+            return []
+        execute = self.connection.execute
+        nearby = [found for (found,) in execute("SELECT name FROM spots WHERE name < ? ORDER BY name DESC LIMIT ?",
+                                                (name, SUGGESTION_WINDOW))]
+        nearby += [found for (found,) in execute("SELECT name FROM spots WHERE name >= ? ORDER BY name LIMIT ?",
+                                                 (name, SUGGESTION_WINDOW))]
+        return closest_names(name, nearby, limit)
+
+class SqliteOrganizationManager(ArrayOrganizationManager):
+    # ArrayOrganizationManager whose columns live in a SQLite database at path, ":memory:" for one that is not kept.
+    # Opening an existing database picks the organization up where it was last committed, with the ladder it was
+    # created with; a different ladder is refused.
+    def __init__(self, sink=None, ladder=None, path=":memory:", batch_size=BATCH_SIZE):
+        connection = sqlite3.connect(path, cached_statements=STATEMENT_CACHE)
+        if path != ":memory:":
+            connection.execute("PRAGMA journal_mode = WAL")
+        connection.executescript(SCHEMA)
+        stored = connection.execute("SELECT value FROM settings WHERE key = 'ladder'").fetchone()
+        if stored is not None:
+            if ladder is not None and ladder_spec(ladder) != stored[0]:
+                connection.close()
+                raise ValueError(f"{path} holds an organization with the ladder {stored[0]}")
+            ladder = RoleLadder.parse(stored[0])
+        super().__init__(sink, ladder)
+        if stored is None:
+            connection.execute("INSERT INTO settings VALUES ('ladder', ?)", (ladder_spec(self.ladder),))
+            connection.commit()
+        self.path = path
+        self.connection = connection
+        self.batch_size = batch_size
+        self.pending = 0                    # Kept changes not committed yet
+        self.names = SqliteColumn(connection, "name")
+        self.states = SqliteColumn(connection, "state")
+        self.role_codes = SqliteColumn(connection, "role_code")
+        self.bosses = SqliteColumn(connection, "boss")
+        self.first_reports = SqliteColumn(connection, "first_report")
+        self.last_reports = SqliteColumn(connection, "last_report")
+        self.next_siblings = SqliteColumn(connection, "next_sibling")
+        self.prev_siblings = SqliteColumn(connection, "prev_sibling")
+        self.report_counts = SqliteColumn(connection, "report_count")
+        self.vacancy_counts = SqliteColumn(connection, "vacancy_count")
+        self.employee_lookup = SqliteNameIndex(connection)
+        self.free_rows = [row for (row,) in connection.execute("SELECT row FROM spots WHERE state = ? ORDER BY row", (FREE,))]
+        self.row_count = connection.execute("SELECT coalesce(max(row) + 1, 0) FROM spots").fetchone()[0]
+        if self.row_count:
+            # The President takes the first row and is never removed
+            self.president = SpotRow(self, 0)
+
+    # ----- Storage -----
+
+    def _changes_kept(self, count):
+        self.pending += count
+        if self.pending >= self.batch_size:
+            self.sync()
+
+    def sync(self):
+        # Commits every write so far.
+        self.connection.commit()
+        self.pending = 0
+
+    def close(self):
+        self.sync()
+        self.connection.close()
+
+    # ----- Row Helpers -----
+
+    def _new_row(self, role_code, name, boss):
+        # Takes a free row, or adds one at the end.
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self._frozen.pop(row, None)
+        else:
+            row = self.row_count
+            self.row_count += 1
+        self.connection.execute(NEW_ROW, (row, name, FILLED if name is not None else VACANT, role_code, boss))
+        return row
+
+    def _free_row(self, row):
+        # The boss is cleared too, so queries over the boss index never meet a freed row.
+        self._frozen.pop(row, None)
+        self.connection.execute(FREE_ROW, (row,))
+        self.free_rows.append(row)
+
+    def _report_rows(self, row):
+        # One query over the boss index for all of row's reports, then put in order along the sibling links.
+        report = self.first_reports[row]
+        if report == NO_ROW:
+            return
+        following = dict(self.connection.execute(REPORTS, (row,)).fetchall())
+        while report != NO_ROW:
+            yield report
+            report = following[report]
+
+    def _has_opening(self, row):
+        state, role_code, report_count, vacancy_count = self.connection.execute(OPENING, (row,)).fetchone()
+        return state == FILLED and (report_count < self.ladder.capacities[role_code] or vacancy_count > 0)
+
+    def _branch(self, row, max_depth=None):
+        # Row to (name, state, role_code, first_report, next_sibling, report_count) for row and its branch.
+        depth = UNLIMITED_DEPTH if max_depth is None else max_depth
+        return {row: cells for row, *cells in self.connection.execute(CHART_ROWS, (row, depth))}
+
+    # ----- Helper Methods -----
+
+    def _is_superior_to(self, manager, employee):
+        return self.connection.execute(IS_ABOVE, (employee.row, manager.row)).fetchone() is not None
+
+    def _display_lines(self, root, max_depth=None):
+        # The branch comes out of one query, then is walked in report order like the array backend's columns.
+        rows = self._branch(root.row, max_depth)
+        roles = self.ladder.roles
+        name, _, role_code, first_report, _, _ = rows[root.row]
+        yield f"{roles[role_code]}: {name}\n"
+        stack = [(first_report, 1)]
+        while stack:
+            row, depth = stack.pop()
+            if row == NO_ROW:
+                continue
+            name, state, role_code, first_report, next_sibling, _ = rows[row]
+            indent = "\t" * depth
+            if state == VACANT:
+                yield f"{indent}VACANCY: {roles[role_code]}\n"
+            else:
+                yield f"{indent}{roles[role_code]}: {name}\n"
+            stack.append((next_sibling, depth))
+            if max_depth is None or depth < max_depth:
+                stack.append((first_report, depth + 1))
+
+    def _reports_of(self, level, skip):
+        # Yields (row, next_sibling, first_report, state, role_code, report_count, vacancy_count) of the reports of
+        # each (row, first_report) in level, in report order, reading REPORT_BATCH rows' reports per query.
+        execute = self.connection.execute
+        level = iter(level)
+        while True:
+            batch = list(itertools.islice(level, REPORT_BATCH))
+            if not batch:
+                return
+            parents = [(row, first_report) for row, first_report in batch if first_report != NO_ROW]
+            if not parents:
+                continue
+            bosses = [row for row, _ in parents]
+            cells = {report[0]: report for report in execute(REPORT_CELLS, bosses + [NO_BOSS] * (REPORT_BATCH - len(bosses)))}
+            for _, report in parents:
+                while report != NO_ROW:
+                    found = cells[report]
+                    if report != skip:
+                        yield found
+                    report = found[1]
+
+    def _nearest_opening_below(self, ancestor, farthest, role_code, skip):
+        # Same search as the array backend's, reading each level's reports REPORT_BATCH rows at a time and stopping
+        # at the first opening, so the rest of that level is never read.
+        capacities = self.ladder.capacities
+        bottom = self.ladder.bottom
+        level = [(ancestor, self.first_reports[ancestor])]
+        levels = 1
+        while level and (farthest is None or levels <= farthest):
+            below = []
+            for row, _, first_report, state, code, report_count, vacancy_count in self._reports_of(level, skip):
+                if code == role_code and state == FILLED and (report_count < capacities[code] or vacancy_count > 0):
+                    return row, levels
+                if code != bottom:
+                    below.append((row, first_report))
+            level = below
+            levels += 1
+        return NO_ROW, None
+
+    def _vacant_reports(self, row):
+        # The Vacancies come out of one query over the boss index, report order is only needed for more than one.
+        if self.vacancy_counts[row] == 0:
+            return
+        vacancies = {report for (report,) in self.connection.execute(VACANCIES, (row,))}
+        if len(vacancies) == 1:
+            yield vacancies.pop()
+            return
+        for report in self._report_rows(row):
+            if report in vacancies:
+                yield report
+
+    def compact_vacancies(self):
+        empty = [row for (row,) in self.connection.execute(
+            "SELECT row FROM spots WHERE state = ? AND report_count = 0", (VACANT,))]
+        return sum(self._collapse_if_empty(row) for row in empty)
+
+    def _export_preorder(self):
+        # Preorder is a row, then its first report's branch, then its next sibling's.
+        roles = array("B")
+        report_counts = array("I")
+        names = []
+        if self.president is None:
+            return roles, report_counts, names
+        rows = self._branch(self.president.row)
+        stack = [self.president.row]
+        while stack:
+            row = stack.pop()
+            if row == NO_ROW:
+                continue
+            name, state, role_code, first_report, next_sibling, report_count = rows[row]
+            if state == VACANT:
+                roles.append(role_code | VACANT_FLAG)
+            else:
+                roles.append(role_code)
+                names.append(name)
+            report_counts.append(report_count)
+            stack.append(next_sibling)
+            stack.append(first_report)
+        return roles, report_counts, names
+
+    def _import_preorder(self, roles, report_counts, names):
+        # The array backend works the columns out in memory, then they go in with one statement run for every row.
+        staging = ArrayOrganizationManager(sink=SilentSink(), ladder=self.ladder)
+        staging._import_preorder(roles, report_counts, names)
+        seats = len(roles)
+        self.connection.executemany(IMPORT_ROW, zip(
+            range(seats), staging.names, staging.states, staging.role_codes, staging.bosses, staging.first_reports,
+            staging.last_reports, staging.next_siblings, staging.prev_siblings, staging.report_counts, staging.vacancy_counts))
+        self.row_count = seats
+        if seats:
+            self.president = SpotRow(self, 0)
+        self.sync()
+
+    # ----- Analytics -----
+
+    def headcount_by_role(self):
+        counts = dict(self.connection.execute(
+            "SELECT role_code, count(*) FROM spots WHERE state = ? GROUP BY role_code", (FILLED,)))
+        return {role: counts.get(code, 0) for code, role in enumerate(self.ladder.roles)}
+
+    def depths(self):
+        depth = array("q", [NO_ROW]) * self.row_count
+        if self.president is None:
+            return depth
+        for row, level in self.connection.execute(DEPTHS, (self.president.row, UNLIMITED_DEPTH)):
+            depth[row] = level
+        return depth
+
+    def _counts_below(self, spot):
+        counts = [0] * (len(self.ladder.roles) + 1)
+        for state, role_code, count in self.connection.execute(COUNTS_BELOW, (spot.row, UNLIMITED_DEPTH)):
+            counts[-1 if state == VACANT else role_code] += count
+        return counts
+
+    def _levels_below(self, spot):
+        return [count for _, count in self.connection.execute(LEVELS_BELOW, (spot.row, UNLIMITED_DEPTH))]
+
+    def subtree_headcount(self, name: str):
+        root = self.employee_lookup.get(name)
+        if root is None:
+            return None
+        return self.connection.execute(HEADCOUNT_BELOW, (root, UNLIMITED_DEPTH)).fetchone()[0]
@@ -0,0 +1,106 @@
+import functools
+import time
+
+from results import OperationResult, Status
+
+# Per-operation counters and latency histograms, attached to one OrganizationManager.
+# Latencies go into power-of-two nanosecond buckets, so recording is a bit_length and an increment.
+
+BUCKETS = 48    # Bucket i holds latencies below 2**i ns, the last one everything from ~39 hours up
+
+# Public methods that are counted when statistics are on
+TRACKED = (
+    "initialize_president", "hire_employee", "fire_employee", "employee_quits", "layoff_employee",
+    "transfer_employee", "promote_employee", "undo", "redo", "begin", "commit", "rollback",
+    "display_organization", "count_employees", "find_employees", "save", "load",
+)
+
+class OperationCounter:
+    # Counts for one operation
+    __slots__ = ("calls", "total_ns", "histogram", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.histogram = [0] * BUCKETS
+        self.errors = {}        # Status code or exception name to count, for calls that did not succeed
+
+    def record(self, elapsed_ns: int, outcome: str):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.histogram[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+        if outcome != Status.OK:
+            self.errors[outcome] = self.errors.get(outcome, 0) + 1
+
+    def percentile_ns(self, fraction: float):
+        # Upper bound of the bucket holding the given fraction of calls.
+        wanted = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= wanted:
+                return 1 << bucket
+        return 0
+
+class OperationStats:
+    def __init__(self):
+        self.counters = {}      # Operation name to OperationCounter, in order of first use
+
+    def counter(self, operation: str):
+        if operation not in self.counters:
+            self.counters[operation] = OperationCounter()
+        return self.counters[operation]
+
+    def record(self, operation: str, elapsed_ns: int, outcome: str):
+        # outcome is a Status code, or the exception name if the call raised.
+        self.counter(operation).record(elapsed_ns, outcome)
+
+    def as_dict(self):
+        operations = {}
+        for operation, counter in self.counters.items():
+            if not counter.calls:
+                continue
+            operations[operation] = {
+                "calls": counter.calls,
+                "errors": dict(counter.errors),
+                "total_ms": counter.total_ns / 1e6,
+                "p50_us": counter.percentile_ns(0.50) / 1000,
+                "p99_us": counter.percentile_ns(0.99) / 1000,
+                "histogram_ns": {f"<{1 << bucket}": count for bucket, count in enumerate(counter.histogram) if count},
+            }
+        return {"operations": operations}
+
+    def format(self):
+        # Plain text table for the STATS command.
+        operations = self.as_dict()["operations"]
+        if not operations:
+            return "No operations recorded yet.\n"
+        lines = [f"{'operation':<22}{'calls':>8}{'errors':>8}{'total ms':>11}{'p50 us':>10}{'p99 us':>10}\n"]
+        for operation, entry in operations.items():
+            errors = sum(entry["errors"].values())
+            lines.append(f"{operation:<22}{entry['calls']:>8}{errors:>8}{entry['total_ms']:>11.2f}{entry['p50_us']:>10.1f}{entry['p99_us']:>10.1f}\n")
+            for reason, count in sorted(entry["errors"].items()):
+                lines.append(f"    {reason:<18}{count:>8}\n")
+        return "".join(lines)
+
+def timed(stats, operation, method):
+    # Wraps one bound method so every call is counted, timed and classified.
+    timer = time.perf_counter_ns
+    record = stats.counter(operation).record
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = timer()
+        try:
+            result = method(*args, **kwargs)
+        except Exception as e:
+            record(timer() - start, type(e).__name__)
+            raise
+        elapsed = timer() - start
+        if result.__class__ is OperationResult:
+            record(elapsed, result.status)
+        else:
+            # initialize_president still answers with a bool
+            record(elapsed, Status.OK if result else Status.NOT_PERMITTED)
+        return result
+    return wrapper
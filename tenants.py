@@ -0,0 +1,242 @@
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+
+from employee import DEFAULT_LADDER
+from organization_manager import OrganizationManager
+from results import Status
+from server import Response, execute
+from sinks import SilentSink
+
+# Hosts many organizations, one per tenant, spread over worker processes so they run on every core at once.
+#
+# Each tenant lives in exactly one worker, which runs that tenant's commands one at a time in the order they were
+# submitted; tenants in different workers run in parallel. A worker is a plain process holding its tenants'
+# organizations, not a ProcessPoolExecutor, because a pool sends each call to whichever process is free and the
+# organizations would have to travel with every call. The host talks to each worker over a pipe and hands back a
+# Future per call, resolved by a thread reading that worker's replies.
+#
+# Commands are main.py command lines and come back as server.Response objects with the chart of a DISPLAY in the text.
+# A tenant moves to another worker as a snapshot of its chart: its undo history stays behind.
+# Transactions are refused, a BEGIN would take in every later batch sent to the tenant, from anyone.
+
+class TenantWorker:
+    # The organizations of one worker process by tenant, and the calls the host can make on them.
+    def __init__(self, backend, ladder):
+        self.backend = backend
+        self.ladder = ladder
+        self.orgs = {}
+
+    def create(self, tenant, ladder=None, path=None):
+        org = self.backend(sink=SilentSink(), ladder=ladder if ladder is not None else self.ladder)
+        if path is not None:
+            org.load(path)
+        self.orgs[tenant] = org
+
+    def run(self, tenant, lines):
+        # Response of each non-blank line, in order.
+        org = self.orgs[tenant]
+        responses = []
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0].upper() in ("BEGIN", "COMMIT", "ROLLBACK") and len(parts) == 1 and org.president is not None:
+                responses.append(Response("Error: Transactions are not available on a hosted tenant.\n", Status.NOT_PERMITTED))
+                continue
+            # A tenant's history holds only its own changes
+            response = execute(org, parts, history=True)
+            if response.chunks:
+                response = Response(response.text + "".join(response.chunks), response.status)
+            responses.append(response)
+        return responses
+
+    def export(self, tenant, remove=False):
+        # (ladder, roles, report_counts, names) of the tenant's chart, also dropping the tenant if remove is set.
+        org = self.orgs.pop(tenant) if remove else self.orgs[tenant]
+        return (org.ladder, *org._export_preorder())
+
+    def restore(self, tenant, snapshot):
+        ladder, roles, report_counts, names = snapshot
+        org = self.backend(sink=SilentSink(), ladder=ladder)
+        org._import_preorder(roles, report_counts, names)
+        self.orgs[tenant] = org
+
+    def drop(self, tenant):
+        del self.orgs[tenant]
+
+def _serve_worker(connection, backend, ladder):
+    # Worker process loop: runs (number, method, args) calls until it receives None.
+    worker = TenantWorker(backend, ladder)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        number, method, args = message
+        try:
+            reply = (number, True, getattr(worker, method)(*args))
+        except Exception as error:
+            reply = (number, False, error)
+        connection.send(reply)
+    connection.close()
+
+class WorkerHandle:
+    # The host's end of one worker process.
+    def __init__(self, index, context, backend, ladder):
+        self.index = index
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve_worker, args=(child, backend, ladder), daemon=True)
+        self.process.start()
+        child.close()
+        self.numbers = itertools.count()
+        self.pending = {}                   # Call number to the Future of its reply
+        self.lock = threading.Lock()        # Guards pending, the reader thread only ever takes this one
+        self.send_lock = threading.Lock()   # Keeps messages whole, held while a send waits on a full pipe
+        self.closed = False
+        self.reader = None
+
+    def listen(self):
+        # Started once every worker process is, so none of them is forked with the reader threads running.
+        self.reader = threading.Thread(target=self._receive, name=f"tenant-worker-{self.index}", daemon=True)
+        self.reader.start()
+
+    def call(self, method, *args):
+        # Sends one call to the worker and returns the Future of its result.
+        future = Future()
+        with self.lock:
+            if self.closed:
+                raise ConnectionError(f"Worker {self.index} has exited")
+            number = next(self.numbers)
+            self.pending[number] = future
+        with self.send_lock:
+            self.connection.send((number, method, args))
+        return future
+
+    def _receive(self):
+        # Resolves Futures as replies come in, and fails the rest once the worker is gone.
+        while True:
+            try:
+                number, ok, value = self.connection.recv()
+            except (EOFError, OSError):
+                break
+            with self.lock:
+                future = self.pending.pop(number)
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        with self.lock:
+            self.closed = True
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError(f"Worker {self.index} has exited"))
+
+    def close(self):
+        with self.lock:
+            closed = self.closed
+        if not closed:
+            with self.send_lock:
+                self.connection.send(None)
+        self.process.join()
+        self.reader.join()
+        self.connection.close()
+
+class TenantHost:
+    def __init__(self, workers=None, backend=OrganizationManager, ladder=None, context=None):
+        context = context if context is not None else multiprocessing.get_context()
+        self.ladder = ladder if ladder is not None else DEFAULT_LADDER  # Ladder of tenants created without one
+        self.placement = {}             # Tenant to the index of the worker that holds it
+        self.lock = threading.Lock()    # Held while placement changes, so no call goes to a tenant's old worker
+        self.workers = [WorkerHandle(index, context, backend, self.ladder)
+                        for index in range(workers if workers else os.cpu_count() or 1)]
+        for worker in self.workers:
+            worker.listen()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+    def _owner(self, tenant):
+        if tenant not in self.placement:
+            raise KeyError(f"No tenant named {tenant}")
+        return self.workers[self.placement[tenant]]
+
+    def _place(self, tenant, worker):
+        # Index of the worker a new tenant goes to: the one asked for, otherwise the one holding the fewest tenants.
+        if tenant in self.placement:
+            raise ValueError(f"Tenant {tenant} already exists")
+        if worker is not None:
+            return worker
+        held = [0] * len(self.workers)
+        for index in self.placement.values():
+            held[index] += 1
+        return held.index(min(held))
+
+    def create(self, tenant, ladder=None, path=None, worker=None):
+        # Adds an empty organization, or the one in the SAVE snapshot at path. Returns the index of its worker.
+        with self.lock:
+            index = self._place(tenant, worker)
+            self.workers[index].call("create", tenant, ladder, path).result()
+            self.placement[tenant] = index
+        return index
+
+    def restore(self, tenant, snapshot, worker=None):
+        # Adds a tenant from a snapshot() of another, possibly on another host. Returns the index of its worker.
+        with self.lock:
+            index = self._place(tenant, worker)
+            self.workers[index].call("restore", tenant, snapshot).result()
+            self.placement[tenant] = index
+        return index
+
+    def snapshot(self, tenant):
+        # The tenant's chart as (ladder, roles, report_counts, names), taken after everything submitted to it so far.
+        with self.lock:
+            future = self._owner(tenant).call("export", tenant)
+        return future.result()
+
+    def drop(self, tenant):
+        with self.lock:
+            self._owner(tenant).call("drop", tenant).result()
+            del self.placement[tenant]
+
+    def move(self, tenant, worker):
+        # Moves a tenant to another worker. Commands submitted before the move run first, those after it on the new one.
+        with self.lock:
+            source = self._owner(tenant)
+            if source.index == worker:
+                return
+            snapshot = source.call("export", tenant, True).result()
+            try:
+                self.workers[worker].call("restore", tenant, snapshot).result()
+            except Exception:
+                source.call("restore", tenant, snapshot).result()
+                raise
+            self.placement[tenant] = worker
+
+    def tenants(self):
+        # Tenant to the index of its worker.
+        with self.lock:
+            return dict(self.placement)
+
+    def submit(self, tenant, lines):
+        # Queues command lines for a tenant and returns the Future of their list of Responses.
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        with self.lock:
+            return self._owner(tenant).call("run", tenant, list(lines))
+
+    def run(self, tenant, lines):
+        return self.submit(tenant, lines).result()
+
+    def execute(self, tenant, line):
+        # Response of one command line.
+        responses = self.run(tenant, [line])
+        return responses[0] if responses else None
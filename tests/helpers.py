@@ -0,0 +1,83 @@
+import random
+from employee import RoleLadder
+from sinks import BufferedSink
+
+# Ladders, random command streams, charts and tree walks shared by the tests that check organizations against each
+# other or against their own tree.
+
+WIDE = RoleLadder.parse("CEO:60,VP:80,Engineer:0")   # Room for many reports, hires rarely run out of openings
+DEEP = RoleLadder.parse("CEO:3,EVP:3,VP:2,Director:2,Manager:3,Engineer:0")   # Narrow and six levels down
+
+# Weight of each command in a stream of changes
+CHANGES = {
+    "hire_employee": 1,
+    "fire_employee": 1,
+    "employee_quits": 1,
+    "layoff_employee": 1,
+    "transfer_employee": 1,
+    "promote_employee": 1,
+}
+
+# Employees each command names, a hire also takes the new employee's name
+NAMES_TAKEN = {
+    "hire_employee": 1,
+    "fire_employee": 2,
+    "employee_quits": 1,
+    "layoff_employee": 2,
+    "transfer_employee": 3,
+    "promote_employee": 2,
+    "count_employees": 1,
+    "display_organization": 1,
+    "undo": 0,
+    "redo": 0,
+}
+
+MIN_NAMES = 5   # Below this many employees every command is a hire, so a new organization grows first
+
+
+def random_command(org, rng, step, mix=CHANGES, pick=None):
+    # (method, *arguments) of one command drawn from mix. pick() names an employee, by default any of org's.
+    names = sorted(org.employee_lookup)
+    if pick is None:
+        pick = lambda: rng.choice(names)
+    method = rng.choices(list(mix), list(mix.values()))[0]
+    if len(names) < MIN_NAMES:
+        method = "hire_employee"
+    command = (method, *(pick() for _ in range(NAMES_TAKEN[method])))
+    if method == "hire_employee":
+        command += (f"E{step}",)
+    return command
+
+
+def random_commands(org, seed, steps, mix=CHANGES):
+    # Runs steps random commands on org.
+    rng = random.Random(seed)
+    for step in range(steps):
+        method, *args = random_command(org, rng, step, mix)
+        getattr(org, method)(*args)
+
+
+def run(org, method, *args):
+    # Status of one command, or the name of the exception it raised, so backends can be compared on either.
+    try:
+        return getattr(org, method)(*args).status
+    except Exception as e:
+        return type(e).__name__
+
+
+def chart(org):
+    # Text of org's full chart. The chart goes to a sink of its own and org's sink keeps what it held.
+    sink = BufferedSink()
+    org.sink, previous = sink, org.sink
+    try:
+        org.display_organization()
+    finally:
+        org.sink = previous
+    return "".join(sink.text)
+
+
+def walk(spot):
+    # Everyone below spot, in preorder.
+    for report in spot.reports:
+        yield report
+        yield from walk(report)
@@ -0,0 +1,67 @@
+import random
+import pytest
+from organization_manager import OrganizationManager
+from sinks import SilentSink
+from helpers import random_command, walk
+
+# ---------- ANCESTOR LABEL TESTS ----------
+
+def walks_up_to(manager, employee):
+    current_boss = employee.boss
+    while current_boss is not None:
+        if current_boss is manager:
+            return True
+        current_boss = current_boss.boss
+    return False
+
+
+def assert_labels_match_tree(org):
+    spots = [org.president, *walk(org.president)]
+    for manager in spots:
+        for employee in spots:
+            assert org._is_superior_to(manager, employee) == walks_up_to(manager, employee)
+        # Sibling labels follow report order
+        los = [report.lo for report in manager.reports]
+        assert los == sorted(los)
+
+
+def test_superior_checks_follow_hierarchy():
+    org = OrganizationManager(sink=SilentSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    lookup = org.employee_lookup
+    assert org._is_superior_to(lookup["P"], lookup["W1"])
+    assert org._is_superior_to(lookup["V1"], lookup["W1"])
+    assert not org._is_superior_to(lookup["V2"], lookup["W1"])
+    assert not org._is_superior_to(lookup["W1"], lookup["S1"])
+    assert not org._is_superior_to(lookup["S1"], lookup["S1"])
+
+
+def test_transfer_moves_whole_subtree_labels():
+    org = OrganizationManager(sink=SilentSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.transfer_employee("P", "S1", "V2")
+    lookup = org.employee_lookup
+    assert org._is_superior_to(lookup["V2"], lookup["W1"])
+    assert not org._is_superior_to(lookup["V1"], lookup["W1"])
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_labels_match_tree_after_random_commands(seed):
+    rng = random.Random(seed)
+    org = OrganizationManager(sink=SilentSink())
+    # Start with a tiny label space so it has to grow along the way
+    org._label_bits = 3
+    org.initialize_president("P")
+    for step in range(200):
+        method, *args = random_command(org, rng, step)
+        getattr(org, method)(*args)
+        assert_labels_match_tree(org)
+    assert org._label_bits > 3
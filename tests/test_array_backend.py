@@ -0,0 +1,61 @@
+import random
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from sinks import BufferedSink
+from helpers import random_command, chart, run
+
+# ---------- ARRAY BACKEND TESTS ----------
+
+
+def test_array_backend_basic_commands(capsys):
+    org = ArrayOrganizationManager()
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.fire_employee("V1", "S1")
+    org.hire_employee("V1", "S2")
+    capsys.readouterr()
+
+    org.display_organization()
+    assert capsys.readouterr().out.splitlines() == [
+        "President: P",
+        "\tVice President: V1",
+        "\t\tVACANCY: Supervisor",
+        "\t\t\tWorker: W1",
+        "\t\tSupervisor: S2",
+    ]
+    assert org.employee_lookup.keys() == {"P", "V1", "W1", "S2"}
+
+
+def test_array_backend_analytics():
+    org = ArrayOrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.hire_employee("S1", "W2")
+    org.fire_employee("V1", "S1")
+    assert org.headcount_by_role() == {"President": 1, "Vice President": 2, "Supervisor": 0, "Worker": 2}
+    assert org.subtree_headcount("V1") == 2
+    assert org.subtree_headcount("V2") == 0
+    assert org.subtree_headcount("Ghost") is None
+    depths = org.depths()
+    assert depths[org.employee_lookup["W2"]] == 3
+    assert depths[org.employee_lookup["P"]] == 0
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_array_backend_matches_object_backend(seed):
+    rng = random.Random(seed)
+    object_sink, array_sink = BufferedSink(), BufferedSink()
+    orgs = [OrganizationManager(sink=object_sink), ArrayOrganizationManager(sink=array_sink)]
+    for org in orgs:
+        org.initialize_president("P")
+    for step in range(300):
+        command = random_command(orgs[0], rng, step)
+        assert run(orgs[0], *command) == run(orgs[1], *command), command
+        assert object_sink.messages() == array_sink.messages()
+        assert chart(orgs[0]) == chart(orgs[1])
@@ -0,0 +1,60 @@
+import io
+import pytest
+from organization_manager import OrganizationManager
+import main as main_module
+from main import main, run_script
+
+# ---------- BATCH MODE TESTS ----------
+
+def test_script_first_line_is_president(capsys):
+    org = OrganizationManager()
+    run_script(org, io.StringIO("Nelson\nHIRE Nelson VP1\n"))
+    out = capsys.readouterr().out
+    assert org.president.name == "Nelson"
+    assert "Successfully hired VP1 under Nelson." in out
+    assert "VP1" in org.employee_lookup
+
+
+def test_script_prints_no_banner_or_prompt(capsys):
+    org = OrganizationManager()
+    run_script(org, io.StringIO("Nelson\nHIRE Nelson VP1\nDISPLAY\n"))
+    out = capsys.readouterr().out
+    assert "Available commands" not in out
+    assert "Enter command" not in out
+    assert out.splitlines()[-1] == "\tVice President: VP1"
+
+
+def test_script_stops_at_exit_and_reports_summary(capsys):
+    org = OrganizationManager()
+    processed, failed = run_script(org, io.StringIO("Nelson\n\nHIRE Nelson VP1\nBOGUS\nEXIT\nHIRE Nelson VP2\n"))
+    captured = capsys.readouterr()
+    assert processed == 2
+    assert failed == 1
+    assert "VP2" not in org.employee_lookup
+    assert "Processed 2 commands (1 rejected)" in captured.err
+
+
+def test_script_counts_malformed_commands(capsys):
+    org = OrganizationManager()
+    processed, failed = run_script(org, io.StringIO("Nelson\nHIRE Nelson\nQUIT\n"))
+    out = capsys.readouterr().out
+    assert (processed, failed) == (2, 2)
+    assert "Syntax should be: HIRE <ManagerName> <NewEmployeeName>" in out
+
+
+def test_output_file_is_closed_when_the_run_is_interrupted(tmp_path, monkeypatch):
+    script = tmp_path / "script.txt"
+    script.write_text("Nelson\nHIRE Nelson VP1\n")
+    output = tmp_path / "out.txt"
+    sinks = []
+
+    def interrupted(org_manager, stream):
+        sinks.append(org_manager.sink)
+        run_script(org_manager, stream)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(main_module, "run_script", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        main(["--script", str(script), "--output", str(output)])
+    assert sinks[0].stream.closed
+    assert output.read_text().splitlines()[-1] == "Successfully hired VP1 under Nelson."
@@ -0,0 +1,98 @@
+import os
+import sys
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from sinks import BufferedSink
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from org_generator import generate_org
+from command_benchmark import DEFAULT_MIX, run_benchmark, run_mix
+from vacancy_benchmark import run_churn
+from concurrency_benchmark import run_benchmark as run_thread_benchmark
+from server_benchmark import run_benchmark as run_server_benchmark
+from tenant_benchmark import run_benchmark as run_tenant_benchmark
+from sqlite_benchmark import run_benchmark as run_sqlite_benchmark
+from helpers import chart
+
+# ---------- BENCHMARK SUITE TESTS ----------
+
+
+def test_generated_org_is_the_same_on_both_backends():
+    orgs = [generate_org(2000, backend, vacancy_ratio=0.2, seed=4, sink=BufferedSink())
+            for backend in (OrganizationManager, ArrayOrganizationManager)]
+    assert orgs[0].all_names == orgs[1].all_names
+    assert chart(orgs[0]) == chart(orgs[1])
+    lines = chart(orgs[0]).splitlines()
+    assert len(lines) >= 2000
+    assert any("VACANCY" in line for line in lines)
+
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_mix_times_every_command(backend):
+    org = generate_org(500, backend, seed=1)
+    stats = run_mix(org, 300, seed=2)
+    assert set(stats) == set(DEFAULT_MIX)
+    assert sum(entry["count"] for entry in stats.values()) == 300
+    for entry in stats.values():
+        assert entry["ok"] <= entry["count"]
+        assert entry["p50_us"] <= entry["p99_us"]
+
+
+def test_report_is_json_ready():
+    report = run_benchmark(300, 100, backend="array")
+    assert report["meta"]["seats"] == 300
+    assert report["commands"]["hire_employee"]["count"] > 0
+
+
+@pytest.mark.parametrize("backend", ["object", "array"])
+def test_churn_leaves_no_empty_vacancies(backend):
+    report = run_churn(1000, 3, 500, backend, seed=3)
+    assert [row["operations"] for row in report["windows"]] == [500, 1000, 1500]
+    assert all(row["empty_vacancies"] == 0 for row in report["windows"])
+
+
+@pytest.mark.parametrize("fsync", [False, True])
+def test_thread_benchmark_runs_both_lockings(fsync):
+    report = run_thread_benchmark(500, 200, [1, 4], backend="array", fsync=fsync, seed=5)
+    assert [row["threads"] for row in report["rows"]] == [1, 4]
+    for row in report["rows"]:
+        for locking in ("global", "branch"):
+            assert row[locking]["operations"] == 200
+            assert 0 < row[locking]["ok"] <= 200
+
+
+def test_thread_benchmark_writes_charts_slowly():
+    report = run_thread_benchmark(500, 100, [2], backend="object", seed=5, write_delay=0.0001)
+    assert report["meta"]["write_delay_us"] == pytest.approx(100)
+    assert all(report["rows"][0][locking]["ok"] > 0 for locking in ("global", "branch"))
+
+
+@pytest.mark.parametrize("unix", [False, True])
+def test_server_load_gets_every_response(unix):
+    report = run_server_benchmark(500, 3, 300, window=8, backend="array", unix=unix, seed=6)
+    assert report["operations"] == 300
+    assert sum(report["statuses"].values()) == 300
+    assert report["statuses"]["ok"] > 0
+    assert report["p50_us"] <= report["p99_us"]
+
+
+def test_tenant_benchmark_runs_every_batch():
+    report = run_tenant_benchmark(3, 300, 200, [1, 2], batch=16, backend="array", seed=7)
+    assert [row["workers"] for row in report["rows"]] == [1, 2]
+    # The same batches go to the same tenants whatever the number of workers
+    assert report["rows"][0]["statuses"] == report["rows"][1]["statuses"]
+    for row in report["rows"]:
+        assert row["operations"] == 600
+        assert row["statuses"]["ok"] > 300
+
+
+def test_sqlite_benchmark_compares_every_batch_size(tmp_path):
+    report = run_sqlite_benchmark(500, 200, [1, 16], seed=3, directory=str(tmp_path))
+    assert [row["storage"] for row in report["rows"]] == ["memory", "sqlite batch 1", "sqlite batch 16"]
+    # The same mix runs against the same chart, so every storage ends up with the same outcomes
+    outcomes = [{command: stats["ok"] for command, stats in row["commands"].items()} for row in report["rows"]]
+    assert outcomes[0] == outcomes[1] == outcomes[2]
+    assert report["rows"][0]["db_bytes"] is None
+    assert all(row["db_bytes"] > 0 for row in report["rows"][1:])
@@ -0,0 +1,196 @@
+import random
+import threading
+import pytest
+from concurrency import ConcurrentArrayOrganizationManager, ConcurrentOrganizationManager, SharedLock
+from employee import RoleLadder
+from journal import Journal
+from organization_manager import OrganizationManager
+from results import Status
+from sinks import BufferedSink, SilentSink
+from helpers import CHANGES, random_command, chart
+
+# ---------- CONCURRENCY TESTS ----------
+
+BACKENDS = [ConcurrentOrganizationManager, ConcurrentArrayOrganizationManager]
+LADDER = RoleLadder.parse("CEO:6,VP:6,Lead:8,Engineer:0")
+THREADS = 4
+CHURN = {**CHANGES, "hire_employee": 7, "promote_employee": 0, "count_employees": 1, "display_organization": 1}
+
+
+def build(backend, journal=None):
+    org = backend(sink=SilentSink(), ladder=LADDER)
+    if journal is not None:
+        journal.recover(org)
+    org.initialize_president("P")
+    for branch in range(THREADS):
+        org.hire_employee("P", f"V{branch}")
+        for lead in range(3):
+            org.hire_employee(f"V{branch}", f"L{branch}_{lead}")
+    return org
+
+
+def manager_of(org, name):
+    # name itself if it can hire, otherwise its boss, so most hires pass.
+    spot = org._find_employee(name)
+    if spot is None or spot.role_code < org.ladder.bottom or spot.boss is None:
+        return name
+    return getattr(spot.boss, "name", None) or name
+
+
+def churn(org, thread, steps, errors):
+    # Mostly changes in the thread's own branch, now and then one across branches or on the whole organization.
+    rng = random.Random(thread)
+    try:
+        for step in range(steps):
+            names = sorted(org.employee_lookup)
+            home = [name for name in names if name[1:].startswith(str(thread))] or names
+            pick = lambda: rng.choice(home if rng.random() < 0.9 else names)
+            method, *args = random_command(org, rng, f"{thread}_{step}", CHURN, pick)
+            if method == "hire_employee":
+                args[0] = manager_of(org, args[0])
+            elif method == "transfer_employee":
+                args[0] = rng.choice(("P", args[0]))
+            getattr(org, method)(*args)
+    except Exception as error:
+        errors.append(error)
+        raise
+
+
+def run_threads(target, *args):
+    errors = []
+    threads = [threading.Thread(target=target, args=(*args, thread, errors)) for thread in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=120)
+        assert not thread.is_alive(), "threads deadlocked"
+    assert errors == []
+
+
+def tree_names(org):
+    # Employee names reachable from the President, with the number of spots.
+    roles, report_counts, names = org._export_preorder()
+    return names, len(roles)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_threads_keep_the_organization_consistent(backend):
+    org = build(backend)
+    run_threads(lambda thread, errors: churn(org, thread, 1500, errors))
+    names, spots = tree_names(org)
+    assert sorted(names) == sorted(org.employee_lookup)
+    assert len(names) == len(set(names))
+    # The President's counts were kept by every thread at once
+    org.sink = BufferedSink()
+    org.count_employees("P")
+    below = int(org.sink.messages()[-1].split(" has ")[1].split()[0])
+    assert below == len(names) - 1
+    view = org.view(BufferedSink())
+    view.display_organization()
+    assert "".join(view.sink.text) == chart(org)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_journal_replays_to_the_same_organization(tmp_path, backend):
+    journal = Journal(str(tmp_path), compact_every=500)
+    org = build(backend, journal)
+    run_threads(lambda thread, errors: churn(org, thread, 600, errors))
+    journal.close()
+    again = OrganizationManager(sink=SilentSink(), ladder=LADDER)
+    Journal(str(tmp_path)).recover(again)
+    assert chart(again) == chart(org)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_fsync_waits_until_the_change_lets_go_of_its_locks(tmp_path, backend):
+    journal = Journal(str(tmp_path), batch_size=1, compact_every=0)
+    org = build(backend, journal)
+    held = []
+    fsync = journal.fsync
+
+    def recording_fsync():
+        held.append((org._structure.shared, org._structure.exclusive))
+        fsync()
+
+    journal.fsync = recording_fsync
+    assert org.hire_employee("L0_0", "E1").ok
+    assert org.employee_quits("E1").ok
+    assert held == [(0, False), (0, False)]
+    assert journal.synced == journal.flushed
+    journal.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_undo_all_restores_the_start(backend):
+    org = build(backend)
+    org.clear_history()
+    start = chart(org)
+    run_threads(lambda thread, errors: churn(org, thread, 100, errors))
+    while org.undo().ok:
+        pass
+    assert chart(org) == start
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_one_name_is_hired_once(backend):
+    org = build(backend)
+    for attempt in range(50):
+        barrier = threading.Barrier(THREADS)
+        results = []
+
+        def hire(thread, errors):
+            barrier.wait()
+            results.append(org.hire_employee(f"L{thread}_0", f"Same{attempt}").status)
+
+        run_threads(hire)
+        assert results.count(Status.OK) == 1
+        assert results.count(Status.DUPLICATE_NAME) == THREADS - 1
+        org.employee_quits(f"Same{attempt}")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_transfers_both_ways_do_not_deadlock(backend):
+    org = build(backend)
+    for lead in range(3):
+        for worker in range(4):
+            org.hire_employee(f"L0_{lead}", f"W0_{lead}_{worker}")
+            org.hire_employee(f"L1_{lead}", f"W1_{lead}_{worker}")
+
+    def shuffle(thread, errors):
+        # Even threads move Engineers from branch 0 to branch 1, odd ones back
+        rng = random.Random(thread)
+        try:
+            for _ in range(400):
+                names = [name for name in org.employee_lookup if name.startswith("W")]
+                org.transfer_employee("P", rng.choice(names), f"L{1 - thread % 2}_{rng.randrange(3)}")
+        except Exception as error:
+            errors.append(error)
+
+    run_threads(shuffle)
+    names, _ = tree_names(org)
+    assert sum(name.startswith("W") for name in names) == 24
+
+
+def test_transactions_are_refused():
+    org = build(ConcurrentOrganizationManager)
+    result = org.begin()
+    assert result.status == Status.NOT_PERMITTED
+    assert not org.in_transaction
+    assert org.hire_employee("V0", "L0_3").ok
+    assert org.history
+
+
+def test_shared_lock_lets_a_waiting_writer_in_first():
+    lock = SharedLock()
+    lock.acquire_shared()
+    order = []
+    writer = threading.Thread(target=lambda: (lock.acquire_exclusive(), order.append("writer"), lock.release_exclusive()))
+    writer.start()
+    while not lock.waiting:
+        pass
+    reader = threading.Thread(target=lambda: (lock.acquire_shared(), order.append("reader"), lock.release_shared()))
+    reader.start()
+    lock.release_shared()
+    writer.join(timeout=10)
+    reader.join(timeout=10)
+    assert order == ["writer", "reader"]
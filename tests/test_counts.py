@@ -0,0 +1,107 @@
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from main import main
+from results import Status
+from sinks import BufferedSink
+from helpers import DEEP, random_commands, walk
+
+# ---------- SUBTREE COUNT TESTS ----------
+
+def assert_counts_match_tree(org):
+    for spot in [org.president, *walk(org.president)]:
+        expected = [0] * (len(org.ladder.roles) + 1)
+        for below in walk(spot):
+            expected[-1 if below.is_vacant() else below.role_code] += 1
+        assert org._counts_below(spot) == expected
+        levels = []
+        level = list(spot.reports)
+        while level:
+            levels.append(len(level))
+            level = [report for boss in level for report in boss.reports]
+        assert org._levels_below(spot) == levels
+
+
+def build_small(org):
+    org.initialize_president("Nelson")
+    org.hire_employee("Nelson", "VP1")
+    org.hire_employee("Nelson", "VP2")
+    org.hire_employee("VP1", "S1")
+    org.hire_employee("VP1", "S2")
+    for worker in ("W1", "W2", "W3"):
+        org.hire_employee("S1", worker)
+    org.hire_employee("S2", "W4")
+    org.fire_employee("VP1", "S1")
+
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_queries(backend):
+    org = backend(sink=BufferedSink())
+    build_small(org)
+    assert org.subtree_role_counts("VP1") == {"President": 0, "Vice President": 0, "Supervisor": 1, "Worker": 4}
+    assert org.subtree_headcount("VP1") == 5
+    assert org.subtree_vacancies("VP1") == 1
+    assert org.subtree_headcount("Nelson") == 7
+    assert org.subtree_headcount("W1") == 0
+    assert org.subtree_headcount("Ghost") is None
+    assert org.subtree_depth("Nelson") == 3
+    assert org.subtree_depth("VP1") == 2
+    assert org.subtree_depth("W1") == 0
+
+    org.sink.clear()
+    assert org.count_employees("VP1").ok
+    assert org.count_employees("W4").ok
+    assert org.count_employees("Ghost").status == Status.NOT_FOUND
+    assert org.sink.messages() == [
+        "VP1 has 5 employees below (Supervisor: 1, Worker: 4) and 1 vacancies, 2 levels deep.",
+        "W4 has 0 employees below (none) and 0 vacancies, 0 levels deep.",
+        "Error: Employee name Ghost does not exist.",
+    ]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_counts_follow_every_change(seed):
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    random_commands(org, seed, 300)
+    assert_counts_match_tree(org)
+
+
+def test_counts_on_custom_ladder():
+    org = OrganizationManager(sink=BufferedSink(), ladder=DEEP)
+    org.initialize_president("P")
+    random_commands(org, 11, 400)
+    assert_counts_match_tree(org)
+
+
+def test_counts_survive_snapshot(tmp_path):
+    path = str(tmp_path / "org.snap")
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    random_commands(org, 5, 300)
+    org.save(path)
+    again = OrganizationManager(sink=BufferedSink())
+    again.load(path)
+    assert_counts_match_tree(again)
+    random_commands(again, 6, 100)
+    assert_counts_match_tree(again)
+
+
+def test_array_backend_agrees():
+    orgs = [OrganizationManager(sink=BufferedSink()), ArrayOrganizationManager(sink=BufferedSink())]
+    for org in orgs:
+        org.initialize_president("P")
+        random_commands(org, 9, 300)
+    for name in orgs[0].employee_lookup:
+        assert orgs[0].subtree_role_counts(name) == orgs[1].subtree_role_counts(name)
+        assert orgs[0].subtree_vacancies(name) == orgs[1].subtree_vacancies(name)
+        assert orgs[0].subtree_depth(name) == orgs[1].subtree_depth(name)
+
+
+def test_main_count_command(tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    script.write_text("Nelson\nHIRE Nelson VP1\nHIRE VP1 S1\nHIRE S1 W1\nCOUNT Nelson\nCOUNT\n")
+    main(["--script", str(script)])
+    out = capsys.readouterr().out.splitlines()
+    assert "Nelson has 3 employees below (Vice President: 1, Supervisor: 1, Worker: 1) and 0 vacancies, 3 levels deep." in out
+    assert "Syntax should be: COUNT <Name>" in out
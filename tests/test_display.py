@@ -1,5 +1,12 @@
+import sys
 import pytest
+import chart_reports
 from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from employee import Employee
+from main import run_command
+from results import Status
+from sinks import BufferedSink, PageStopped, PagingSink
 
 def test_display_with_president_prints_header(capsys):
     org = OrganizationManager()
@@ -39,4 +46,101 @@ def test_display_with_multiple_levels(capsys):
     org.display_organization()
     out = capsys.readouterr().out
     assert out.splitlines() == expected_lines
-    
\ No newline at end of file
+    
+def build_sample_org(backend=OrganizationManager):
+    org = backend()
+    org.initialize_president("Nelson")
+    org.hire_employee("Nelson", "VP1")
+    org.hire_employee("Nelson", "VP2")
+    org.hire_employee("VP1", "S1")
+    org.hire_employee("VP2", "S2")
+    org.hire_employee("S1", "W1")
+    org.hire_employee("S1", "W2")
+    org.fire_employee("VP1", "S1")
+    return org
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_display_subtree_and_depth(capsys, backend):
+    org = build_sample_org(backend)
+    capsys.readouterr()
+
+    result = org.display_organization("VP1")
+    assert result.message == "Displayed organization under VP1."
+    assert capsys.readouterr().out.splitlines() == [
+        "Vice President: VP1",
+        "\tVACANCY: Supervisor",
+        "\t\tWorker: W1",
+        "\t\tWorker: W2",
+    ]
+
+    org.display_organization("Nelson", 1)
+    assert capsys.readouterr().out.splitlines() == [
+        "President: Nelson",
+        "\tVice President: VP1",
+        "\tVice President: VP2",
+    ]
+
+    org.display_organization("W1", 0)
+    assert capsys.readouterr().out.splitlines() == ["Worker: W1"]
+
+def test_display_unknown_root(capsys):
+    org = build_sample_org()
+    capsys.readouterr()
+    result = org.display_organization("Ghost")
+    assert result.status == Status.NOT_FOUND
+    assert capsys.readouterr().out == "Error: Employee name Ghost does not exist.\n"
+
+def test_display_writes_in_chunks(monkeypatch):
+    monkeypatch.setattr(chart_reports, "DISPLAY_CHUNK_LINES", 3)
+    sink = BufferedSink()
+    org = build_sample_org()
+    org.sink = sink
+    org.display_organization("Nelson", 3)
+    assert [text.count("\n") for text in sink.text] == [3, 3, 1]
+
+def test_display_lines_do_not_recurse():
+    # Builds a chain far deeper than the recursion limit straight out of spot objects
+    org = OrganizationManager()
+    org.initialize_president("P")
+    boss = org.president
+    for level in range(sys.getrecursionlimit() + 100):
+        spot = Employee(f"E{level}", "Supervisor", boss)
+        boss.reports.append(spot)
+        boss = spot
+    lines = list(org._display_lines(org.president))
+    assert len(lines) == sys.getrecursionlimit() + 101
+    assert lines[-1] == "\t" * (sys.getrecursionlimit() + 100) + f"Supervisor: E{sys.getrecursionlimit() + 99}\n"
+
+def test_display_command_arguments(capsys):
+    org = build_sample_org()
+    capsys.readouterr()
+    run_command(org, ["DISPLAY", "VP2", "1"])
+    assert capsys.readouterr().out.splitlines() == ["Vice President: VP2", "\tSupervisor: S2"]
+    assert run_command(org, ["DISPLAY", "VP2", "deep"]) is None
+    assert "Depth must be a whole number" in capsys.readouterr().out
+
+def test_paging_sink_stops_when_asked():
+    inner = BufferedSink()
+    answers = iter(["", "q"])
+    sink = PagingSink(inner, 2, prompt=lambda text: next(answers))
+    org = build_sample_org()
+    org.sink = sink
+    with pytest.raises(PageStopped):
+        org.display_organization()
+    assert "".join(inner.text).count("\n") == 4
+
+def test_redisplay_only_renders_changed_path():
+    org = build_sample_org()
+    org.sink = BufferedSink()
+    org.display_organization()
+    vp2_text = org._rendered[org.employee_lookup["VP2"]][2]
+
+    org.hire_employee("W1", "Nobody")
+    org.hire_employee("VP1", "S3")
+    assert org.employee_lookup["VP1"] not in org._rendered
+    assert org.president not in org._rendered
+    assert org._rendered[org.employee_lookup["VP2"]][2] is vp2_text
+
+    org.sink.clear()
+    org.display_organization()
+    assert "".join(org.sink.text) == "".join(org._display_lines(org.president))
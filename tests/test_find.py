@@ -0,0 +1,111 @@
+import random
+import name_index
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from name_index import NameIndex, edit_distance
+from main import completions, main
+from results import Status
+from sinks import BufferedSink
+
+# ---------- NAME INDEX AND FIND TESTS ----------
+
+def test_sorted_view_follows_inserts_and_removals(monkeypatch):
+    monkeypatch.setattr(name_index, "BUCKET_SIZE", 4)
+    rng = random.Random(1)
+    index = NameIndex((f"N{number}", number) for number in range(20))
+    assert index.with_prefix("N1") == sorted(f"N{number}" for number in range(20) if str(number).startswith("1"))
+    expected = set(index)
+    for step in range(2000):
+        name = f"{rng.choice('ABCN')}{rng.randrange(60)}"
+        if name in index:
+            del index[name]
+            expected.discard(name)
+        else:
+            index[name] = step
+            expected.add(name)
+        if step % 100 == 0:
+            assert [name for bucket in index.buckets for name in bucket] == sorted(expected)
+            assert all(len(bucket) <= 4 for bucket in index.buckets)
+    assert index.with_prefix("") == sorted(expected)
+    assert index.with_prefix("B", limit=3) == sorted(name for name in expected if name.startswith("B"))[:3]
+    assert index.pop("nobody", None) is None
+
+
+def test_suggestions():
+    index = NameIndex((name, None) for name in ("Nelson", "Nelly", "Neil", "Wanda", "Walter", "Zed"))
+    assert index.suggest("Nelsn") == ["Nelson"]
+    assert index.suggest("Nelosn") == ["Nelson"]
+    assert index.suggest("nelson") == ["Nelson"]
+    assert index.suggest("Wlater") == ["Walter"]
+    assert index.suggest("Zzzzzz") == []
+    assert NameIndex().suggest("Nelson") == []
+    assert edit_distance("kitten", "sitting", 5) == 3
+    assert edit_distance("kitten", "sitting", 1) == 2
+
+
+def test_missing_names_get_suggestions():
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("Nelson")
+    org.hire_employee("Nelson", "Wanda")
+    org.sink.clear()
+    assert org.hire_employee("Nelsn", "X").status == Status.NOT_FOUND
+    assert org.fire_employee("Nelson", "Wnada").status == Status.NOT_FOUND
+    org.employee_quits("Ghost")
+    assert org.sink.messages() == [
+        "Error: Hiring manager Nelsn does not exist. Did you mean Nelson?",
+        "Error: Employee name Wnada does not exist. Did you mean Wanda?",
+        "Error: Employee name Ghost does not exist.",
+    ]
+
+
+def test_all_names_is_a_view_of_the_index():
+    for backend in (OrganizationManager, ArrayOrganizationManager):
+        org = backend(sink=BufferedSink())
+        org.initialize_president("P")
+        org.hire_employee("P", "V1")
+        names = org.all_names
+        org.hire_employee("V1", "S1")
+        org.employee_quits("V1")
+        assert names == {"P", "S1"}
+        assert org.employee_lookup.with_prefix("") == ["P", "S1"]
+
+
+def test_find_employees():
+    for backend in (OrganizationManager, ArrayOrganizationManager):
+        org = backend(sink=BufferedSink())
+        org.initialize_president("Nelson")
+        org.hire_employee("Nelson", "Ned")
+        org.hire_employee("Ned", "Nora")
+        org.hire_employee("Ned", "Wanda")
+        org.sink.clear()
+        assert org.find_employees("N").message == "Found 3 names starting with N."
+        assert org.find_employees("Ne", limit=1).message == "Showing the first 1 names starting with Ne."
+        assert org.find_employees("X").message == "Found 0 names starting with X."
+        assert "".join(org.sink.text) == "Vice President: Ned\nPresident: Nelson\nSupervisor: Nora\nVice President: Ned\n"
+        assert len(org.sink.messages()) == 3
+
+
+def test_completions():
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("Nelson")
+    org.hire_employee("Nelson", "Ned")
+    assert completions(org, "", "") == [command + " " for command in ("HIRE", "FIRE", "QUIT", "LAYOFF", "TRANSFER",
+                                        "PROMOTE", "DISPLAY", "COUNT", "FIND", "UNDO", "REDO", "BEGIN", "COMMIT",
+                                        "ROLLBACK", "SAVE", "STATS", "EXIT")]
+    assert completions(org, "pr", "pr") == ["PROMOTE "]
+    assert completions(org, "HIRE Ne", "Ne") == ["Ned ", "Nelson "]
+    assert completions(org, "HIRE Nelson ", "") == ["Ned ", "Nelson "]
+
+
+def test_main_find_command(tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    script.write_text("Nelson\nHIRE Nelson Ned\nFIND Ne\nFIND\n")
+    main(["--script", str(script)])
+    out = capsys.readouterr().out.splitlines()
+    assert out[-5:] == [
+        "Vice President: Ned",
+        "President: Nelson",
+        "Found 2 names starting with Ne.",
+        "Incorrect number of arguments for command FIND",
+        "Syntax should be: FIND <Prefix>",
+    ]
@@ -0,0 +1,116 @@
+import os
+import pytest
+import journal as journal_module
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from journal import Journal, read_journal
+from main import main
+from sinks import BufferedSink
+from helpers import random_commands, chart
+
+# ---------- JOURNAL TESTS ----------
+
+
+def recovered(directory, backend=OrganizationManager, **options):
+    org = backend(sink=BufferedSink())
+    journal = Journal(str(directory), **options)
+    journal.recover(org)
+    return org, journal
+
+
+def test_only_successful_changes_are_journaled(tmp_path):
+    org, journal = recovered(tmp_path)
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("Ghost", "V2")
+    org.employee_quits("P")
+    org.display_organization()
+    journal.close()
+    assert read_journal(str(tmp_path / "journal-00000001.log")) == [
+        ["initialize_president", "P"],
+        ["hire_employee", "P", "V1"],
+    ]
+
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_recovery_replays_journal(tmp_path, backend):
+    org, journal = recovered(tmp_path, backend, compact_every=0)
+    org.initialize_president("P")
+    random_commands(org, 3, 300)
+    expected = chart(org)
+    journal.close()
+
+    again, journal = recovered(tmp_path, backend)
+    assert chart(again) == expected
+    assert again.all_names == org.all_names
+    # Recovery stays quiet and later changes go to a fresh segment
+    assert again.sink.messages() == []
+    again.hire_employee("P", "Late")
+    journal.close()
+    assert os.path.exists(tmp_path / "journal-00000002.log")
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    org, journal = recovered(tmp_path)
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    journal.close()
+    with open(tmp_path / "journal-00000001.log", "a", encoding="utf-8") as file:
+        file.write('["hire_employee", "P", "V')
+
+    again, journal = recovered(tmp_path)
+    journal.close()
+    assert again.all_names == {"P", "V1"}
+
+
+def test_fsync_is_shared_by_a_batch(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(journal_module.os, "fsync", lambda fd: synced.append(fd))
+    org, journal = recovered(tmp_path, batch_size=4)
+    org.initialize_president("P")
+    for name in ("V1", "V2"):
+        org.hire_employee("P", name)
+    assert synced == []
+    org.hire_employee("V1", "S1")
+    assert len(synced) == 1
+    org.hire_employee("V1", "S2")
+    journal.close()
+    assert len(synced) == 2
+
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_compaction_folds_segments_into_snapshot(tmp_path, backend):
+    org, journal = recovered(tmp_path, backend, compact_every=50)
+    org.initialize_president("P")
+    random_commands(org, 7, 400)
+    expected = chart(org)
+    journal.close()
+
+    files = sorted(os.listdir(tmp_path))
+    snapshots = [entry for entry in files if entry.startswith("snapshot-")]
+    assert len(snapshots) == 1
+    covered = int(snapshots[0][len("snapshot-"):-len(".snap")])
+    assert all(int(entry[len("journal-"):-len(".log")]) > covered for entry in files if entry.startswith("journal-"))
+
+    again, journal = recovered(tmp_path, backend)
+    journal.close()
+    assert chart(again) == expected
+
+
+def test_main_journal_survives_restart(tmp_path, capsys):
+    directory = tmp_path / "data"
+    first = tmp_path / "first.txt"
+    first.write_text("Nelson\nHIRE Nelson VP1\nHIRE VP1 S1\n")
+    main(["--journal", str(directory), "--script", str(first)])
+
+    second = tmp_path / "second.txt"
+    second.write_text("HIRE S1 W1\nDISPLAY\n")
+    capsys.readouterr()
+    main(["--journal", str(directory), "--script", str(second)])
+    assert capsys.readouterr().out.splitlines() == [
+        "Successfully hired W1 under S1.",
+        "President: Nelson",
+        "\tVice President: VP1",
+        "\t\tSupervisor: S1",
+        "\t\t\tWorker: W1",
+    ]
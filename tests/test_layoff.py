@@ -1,5 +1,10 @@
 import pytest
 from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from employee import RoleLadder
+from sqlite_organization import SqliteOrganizationManager
+from results import Status
+from sinks import BufferedSink
 
 # ---------- LAYOFF TESTS ----------
 
@@ -128,3 +133,70 @@ def test_layoff__with_opening_succeed_diff_hierarchy(capsys):
     assert worker5 not in super1.reports
 
 
+
+
+
+def test_layoff_prefers_closest_opening_at_any_depth():
+    # A promoted VP sits one level deeper than its role, so its Supervisor is three links from Supervisor1
+    # while Supervisor3 under the other VP is four
+    org = OrganizationManager()
+    org.initialize_president("President1")
+    org.hire_employee("President1", "VP1")
+    org.hire_employee("President1", "VP2")
+    org.hire_employee("VP1", "Supervisor1")
+    for worker in range(1, 6):
+        org.hire_employee("Supervisor1", f"Worker{worker}")
+    org.hire_employee("VP2", "Supervisor2")
+    org.hire_employee("VP2", "Supervisor3")
+    org.promote_employee("VP1", "Supervisor2")
+    org.hire_employee("Supervisor2", "Supervisor4")
+
+    org.layoff_employee("Supervisor1", "Worker5")
+    assert org.employee_lookup["Worker5"].boss.name == "Supervisor4"
+
+
+def test_worker_fills_vacancy_with_reports():
+    # W1 is promoted to Supervisor and keeps T's Vacancy, which still has X below it. A Worker laid off, or
+    # transferred, into that Vacancy takes X on although Workers start out without room for reports.
+    setup = ["hire_employee P V1", "hire_employee P V2", "hire_employee V1 S1", "hire_employee S1 W1",
+             "hire_employee V2 S2", "promote_employee V1 S2", "hire_employee S2 T", "hire_employee T X",
+             "employee_quits S2", "promote_employee V1 W1", "employee_quits T"]
+    moves = [["hire_employee W1 A", "hire_employee W1 B", "hire_employee W1 C", "hire_employee W1 D", "layoff_employee V1 A"],
+             ["hire_employee S1 Y", "transfer_employee V1 Y W1"]]
+    for steps in moves:
+        charts = []
+        for backend in (OrganizationManager, ArrayOrganizationManager):
+            sink = BufferedSink()
+            org = backend(sink=sink)
+            org.initialize_president("P")
+            for line in setup + steps:
+                if line is steps[-1]:
+                    sink.clear()
+                    org.display_organization()
+                    before = "".join(sink.text)
+                method, *args = line.split()
+                assert getattr(org, method)(*args).status == Status.OK, line
+            mover = steps[-1].split()[-1] if steps[-1].startswith("layoff") else "Y"
+            assert org.count_employees(mover).message.startswith(f"{mover} has 1 ")
+            sink.clear()
+            org.display_organization()
+            after = "".join(sink.text)
+            org.undo()
+            sink.clear()
+            org.display_organization()
+            assert "".join(sink.text) == before
+            charts.append(after)
+        assert charts[0] == charts[1]
+
+
+def test_layoff_finds_opening_lifted_by_promotion():
+    # Promoting C3 lifts D3 to two links below the President, so D3 is six links from E2 and D1 seven
+    ladder = RoleLadder.parse("A:3,B:2,C:2,D:1,E:0")
+    for backend in (OrganizationManager, ArrayOrganizationManager, SqliteOrganizationManager):
+        org = backend(sink=BufferedSink(), ladder=ladder)
+        org.initialize_president("P")
+        for boss, name in [("P", "B1"), ("P", "B2"), ("B1", "C1"), ("C1", "D1"), ("B2", "C2"), ("C2", "D2"),
+                           ("D2", "E2"), ("B2", "C3"), ("C3", "D3")]:
+            org.hire_employee(boss, name)
+        org.promote_employee("P", "C3")
+        assert org.layoff_employee("B2", "E2").message == "Successfully placed E2 under D3."
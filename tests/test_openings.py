@@ -0,0 +1,127 @@
+import random
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from employee import RoleLadder, Vacancy, SUPERVISOR
+from sinks import SilentSink
+from helpers import random_command, walk
+
+# ---------- OPENINGS INDEX TESTS ----------
+
+PROMOTIONS = {"hire_employee": 2, "promote_employee": 1, "employee_quits": 1}
+
+
+def expected_openings(org):
+    expected = {}
+    for spot in [org.president, *walk(org.president)]:
+        if isinstance(spot, Vacancy):
+            continue
+        if len(spot.reports) < spot.max_reports or any(isinstance(r, Vacancy) for r in spot.reports):
+            expected.setdefault(spot.role_code, []).append(spot)
+    return expected
+
+
+def assert_index_matches_tree(org):
+    # Same managers, filed in report order under their current labels
+    expected = expected_openings(org)
+    assert {role_code: org.openings.of_role(role_code) for role_code in expected} == expected
+    assert len(org.openings) == sum(len(group) for group in expected.values())
+    for spot, key in org.openings.keys.items():
+        assert key == (spot.role_code, spot.lo)
+    for spot in walk(org.president):
+        assert spot.vacancies == sum(isinstance(r, Vacancy) for r in spot.reports)
+        for report in spot.reports:
+            assert report.boss is spot
+    # Every branch counts exactly the openings below it, with and without one report's branch left out
+    for spot in [org.president, *walk(org.president)]:
+        below = set(walk(spot))
+        for role_code, group in expected.items():
+            assert org.openings.count(role_code, spot.lo, spot.hi) == sum(opening in below for opening in group)
+            if spot.reports:
+                skipped = next(iter(spot.reports))
+                outside = below - {skipped, *walk(skipped)}
+                assert org.openings.count(role_code, spot.lo, spot.hi, skipped.lo, skipped.hi) == sum(opening in outside for opening in group)
+
+
+def test_full_supervisor_leaves_index():
+    org = OrganizationManager(sink=SilentSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    for i in range(5):
+        org.hire_employee("S1", f"W{i}")
+    s1 = org.employee_lookup["S1"]
+    assert s1 not in org.openings
+
+    org.employee_quits("W0")
+    assert s1 in org.openings
+    assert s1 in org.openings.of_role(SUPERVISOR)
+    assert_index_matches_tree(org)
+
+
+def test_vacancy_reports_point_at_new_holder():
+    org = OrganizationManager(sink=SilentSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    org.hire_employee("V1", "S1")
+    org.fire_employee("P", "V1")
+    org.hire_employee("P", "V3")
+    assert org.employee_lookup["S1"].boss is org.employee_lookup["V3"]
+    assert_index_matches_tree(org)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_index_matches_tree_after_random_commands(seed):
+    rng = random.Random(seed)
+    org = OrganizationManager(sink=SilentSink())
+    org.initialize_president("P")
+    for step in range(300):
+        method, *args = random_command(org, rng, step)
+        getattr(org, method)(*args)
+        assert_index_matches_tree(org)
+
+
+def chain(spot):
+    # spot and every spot above it, nearest first.
+    while spot is not None:
+        yield spot
+        spot = spot.boss
+
+
+def nearest_opening_distance(org, employee):
+    # Fewest links from employee to a manager one role up with an opening, outside employee's branch.
+    above = {spot: up for up, spot in enumerate(chain(employee))}
+    distances = []
+    for spot in walk(org.president):
+        if isinstance(spot, Vacancy) or spot.role_code != employee.role_code - 1 or spot not in org.openings:
+            continue
+        down, boss = next((down, boss) for down, boss in enumerate(chain(spot)) if boss in above)
+        if boss is not employee:
+            distances.append(above[boss] + down)
+    return min(distances, default=None)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_found_opening_is_nearest_after_promotions(seed):
+    # A PROMOTE carries reports up a level, so openings sit higher than their role code and can be the nearest ones
+    rng = random.Random(seed)
+    ladder = RoleLadder.parse("A:3,B:2,C:2,D:1,E:0")
+    orgs = [OrganizationManager(sink=SilentSink(), ladder=ladder), ArrayOrganizationManager(sink=SilentSink(), ladder=ladder)]
+    for org in orgs:
+        org.initialize_president("P")
+    for step in range(200):
+        command = random_command(orgs[0], rng, step, PROMOTIONS)
+        for org in orgs:
+            getattr(org, command[0])(*command[1:])
+        for employee in walk(orgs[0].president):
+            if isinstance(employee, Vacancy) or employee.role_code < 2:
+                continue
+            _, manager = orgs[0]._find_opening(employee)
+            expected = nearest_opening_distance(orgs[0], employee)
+            if expected is None:
+                assert manager is None
+                continue
+            assert sum(1 for _ in chain(employee)) + sum(1 for _ in chain(manager)) - 2 * len(set(chain(employee)) & set(chain(manager))) == expected
+            _, same = orgs[1]._find_opening(orgs[1]._find_employee(employee.name))
+            assert same.name == manager.name
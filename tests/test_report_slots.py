@@ -0,0 +1,72 @@
+import pytest
+from employee import Employee, ReportSlots
+from organization_manager import OrganizationManager
+from sinks import BufferedSink
+
+# ---------- REPORT SLOT TESTS ----------
+
+def workers(count):
+    return [Employee(f"W{index}", "Worker") for index in range(count)]
+
+
+def test_removal_leaves_the_others_in_their_slots():
+    reports = ReportSlots(5)
+    w0, w1, w2 = workers(3)
+    for worker in (w0, w1, w2):
+        reports.append(worker)
+    reports.remove(w1)
+    assert list(reports) == [w0, w2]
+    assert len(reports) == 2
+    assert (w0.slot, w2.slot) == (0, 2)
+    assert reports[1] is None
+    assert w1 not in reports and w2 in reports
+    assert reports.index(w2) == 2
+    assert reports.before(w2) is w0
+    with pytest.raises(ValueError):
+        reports.remove(w1)
+
+
+def test_append_packs_once_the_end_is_reached():
+    reports = ReportSlots(3)
+    w0, w1, w2, w3 = workers(4)
+    for worker in (w0, w1, w2):
+        reports.append(worker)
+    reports.remove(w0)
+    reports.append(w3)
+    assert list(reports) == [w1, w2, w3]
+    assert [worker.slot for worker in reports] == [0, 1, 2]
+    assert list(reversed(reports)) == [w3, w2, w1]
+    assert reports.last() is w3
+
+
+def test_replacing_keeps_the_slot():
+    reports = ReportSlots(2)
+    w0, w1, w2 = workers(3)
+    reports.append(w0)
+    reports.append(w1)
+    reports[w0.slot] = w2
+    assert list(reports) == [w2, w1]
+    assert w2.slot == 0 and w0 not in reports
+
+
+def test_full_slots_grow_past_capacity():
+    reports = ReportSlots(1)
+    for worker in workers(3):
+        reports.append(worker)
+    assert len(reports) == 3
+    assert reports == [worker for worker in reports]
+
+
+def test_chart_order_survives_removals():
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    for name in ("W1", "W2", "W3", "W4", "W5"):
+        org.hire_employee("S1", name)
+    org.employee_quits("W2")
+    org.fire_employee("S1", "W4")
+    org.hire_employee("S1", "W6")
+    supervisor = org.employee_lookup["S1"]
+    assert [worker.name for worker in supervisor.reports] == ["W1", "W3", "W5", "W6"]
+    assert len(supervisor.reports.slots) == supervisor.max_reports
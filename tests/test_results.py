@@ -0,0 +1,61 @@
+import io
+import pytest
+from organization_manager import OrganizationManager
+from results import Status
+from sinks import BufferedSink, FileSink, SilentSink
+
+# ---------- RESULT / SINK TESTS ----------
+
+def build_org(sink=None):
+    org = OrganizationManager(sink=sink)
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    return org
+
+
+def test_hire_returns_ok_result_with_names(capsys):
+    org = build_org()
+    result = org.hire_employee("S1", "W2")
+    assert result.ok
+    assert result.status == Status.OK
+    assert result.names == ("W2", "S1")
+    assert result.message == "Successfully hired W2 under S1."
+
+
+def test_errors_carry_reason_codes(capsys):
+    org = build_org()
+    assert org.hire_employee("Ghost", "X").status == Status.NOT_FOUND
+    assert org.hire_employee("S1", "W1").status == Status.DUPLICATE_NAME
+    assert org.hire_employee("W1", "X").status == Status.NOT_PERMITTED
+    assert org.fire_employee("P", "P").status == Status.PROTECTED
+    assert org.transfer_employee("P", "W1", "V1").status == Status.ROLE_MISMATCH
+
+
+def test_silent_sink_suppresses_all_output(capsys):
+    org = build_org(SilentSink())
+    result = org.fire_employee("S1", "W1")
+    org.display_organization()
+    assert capsys.readouterr().out == ""
+    assert result.ok
+
+
+def test_buffered_sink_collects_messages():
+    sink = BufferedSink()
+    org = build_org(sink)
+    org.employee_quits("W1")
+    assert sink.messages()[-1] == "W1 has been removed from the company."
+    org.display_organization()
+    assert sink.text[-1].startswith("President: P\n")
+    sink.clear()
+    assert sink.messages() == []
+
+
+def test_file_sink_writes_lines():
+    stream = io.StringIO()
+    org = build_org(FileSink(stream))
+    org.fire_employee("V1", "W1")
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Success: Initialized President P."
+    assert lines[-1] == "W1 has been removed from the company."
@@ -0,0 +1,175 @@
+import random
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from employee import DEFAULT_LADDER, RoleLadder, Vacancy
+from main import main
+from results import Status
+from sinks import BufferedSink
+from snapshot import SnapshotError
+from helpers import CHANGES, random_command, DEEP, chart, run
+
+# ---------- ROLE LADDER TESTS ----------
+
+MIX = {**CHANGES, "hire_employee": 2, "employee_quits": 0}
+
+
+def agree_on_random_commands(orgs, seed, steps):
+    # Runs the same random commands on every org and checks they agree after each one.
+    rng = random.Random(seed)
+    for step in range(steps):
+        command = random_command(orgs[0], rng, step, MIX)
+        statuses = [run(org, *command) for org in orgs]
+        assert len(set(statuses)) == 1, command
+        assert len({chart(org) for org in orgs}) == 1, command
+
+
+def test_parse():
+    assert DEEP.roles == ("CEO", "EVP", "VP", "Director", "Manager", "Engineer")
+    assert DEEP.capacities == (3, 3, 2, 2, 3, 0)
+    assert DEEP.bottom == 5
+    assert DEEP.codes["Director"] == 3
+    assert DEEP.below(4) == 5
+    assert DEEP.below(5) is None
+    default = RoleLadder.parse("President:2, Vice President:3, Supervisor:5, Worker:0")
+    assert default.roles == DEFAULT_LADDER.roles
+    assert default.capacities == DEFAULT_LADDER.capacities
+
+
+@pytest.mark.parametrize("spec", [
+    "CEO:3",
+    "CEO:3,Engineer",
+    "CEO:3,Engineer:x",
+    "CEO:3,CEO:0",
+    "CEO:3,Engineer:2",
+    "CEO:0,Engineer:0",
+    ",".join(f"R{code}:1" for code in range(200)) + ",Last:0",
+])
+def test_invalid_ladders_are_rejected(spec):
+    with pytest.raises(ValueError):
+        RoleLadder.parse(spec)
+
+
+def test_commands_use_ladder_roles_and_capacities():
+    org = OrganizationManager(sink=BufferedSink(), ladder=DEEP)
+    org.initialize_president("Ada")
+    for name in ("E1", "E2", "E3"):
+        assert org.hire_employee("Ada", name).ok
+    assert org.hire_employee("Ada", "E4").status == Status.CAPACITY_FULL
+    assert org.hire_employee("E1", "V1").ok
+    assert org.hire_employee("V1", "D1").ok
+    assert org.hire_employee("D1", "M1").ok
+    assert org.hire_employee("M1", "Eng1").ok
+    assert org.hire_employee("Eng1", "X").message == "Error: A engineer cannot hire employees."
+    assert chart(org).splitlines() == [
+        "CEO: Ada",
+        "\tEVP: E1",
+        "\t\tVP: V1",
+        "\t\t\tDirector: D1",
+        "\t\t\t\tManager: M1",
+        "\t\t\t\t\tEngineer: Eng1",
+        "\tEVP: E2",
+        "\tEVP: E3",
+    ]
+    # One level up, under the boss of the old boss
+    assert org.promote_employee("D1", "Eng1").ok
+    assert org.layoff_employee("V1", "D1").ok
+
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_opening_search_crosses_every_level(backend):
+    # The closest Manager with room for a laid off Engineer is a second cousin, three levels up
+    org = backend(sink=BufferedSink(), ladder=DEEP)
+    org.initialize_president("Ada")
+    org.hire_employee("Ada", "E1")
+    org.hire_employee("E1", "V1")
+    for vp, director in (("V1", "D1"), ("V1", "D2")):
+        org.hire_employee(vp, director)
+    org.hire_employee("D1", "M1")
+    org.hire_employee("D2", "M2")
+    for name in ("W1", "W2", "W3"):
+        org.hire_employee("M1", name)
+    for name in ("W4", "W5", "W6"):
+        org.hire_employee("M2", name)
+    org.hire_employee("E1", "V2")
+    org.hire_employee("V2", "D3")
+    org.hire_employee("D3", "M3")
+    assert org.layoff_employee("M1", "W1").ok
+    assert [line.strip() for line in chart(org).splitlines()][-2:] == ["Manager: M3", "Engineer: W1"]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_backends_agree_on_custom_ladder(seed):
+    orgs = [backend(sink=BufferedSink(), ladder=DEEP) for backend in (OrganizationManager, ArrayOrganizationManager)]
+    for org in orgs:
+        org.initialize_president("Ada")
+    agree_on_random_commands(orgs, seed, 250)
+
+
+def reference_opening(org, employee):
+    # Brute force: every manager with room for employee's role outside employee's branch, ranked by tree distance,
+    # then by how far up the branch they share with employee starts, then by report order.
+    def has_room(spot):
+        return not isinstance(spot, Vacancy) and (len(spot.reports) < org.ladder.capacities[spot.role_code] or spot.vacancies > 0)
+
+    def chain(spot):
+        spots = []
+        while spot is not None:
+            spots.append(spot)
+            spot = spot.boss
+        return spots
+
+    above = chain(employee)
+    preorder, stack = [], [org.president]
+    while stack:
+        spot = stack.pop()
+        preorder.append(spot)
+        stack.extend(reversed(spot.reports))
+    ranked = []
+    for position, spot in enumerate(preorder):
+        spot_chain = chain(spot)
+        if spot.role_code != employee.role_code - 1 or not has_room(spot) or employee in spot_chain:
+            continue
+        up = next(index for index, ancestor in enumerate(above) if ancestor in spot_chain)
+        down = spot_chain.index(above[up])
+        ranked.append((up + down, up, position, spot))
+    return min(ranked, key=lambda entry: entry[:3])[3] if ranked else None
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_opening_search_matches_brute_force(seed):
+    org = OrganizationManager(sink=BufferedSink(), ladder=DEEP)
+    org.initialize_president("Ada")
+    agree_on_random_commands([org], seed, 300)
+    for name in sorted(org.employee_lookup):
+        employee = org._find_employee(name)
+        if employee is org.president:
+            continue
+        assert org._find_opening(employee)[1] is reference_opening(org, employee), name
+
+
+def test_snapshot_needs_a_ladder_with_its_roles(tmp_path):
+    path = str(tmp_path / "org.snap")
+    org = OrganizationManager(sink=BufferedSink(), ladder=DEEP)
+    org.initialize_president("Ada")
+    org.hire_employee("Ada", "E1")
+    org.hire_employee("E1", "V1")
+    org.hire_employee("V1", "D1")
+    org.hire_employee("D1", "M1")
+    org.save(path)
+
+    again = OrganizationManager(sink=BufferedSink(), ladder=DEEP)
+    again.load(path)
+    assert chart(again) == chart(org)
+    with pytest.raises(SnapshotError):
+        OrganizationManager(sink=BufferedSink()).load(path)
+
+
+def test_main_ladder_option(tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    script.write_text("Ada\nHIRE Ada E1\nHIRE E1 V1\nDISPLAY\n")
+    main(["--ladder", "CEO:1,EVP:1,VP:0", "--script", str(script)])
+    assert capsys.readouterr().out.splitlines()[-3:] == ["CEO: Ada", "\tEVP: E1", "\t\tVP: V1"]
+    with pytest.raises(SystemExit):
+        main(["--ladder", "CEO:1,EVP:1,VP:1"])
+    assert "bottom one none" in capsys.readouterr().err
@@ -0,0 +1,161 @@
+import asyncio
+import socket
+import pytest
+from organization_manager import OrganizationManager
+from results import Status
+from server import ERROR, OrganizationServer, read_response
+from sinks import SilentSink
+from helpers import WIDE
+
+# ---------- SERVER TESTS ----------
+
+
+async def started(org=None, **limits):
+    server = OrganizationServer(org if org is not None else OrganizationManager(sink=SilentSink()), **limits)
+    await server.start()
+    return server
+
+
+async def connect(server):
+    host, port = server.address[:2]
+    return await asyncio.open_connection(host, port)
+
+
+async def send(writer, *lines):
+    writer.write("".join(line + "\n" for line in lines).encode())
+    await writer.drain()
+
+
+def test_pipelined_commands_are_answered_in_order():
+    async def scenario():
+        server = await started()
+        reader, writer = await connect(server)
+        await send(writer, "P", "HIRE P V1", "HIRE V1 S1", "HIRE Nobody X", "HIRE P", "DISPLAY", "COUNT V2")
+        responses = [await read_response(reader) for _ in range(7)]
+        writer.close()
+        await server.close()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert [status for _, status in responses] == [
+        Status.OK, Status.OK, Status.OK, Status.NOT_FOUND, ERROR, Status.OK, Status.NOT_FOUND]
+    assert responses[0][0] == "Success: Initialized President P.\n"
+    assert responses[2][0] == "Successfully hired S1 under V1.\n"
+    assert responses[4][0].startswith("Incorrect number of arguments for command HIRE\n")
+    assert responses[5][0] == "President: P\n\tVice President: V1\n\t\tSupervisor: S1\n"
+    assert "Did you mean V1?" in responses[6][0]
+
+
+def test_clients_share_one_organization():
+    async def client(server, number):
+        reader, writer = await connect(server)
+        names = [f"C{number}_{index}" for index in range(30)]
+        await send(writer, *(f"HIRE V{number % 2} {name}" for name in names))
+        statuses = [(await read_response(reader))[1] for _ in names]
+        writer.close()
+        return statuses
+
+    async def scenario():
+        org = OrganizationManager(sink=SilentSink(), ladder=WIDE)
+        org.initialize_president("P")
+        org.hire_employee("P", "V0")
+        org.hire_employee("P", "V1")
+        server = await started(org)
+        statuses = await asyncio.gather(*(client(server, number) for number in range(6)))
+        await server.close()
+        return org, statuses
+
+    org, statuses = asyncio.run(scenario())
+    # Each Vice President has room for 80, three clients hire 90 under each
+    assert sum(status.count(Status.OK) for status in statuses) == 160
+    assert sum(status.count(Status.CAPACITY_FULL) for status in statuses) == 20
+    assert len(org.employee_lookup) == 163
+
+
+def test_display_streams_the_chart_as_it_was():
+    async def scenario():
+        org = OrganizationManager(sink=SilentSink(), ladder=WIDE)
+        org.initialize_president("P")
+        for vp in range(60):
+            org.hire_employee("P", f"V{vp}")
+            for engineer in range(80):
+                org.hire_employee(f"V{vp}", f"E{vp}_{engineer}")
+        org.fire_employee("P", "E0_0")
+        server = await started(org)
+        reader, writer = await connect(server)
+        await send(writer, "DISPLAY", "HIRE V0 Late", "DISPLAY V0 1")
+        chart, status = await read_response(reader)
+        hired = await read_response(reader)
+        branch = await read_response(reader)
+        writer.close()
+        await server.close()
+        return chart, status, hired, branch
+
+    chart, status, hired, branch = asyncio.run(scenario())
+    lines = chart.splitlines()
+    assert status == Status.OK
+    # More lines than one chunk, and none of the hire that ran while it was sent
+    assert len(lines) == 1 + 60 + 60 * 80 - 1
+    assert "Late" not in chart
+    assert hired == ("Successfully hired Late under V0.\n", Status.OK)
+    assert branch[0].splitlines()[-1] == "\tEngineer: Late"
+
+
+def test_small_queues_hold_clients_back_without_losing_commands():
+    async def scenario():
+        org = OrganizationManager(sink=SilentSink(), ladder=WIDE)
+        org.initialize_president("P")
+        org.hire_employee("P", "V")
+        server = await started(org, queue_limit=1, pipeline_limit=2)
+        reader, writer = await connect(server)
+        # Sent in one go, far more than both queues hold
+        await send(writer, *(f"HIRE V E{index}" for index in range(80)), *(f"QUIT E{index}" for index in range(80)))
+        statuses = [(await read_response(reader))[1] for _ in range(160)]
+        writer.close()
+        await server.close()
+        return org, statuses
+
+    org, statuses = asyncio.run(scenario())
+    assert statuses == [Status.OK] * 160
+    assert sorted(org.employee_lookup) == ["P", "V"]
+
+
+def test_transactions_and_undo_are_refused_and_exit_closes():
+    async def scenario():
+        server = await started()
+        reader, writer = await connect(server)
+        await send(writer, "P", "HIRE P V2", "BEGIN", "UNDO", "REDO", "EXIT", "HIRE P V1")
+        await read_response(reader)
+        await read_response(reader)
+        refused = [await read_response(reader) for _ in range(3)]
+        rest = await reader.read()
+        writer.close()
+        await server.close()
+        return server.org_manager, refused, rest
+
+    org, refused, rest = asyncio.run(scenario())
+    assert refused == [("Error: Transactions are not available over the server.\n", Status.NOT_PERMITTED),
+                       ("Error: UNDO and REDO are not available over the server.\n", Status.NOT_PERMITTED),
+                       ("Error: UNDO and REDO are not available over the server.\n", Status.NOT_PERMITTED)]
+    assert "V2" in org.employee_lookup
+    assert rest == b""
+    assert not org.in_transaction
+    assert "V1" not in org.employee_lookup
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available")
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "org.sock")
+
+    async def scenario():
+        server = OrganizationServer(OrganizationManager(sink=SilentSink()))
+        await server.start(path=path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        await send(writer, "P", "HIRE P V1", "FIND V")
+        responses = [await read_response(reader) for _ in range(3)]
+        writer.close()
+        await server.close()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert responses[2] == ("Vice President: V1\nFound 1 names starting with V.\n", Status.OK)
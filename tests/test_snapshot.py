@@ -0,0 +1,124 @@
+import random
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from main import main
+from results import Status
+from sinks import BufferedSink
+from snapshot import SnapshotError
+from helpers import random_command, chart
+
+# ---------- SNAPSHOT TESTS ----------
+
+BACKENDS = [OrganizationManager, ArrayOrganizationManager]
+
+
+def build_random_org(backend, seed, steps=300):
+    rng = random.Random(seed)
+    sink = BufferedSink()
+    org = backend(sink=sink)
+    org.initialize_president("P")
+    for step in range(steps):
+        command = random_command(org, rng, step)
+        getattr(org, command[0])(*command[1:])
+    return org, sink
+
+
+def test_save_and_load_sample_org(tmp_path):
+    path = str(tmp_path / "org.snap")
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.fire_employee("V1", "S1")
+    result = org.save(path)
+    assert result.ok
+    assert result.message == f"Saved 4 positions to {path}."
+
+    sink = BufferedSink()
+    loaded = OrganizationManager(sink=sink)
+    result = loaded.load(path)
+    assert result.message == f"Loaded 4 positions from {path}."
+    assert loaded.all_names == {"P", "V1", "W1"}
+    assert loaded.employee_lookup["W1"].boss.is_vacant()
+    assert chart(loaded).splitlines() == [
+        "President: P",
+        "\tVice President: V1",
+        "\t\tVACANCY: Supervisor",
+        "\t\t\tWorker: W1",
+    ]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("saver", BACKENDS)
+@pytest.mark.parametrize("loader", BACKENDS)
+def test_loaded_org_behaves_like_original(tmp_path, seed, saver, loader):
+    path = str(tmp_path / "org.snap")
+    original, original_sink = build_random_org(saver, seed)
+    original.save(path)
+
+    loaded_sink = BufferedSink()
+    loaded = loader(sink=loaded_sink)
+    loaded.load(path)
+    assert loaded.all_names == original.all_names
+    assert chart(loaded) == chart(original)
+
+    # Openings and labels have to be rebuilt correctly for later commands to match
+    rng = random.Random(seed + 1000)
+    for step in range(200):
+        command = random_command(original, rng, 1000 + step)
+        original_sink.clear()
+        loaded_sink.clear()
+        assert getattr(original, command[0])(*command[1:]).status == getattr(loaded, command[0])(*command[1:]).status
+        assert original_sink.messages() == loaded_sink.messages()
+        assert chart(loaded) == chart(original)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_org_round_trip(tmp_path, backend):
+    path = str(tmp_path / "empty.snap")
+    backend(sink=BufferedSink()).save(path)
+    loaded = backend(sink=BufferedSink())
+    assert loaded.load(path).ok
+    assert loaded.president is None
+    assert loaded.initialize_president("P")
+
+
+def test_load_into_existing_org_is_rejected(tmp_path):
+    path = str(tmp_path / "org.snap")
+    org, _ = build_random_org(OrganizationManager, 0, steps=20)
+    org.save(path)
+    result = org.load(path)
+    assert result.status == Status.NOT_PERMITTED
+
+
+def test_bad_snapshots_raise(tmp_path):
+    bogus = tmp_path / "bogus.snap"
+    bogus.write_bytes(b"not a snapshot at all, just some text")
+    with pytest.raises(SnapshotError):
+        OrganizationManager(sink=BufferedSink()).load(str(bogus))
+
+    path = tmp_path / "org.snap"
+    org, _ = build_random_org(OrganizationManager, 1, steps=50)
+    org.save(str(path))
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(SnapshotError):
+        OrganizationManager(sink=BufferedSink()).load(str(path))
+
+
+def test_main_resumes_from_snapshot(tmp_path, capsys):
+    snapshot = tmp_path / "org.snap"
+    first = tmp_path / "first.txt"
+    first.write_text(f"Nelson\nHIRE Nelson VP1\nSAVE {snapshot}\n")
+    main(["--script", str(first)])
+    assert f"Saved 2 positions to {snapshot}." in capsys.readouterr().out
+
+    second = tmp_path / "second.txt"
+    second.write_text("HIRE VP1 S1\nDISPLAY\n")
+    main(["--load", str(snapshot), "--script", str(second)])
+    assert capsys.readouterr().out.splitlines()[-3:] == [
+        "President: Nelson",
+        "\tVice President: VP1",
+        "\t\tSupervisor: S1",
+    ]
@@ -0,0 +1,163 @@
+import random
+import sqlite3
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from employee import RoleLadder
+from main import main
+from results import Status
+from sinks import BufferedSink
+from sqlite_organization import SqliteOrganizationManager
+from helpers import CHANGES, random_command, WIDE, chart, run
+
+# ---------- SQLITE BACKEND TESTS ----------
+
+MIX = {**CHANGES, "count_employees": 1, "undo": 0.7, "redo": 0.3}
+
+
+def stored_names(path):
+    # Names committed to the database at path, read over a connection of its own.
+    connection = sqlite3.connect(path)
+    try:
+        return {name for (name,) in connection.execute("SELECT name FROM spots WHERE name IS NOT NULL")}
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_sqlite_backend_matches_object_backend(seed):
+    rng = random.Random(seed)
+    object_sink, sqlite_sink = BufferedSink(), BufferedSink()
+    orgs = [OrganizationManager(sink=object_sink), SqliteOrganizationManager(sink=sqlite_sink)]
+    for org in orgs:
+        org.initialize_president("P")
+    for step in range(300):
+        command = random_command(orgs[0], rng, step, MIX)
+        assert run(orgs[0], *command) == run(orgs[1], *command), command
+        assert object_sink.messages() == sqlite_sink.messages()
+        assert chart(orgs[0]) == chart(orgs[1])
+    assert sorted(orgs[1].employee_lookup) == sorted(orgs[0].employee_lookup)
+
+
+def test_sqlite_backend_analytics():
+    org = SqliteOrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.hire_employee("S1", "W2")
+    org.fire_employee("V1", "S1")
+    assert org.headcount_by_role() == {"President": 1, "Vice President": 2, "Supervisor": 0, "Worker": 2}
+    assert org.subtree_headcount("V1") == 2
+    assert org.subtree_headcount("V2") == 0
+    assert org.subtree_headcount("Ghost") is None
+    depths = org.depths()
+    assert depths[org.employee_lookup["W2"]] == 3
+    assert depths[org.employee_lookup["P"]] == 0
+    assert org.employee_lookup.with_prefix("V") == ["V1", "V2"]
+    assert org.employee_lookup.suggest("W3") == ["W1", "W2"]
+    assert org.find_employees("W").message == "Found 2 names starting with W."
+
+
+def test_database_is_picked_up_where_it_was_left(tmp_path):
+    path = str(tmp_path / "org.db")
+    sink = BufferedSink()
+    org = SqliteOrganizationManager(sink=sink, ladder=WIDE, path=path)
+    org.initialize_president("P")
+    for index in range(5):
+        org.hire_employee("P", f"V{index}")
+    org.hire_employee("V1", "E1")
+    org.fire_employee("P", "V3")
+    before = chart(org)
+    org.close()
+
+    reopened = SqliteOrganizationManager(sink=sink, path=path)
+    assert reopened.ladder.roles == WIDE.roles
+    assert chart(reopened) == before
+    assert reopened.hire_employee("V1", "E2").status == Status.OK
+    assert reopened.employee_quits("E1").status == Status.OK
+    reopened.close()
+    with pytest.raises(ValueError):
+        SqliteOrganizationManager(path=path, ladder=RoleLadder.parse("CEO:2,Engineer:0"))
+
+
+def test_changes_are_committed_in_batches(tmp_path):
+    path = str(tmp_path / "org.db")
+    org = SqliteOrganizationManager(sink=BufferedSink(), ladder=WIDE, path=path, batch_size=4)
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    assert stored_names(path) == set()
+    org.hire_employee("P", "V3")
+    assert stored_names(path) == {"P", "V1", "V2", "V3"}
+    # Failed commands keep nothing and do not count toward the batch
+    org.hire_employee("Ghost", "V4")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "E1")
+    assert stored_names(path) == {"P", "V1", "V2", "V3"}
+    org.sync()
+    assert stored_names(path) == {"P", "V1", "V2", "V3", "E1"}
+    org.close()
+
+
+def test_transaction_reaches_the_database_on_commit(tmp_path):
+    path = str(tmp_path / "org.db")
+    org = SqliteOrganizationManager(sink=BufferedSink(), ladder=WIDE, path=path, batch_size=2)
+    org.initialize_president("P")
+    org.hire_employee("P", "V")
+    org.begin()
+    for index in range(10):
+        org.hire_employee("V", f"E{index}")
+    assert stored_names(path) == {"P", "V"}
+    org.rollback()
+    assert stored_names(path) == {"P", "V"}
+    org.begin()
+    for index in range(10):
+        org.hire_employee("V", f"F{index}")
+    org.commit()
+    assert stored_names(path) == {"P", "V"} | {f"F{index}" for index in range(10)}
+    org.close()
+
+
+def test_snapshot_moves_between_backends(tmp_path):
+    snapshot = str(tmp_path / "org.snap")
+    source = ArrayOrganizationManager(sink=BufferedSink(), ladder=WIDE)
+    source.initialize_president("P")
+    for index in range(3):
+        source.hire_employee("P", f"V{index}")
+    for index in range(4):
+        source.hire_employee("V1", f"E{index}")
+    source.fire_employee("P", "V2")
+    source.save(snapshot)
+    sink = BufferedSink()
+    org = SqliteOrganizationManager(sink=sink, ladder=WIDE, path=str(tmp_path / "org.db"))
+    org.load(snapshot)
+    assert chart(org) == chart(source)
+    copy = str(tmp_path / "copy.snap")
+    org.save(copy)
+    loaded = OrganizationManager(sink=BufferedSink(), ladder=WIDE)
+    loaded.load(copy)
+    assert chart(loaded) == chart(source)
+    org.close()
+
+
+def test_main_keeps_the_organization_in_a_database(tmp_path, capsys):
+    database = tmp_path / "org.db"
+    first = tmp_path / "first.txt"
+    first.write_text("Nelson\nHIRE Nelson VP1\nHIRE VP1 S1\n")
+    main(["--database", str(database), "--script", str(first)])
+    capsys.readouterr()
+
+    second = tmp_path / "second.txt"
+    second.write_text("QUIT S1\nHIRE VP1 S2\nDISPLAY\n")
+    main(["--database", str(database), "--script", str(second)])
+    assert capsys.readouterr().out.splitlines()[-3:] == [
+        "President: Nelson",
+        "\tVice President: VP1",
+        "\t\tSupervisor: S2",
+    ]
+    with pytest.raises(SystemExit):
+        main(["--database", str(database), "--ladder", "CEO:2,Engineer:0", "--script", str(second)])
+    with pytest.raises(SystemExit):
+        main(["--database", str(database), "--journal", str(tmp_path / "journal")])
@@ -0,0 +1,76 @@
+import json
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from main import main, run_command
+from results import Status
+from sinks import BufferedSink
+
+# ---------- STATISTICS TESTS ----------
+
+def test_stats_are_off_by_default():
+    org = OrganizationManager(sink=BufferedSink())
+    assert org.stats is None
+    assert "hire_employee" not in vars(org)
+    assert org.report_stats().status == Status.NOT_PERMITTED
+
+
+@pytest.mark.parametrize("backend", [OrganizationManager, ArrayOrganizationManager])
+def test_stats_count_calls_and_failures(backend):
+    org = backend(sink=BufferedSink())
+    stats = org.enable_stats()
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("Ghost", "V2")
+    org.hire_employee("P", "V1")
+    org.employee_quits("P")
+    org.display_organization()
+
+    data = stats.as_dict()["operations"]
+    assert data["hire_employee"]["calls"] == 3
+    assert data["hire_employee"]["errors"] == {Status.NOT_FOUND: 1, Status.DUPLICATE_NAME: 1}
+    assert data["employee_quits"]["errors"] == {Status.PROTECTED: 1}
+    assert data["display_organization"]["errors"] == {}
+    assert sum(data["hire_employee"]["histogram_ns"].values()) == 3
+    assert 0 < data["hire_employee"]["p50_us"] <= data["hire_employee"]["p99_us"]
+
+
+def test_exceptions_are_counted_and_raised():
+    org = OrganizationManager(sink=BufferedSink())
+    stats = org.enable_stats()
+    with pytest.raises(FileNotFoundError):
+        org.load("/nonexistent/org.snap")
+    assert stats.counters["load"].errors == {"FileNotFoundError": 1}
+
+
+def test_disable_stats_removes_wrappers():
+    org = OrganizationManager(sink=BufferedSink())
+    org.enable_stats()
+    org.initialize_president("P")
+    stats = org.disable_stats()
+    org.hire_employee("P", "V1")
+    assert stats.counters["hire_employee"].calls == 0
+    assert "hire_employee" not in vars(org)
+
+
+def test_stats_command(capsys):
+    org = OrganizationManager()
+    org.enable_stats()
+    org.initialize_president("P")
+    org.hire_employee("Ghost", "V1")
+    capsys.readouterr()
+    assert run_command(org, ["STATS"]).ok
+    out = capsys.readouterr().out
+    assert out.splitlines()[0].split() == ["operation", "calls", "errors", "total", "ms", "p50", "us", "p99", "us"]
+    assert "hire_employee" in out
+    assert "not_found" in out
+
+
+def test_stats_json_written_on_exit(tmp_path):
+    script = tmp_path / "script.txt"
+    script.write_text("P\nHIRE P V1\nHIRE P V1\nEXIT\n")
+    dump = tmp_path / "stats.json"
+    main(["--quiet", "--stats-json", str(dump), "--script", str(script)])
+    data = json.loads(dump.read_text())["operations"]
+    assert data["hire_employee"]["calls"] == 2
+    assert data["hire_employee"]["errors"] == {Status.DUPLICATE_NAME: 1}
@@ -0,0 +1,106 @@
+import os
+import pytest
+from array_organization import ArrayOrganizationManager
+from organization_manager import OrganizationManager
+from results import Status
+from server import ERROR
+from sinks import SilentSink
+from tenants import TenantHost
+from helpers import WIDE, chart
+
+# ---------- TENANT HOST TESTS ----------
+
+
+@pytest.fixture
+def host():
+    with TenantHost(workers=2) as host:
+        yield host
+
+
+def test_tenants_keep_their_own_organizations(host):
+    assert host.create("acme") == 0
+    assert host.create("globex") == 1
+    host.run("acme", "P\nHIRE P V1\nHIRE V1 S1")
+    host.run("globex", ["Boss", "HIRE Boss V1"])
+    acme = host.run("acme", ["DISPLAY", "HIRE Nobody X", "HIRE P", "", "COUNT V2"])
+    assert [response.status for response in acme] == [Status.OK, Status.NOT_FOUND, ERROR, Status.NOT_FOUND]
+    assert acme[0].text == "President: P\n\tVice President: V1\n\t\tSupervisor: S1\n"
+    assert acme[2].text.startswith("Incorrect number of arguments for command HIRE\n")
+    assert host.execute("globex", "DISPLAY").text == "President: Boss\n\tVice President: V1\n"
+    assert host.tenants() == {"acme": 0, "globex": 1}
+
+
+def test_submitted_batches_run_in_order(host):
+    host.create("acme", ladder=WIDE)
+    host.run("acme", ["P", "HIRE P V"])
+    futures = [host.submit("acme", [f"HIRE V E{index}", f"QUIT E{index - 1}"]) for index in range(50)]
+    statuses = [response.status for future in futures for response in future.result()]
+    # Every QUIT but the first finds the Engineer the batch before hired
+    assert statuses == [Status.OK, Status.NOT_FOUND] + [Status.OK, Status.OK] * 49
+    assert host.execute("acme", "DISPLAY V 1").text == "VP: V\n\tEngineer: E49\n"
+
+
+def test_move_keeps_the_chart_and_order(host):
+    host.create("acme", worker=0)
+    host.run("acme", ["P", "HIRE P V1", "HIRE V1 S1", "HIRE S1 W1"])
+    before = host.submit("acme", ["HIRE S1 W2"])
+    host.move("acme", 1)
+    after = host.run("acme", ["HIRE S1 W3", "DISPLAY"])
+    assert before.result()[0].status == Status.OK
+    assert after[0].status == Status.OK
+    assert after[1].text.splitlines()[-3:] == ["\t\t\tWorker: W1", "\t\t\tWorker: W2", "\t\t\tWorker: W3"]
+    assert host.tenants() == {"acme": 1}
+    # The undo history stayed with the old worker, only the hire after the move can be undone
+    assert [response.status for response in host.run("acme", ["UNDO", "UNDO"])] == [Status.OK, Status.NOT_PERMITTED]
+
+
+def test_snapshot_restores_on_any_backend(host):
+    host.create("acme", ladder=WIDE)
+    host.run("acme", ["P"] + [f"HIRE P V{index}" for index in range(3)] + [f"HIRE V1 E{index}" for index in range(5)])
+    host.run("acme", ["FIRE P V1"])
+    snapshot = host.snapshot("acme")
+    org = ArrayOrganizationManager(sink=SilentSink(), ladder=snapshot[0])
+    org._import_preorder(*snapshot[1:])
+    assert chart(org) == host.execute("acme", "DISPLAY").text
+    host.restore("copy", snapshot)
+    assert host.execute("copy", "DISPLAY").text == chart(org)
+    host.drop("acme")
+    with pytest.raises(KeyError):
+        host.run("acme", ["DISPLAY"])
+    assert list(host.tenants()) == ["copy"]
+
+
+def test_saved_tenant_loads_into_a_new_one(host, tmp_path):
+    path = str(tmp_path / "acme.snap")
+    host.create("acme")
+    saved = host.run("acme", ["P", "HIRE P V1", "HIRE V1 S1", f"SAVE {path}"])[-1]
+    assert saved.status == Status.OK
+    host.create("again", path=path)
+    org = OrganizationManager(sink=SilentSink())
+    org.load(path)
+    assert host.execute("again", "DISPLAY").text == chart(org)
+
+
+def test_errors_reach_the_caller(host, tmp_path):
+    host.create("acme")
+    with pytest.raises(ValueError):
+        host.create("acme")
+    with pytest.raises(FileNotFoundError):
+        host.create("missing", path=str(tmp_path / "missing.snap"))
+    assert "missing" not in host.tenants()
+    host.run("acme", ["P"])
+    refused = host.execute("acme", "BEGIN")
+    assert refused.status == Status.NOT_PERMITTED
+    assert refused.text == "Error: Transactions are not available on a hosted tenant.\n"
+    # The worker is still serving after the failed create
+    assert host.execute("acme", "HIRE P V1").status == Status.OK
+
+
+def test_workers_run_in_their_own_processes():
+    with TenantHost(workers=3) as host:
+        pids = {worker.process.pid for worker in host.workers}
+        for index in range(6):
+            host.create(f"t{index}")
+        assert sorted(host.tenants().values()) == [0, 0, 1, 1, 2, 2]
+    assert len(pids) == 3 and os.getpid() not in pids
+    assert all(not worker.process.is_alive() for worker in host.workers)
@@ -0,0 +1,189 @@
+import random
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from journal import Journal, read_journal
+from main import main
+from results import Status
+from sinks import BufferedSink
+from helpers import random_command, chart
+
+# ---------- TRANSACTION TESTS ----------
+
+BACKENDS = [OrganizationManager, ArrayOrganizationManager]
+REORGANIZATION = {"hire_employee": 1, "fire_employee": 1, "transfer_employee": 1, "promote_employee": 1}
+
+
+def build(backend):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    for manager, name in (("P", "V1"), ("P", "V2"), ("V1", "S1"), ("V2", "S2"), ("S1", "W1"), ("S1", "W2")):
+        org.hire_employee(manager, name)
+    return org
+
+
+def reorganize(org, rng, steps):
+    # Random changes, as a scripted reorganization would make them.
+    for step in range(steps):
+        method, *args = random_command(org, rng, step, REORGANIZATION)
+        getattr(org, method)(*args)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(4))
+def test_rollback_restores_the_organization(backend, seed):
+    org = build(backend)
+    before = chart(org)
+    history = list(org.history)
+    assert org.begin().ok
+    reorganize(org, random.Random(seed), 150)
+    assert org.rollback().ok
+    assert chart(org) == before
+    assert list(org.history) == history
+    assert not org.in_transaction
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_commit_keeps_changes_and_a_failure_rolls_them_back(backend):
+    org = build(backend)
+    org.begin()
+    org.transfer_employee("P", "W1", "S2")
+    org.hire_employee("S2", "W3")
+    result = org.commit()
+    assert result.message == "Committed 2 commands."
+    after = chart(org)
+    assert "\t\t\tWorker: W3" in after
+
+    org.begin()
+    assert org.promote_employee("V1", "W2").ok
+    assert org.hire_employee("Nobody", "X").status == Status.NOT_FOUND
+    result = org.commit()
+    assert result.status == Status.NOT_PERMITTED
+    assert result.message == "Error: 1 commands in the transaction failed, rolled back 1 changes."
+    assert chart(org) == after
+
+
+def test_undo_inside_a_transaction_stays_inside_it():
+    org = build(OrganizationManager)
+    org.begin()
+    org.hire_employee("S2", "W3")
+    assert org.undo().ok
+    assert org.undo().status == Status.NOT_PERMITTED
+    assert org.commit().status == Status.NOT_PERMITTED
+    assert "W1" in org.employee_lookup and "W3" not in org.employee_lookup
+    # The commit above rolled back, and everything from before it can still be undone one by one
+    assert org.undo().message == "Undid hire_employee(S1, W2)."
+
+
+def test_transaction_errors():
+    org = build(OrganizationManager)
+    assert org.commit().message == "Error: No transaction is open."
+    assert org.rollback().message == "Error: No transaction is open."
+    org.begin()
+    assert org.begin().message == "Error: A transaction is already open."
+    assert org.save("unused.snap").status == Status.NOT_PERMITTED
+    org.rollback()
+
+
+def test_context_manager():
+    org = build(OrganizationManager)
+    before = chart(org)
+    with pytest.raises(KeyError):
+        with org.transaction():
+            org.fire_employee("P", "S1")
+            raise KeyError("stop")
+    assert chart(org) == before
+
+    with org.transaction() as transaction:
+        org.fire_employee("P", "S1")
+        org.employee_quits("Nobody")
+    assert transaction.result.status == Status.NOT_PERMITTED
+    assert chart(org) == before
+
+    with org.transaction() as transaction:
+        org.fire_employee("P", "S1")
+    assert transaction.result.ok
+    assert "S1" not in org.employee_lookup
+    with org.transaction():
+        with pytest.raises(RuntimeError):
+            with org.transaction():
+                pass
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_journal_holds_transactions_back_until_commit(tmp_path, backend):
+    org = backend(sink=BufferedSink())
+    journal = Journal(str(tmp_path))
+    journal.recover(org)
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.begin()
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.commit()
+    org.begin()
+    org.hire_employee("P", "V2")
+    org.rollback()
+    org.begin()
+    org.fire_employee("P", "V1")
+    journal.sync()
+    # The last transaction is still open, so only what was committed is on disk
+    records = read_journal(journal._path("journal", journal.segment))
+    assert records[-1] == ["transaction", ["hire_employee", "V1", "S1"], ["hire_employee", "S1", "W1"]]
+    org.rollback()
+    journal.close()
+
+    again = backend(sink=BufferedSink())
+    assert Journal(str(tmp_path)).recover(again) == 4
+    assert chart(again) == chart(org)
+    assert len(again.history) == len(org.history)
+
+
+def test_main_transactions(tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    script.write_text("P\nHIRE P V1\nBEGIN\nHIRE V1 S1\nHIRE Nobody X\nCOMMIT\n"
+                      "BEGIN\nHIRE V1 S2\nCOMMIT\nBEGIN\nHIRE S2 W1\nDISPLAY\n")
+    main(["--script", str(script)])
+    out = capsys.readouterr().out
+    assert "Error: 1 commands in the transaction failed, rolled back 1 changes." in out
+    assert "Committed 1 commands." in out
+    assert "Worker: W1" in out
+    assert out.rstrip().endswith("Rolled back 1 changes.")
+    assert "Supervisor: S1" not in out
+
+
+def test_main_rejected_line_fails_the_transaction(tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    script.write_text("P\nBEGIN\nHIRE P V1\nTRANSFER P V1\nHIRE P V2\nCOMMIT\n"
+                      "BEGIN\nHIRE P V3\nSHUFFLE P\nCOMMIT\nDISPLAY\n")
+    main(["--script", str(script)])
+    out = capsys.readouterr().out
+    assert "Error: 1 commands in the transaction failed, rolled back 2 changes." in out
+    assert "Error: 1 commands in the transaction failed, rolled back 1 changes." in out
+    assert "Committed" not in out
+    assert out.rstrip().endswith("President: P")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_change_that_raises_fails_the_transaction(backend):
+    org = build(backend)
+    before = chart(org)
+
+    def broken(employee, new_boss, replacement_index):
+        # Takes the first step of a move, then fails
+        moved(employee, new_boss, replacement_index)
+        raise RuntimeError("move failed half way")
+
+    moved, org._move_employee = org._move_employee, broken
+    org.begin()
+    org.hire_employee("S2", "W3")
+    with pytest.raises(RuntimeError):
+        org.transfer_employee("P", "W1", "S2")
+    result = org.commit()
+    assert result.message == "Error: 1 commands in the transaction failed, rolled back 2 changes."
+    assert chart(org) == before
+    # Outside a transaction the steps taken go into the history, so UNDO puts them back
+    with pytest.raises(RuntimeError):
+        org.transfer_employee("P", "W1", "S2")
+    assert org.undo().ok
+    assert chart(org) == before
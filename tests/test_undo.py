@@ -0,0 +1,188 @@
+import random
+import pytest
+import organization_manager as organization_manager_module
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from employee import Vacancy
+from journal import Journal
+from main import main
+from results import Status
+from sinks import BufferedSink
+from helpers import CHANGES, random_command, DEEP, chart
+
+# ---------- UNDO / REDO TESTS ----------
+
+BACKENDS = [OrganizationManager, ArrayOrganizationManager]
+MIX = {**CHANGES, "hire_employee": 2}
+
+
+def random_change(org, rng, step):
+    method, *args = random_command(org, rng, step, MIX)
+    return getattr(org, method)(*args)
+
+
+def assert_consistent(org):
+    # Labels nest in report order, and the openings index, vacancy counts and counts below match the tree.
+    if isinstance(org, ArrayOrganizationManager):
+        return
+    columns = len(org.ladder.roles) + 1
+    stack = [org.president]
+    while stack:
+        spot = stack.pop()
+        previous = None
+        for report in spot.reports:
+            assert report.boss is spot
+            assert spot.lo < report.lo and report.hi <= spot.hi
+            assert previous is None or previous.hi <= report.lo
+            previous = report
+            stack.append(report)
+        has_room = len(spot.reports) < spot.max_reports or spot.vacancies > 0
+        assert (spot in org.openings) == (not isinstance(spot, Vacancy) and has_room)
+        assert spot.vacancies == sum(isinstance(report, Vacancy) for report in spot.reports)
+        counts, below = [0] * columns, list(spot.reports)
+        while below:
+            report = below.pop()
+            counts[-1 if isinstance(report, Vacancy) else report.role_code] += 1
+            below.extend(report.reports)
+        assert org._counts_below(spot) == counts
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(5))
+def test_undo_walks_back_through_every_change(backend, seed):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    rng = random.Random(seed)
+    charts = [chart(org)]
+    for step in range(250):
+        if random_change(org, rng, step).ok:
+            charts.append(chart(org))
+    final = charts[-1]
+    undone = 0
+    while len(charts) > 1:
+        charts.pop()
+        assert org.undo().ok
+        undone += 1
+        assert chart(org) == charts[-1]
+        assert_consistent(org)
+    assert org.undo().status == Status.NOT_PERMITTED
+    for _ in range(undone):
+        assert org.redo().ok
+    assert chart(org) == final
+    assert_consistent(org)
+    assert org.redo().status == Status.NOT_PERMITTED
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_undo_and_redo_interleaved_on_custom_ladder(backend):
+    org = backend(sink=BufferedSink(), ladder=DEEP)
+    org.initialize_president("Ada")
+    rng = random.Random(7)
+    charts = [chart(org)]
+    for step in range(400):
+        roll = rng.random()
+        if roll < 0.15 and len(charts) > 1:
+            assert org.undo().ok
+            charts.pop()
+        elif roll < 0.2 and org.redo_log:
+            assert org.redo().ok
+            charts.append(chart(org))
+        elif random_change(org, rng, step).ok:
+            charts.append(chart(org))
+        assert chart(org) == charts[-1]
+    assert_consistent(org)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_undo_fire_brings_back_reports_and_name(backend):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    before = chart(org)
+    org.fire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    # The President is full, so V3 takes the Vacancy and S1 with it
+    org.hire_employee("P", "V3")
+    assert org.hire_employee("P", "V4").status == Status.CAPACITY_FULL
+    assert org.undo().message == "Undid hire_employee(P, V3)."
+    assert chart(org).splitlines()[1] == "\tVACANCY: Vice President"
+    org.undo()
+    assert "V1" not in org.employee_lookup
+    org.undo()
+    assert chart(org) == before
+    assert "V1" in org.employee_lookup
+    assert org.fire_employee("V1", "S1").ok
+
+
+def test_new_change_clears_redo():
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.undo()
+    assert org.redo_log
+    org.hire_employee("P", "V2")
+    assert not org.redo_log
+    assert org.redo().message == "Error: Nothing to redo."
+    # Failed commands change nothing and leave no history
+    assert org.hire_employee("Nobody", "X").status == Status.NOT_FOUND
+    assert len(org.history) == 1
+
+
+def test_history_is_bounded(monkeypatch):
+    monkeypatch.setattr(organization_manager_module, "HISTORY_LIMIT", 3)
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    for name in ("V1", "V2"):
+        org.hire_employee("P", name)
+    for name in ("S1", "S2", "S3"):
+        org.hire_employee("V1", name)
+    for _ in range(3):
+        assert org.undo().ok
+    assert org.undo().status == Status.NOT_PERMITTED
+    assert sorted(org.employee_lookup) == ["P", "V1", "V2"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_recovery_replays_undo_and_redo(tmp_path, backend):
+    org = backend(sink=BufferedSink())
+    journal = Journal(str(tmp_path))
+    journal.recover(org)
+    org.initialize_president("P")
+    rng = random.Random(3)
+    for step in range(120):
+        roll = rng.random()
+        if roll < 0.2:
+            org.undo()
+        elif roll < 0.3:
+            org.redo()
+        else:
+            random_change(org, rng, step)
+    journal.close()
+
+    again = backend(sink=BufferedSink())
+    Journal(str(tmp_path)).recover(again)
+    assert chart(again) == chart(org)
+    assert len(again.history) == len(org.history)
+
+
+def test_compaction_starts_a_fresh_history(tmp_path):
+    org = OrganizationManager(sink=BufferedSink())
+    journal = Journal(str(tmp_path), compact_every=3)
+    journal.recover(org)
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    assert org.undo().status == Status.NOT_PERMITTED
+    journal.close()
+
+
+def test_main_undo_and_redo(tmp_path, capsys):
+    script = tmp_path / "script.txt"
+    script.write_text("P\nHIRE P V1\nHIRE V1 S1\nUNDO\nDISPLAY\nREDO\nDISPLAY\nUNDO extra\n")
+    main(["--script", str(script)])
+    out = capsys.readouterr().out
+    assert "Undid hire_employee(V1, S1)." in out
+    assert out.count("Supervisor: S1") == 1
+    assert "Incorrect number of arguments for command UNDO" in out
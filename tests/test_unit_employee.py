@@ -1,6 +1,6 @@
 # test_unit_employee.py
 import pytest
-from employee import Employee, Vacancy, ROLE_CAPACITY
+from employee import Employee, Vacancy, ROLE_CAPACITY, ROLES
 
 # ---------- EMPLOYEE TESTS ----------
 
@@ -54,3 +54,30 @@ def test_is_vacant_true_for_vacancy_false_for_employee():
     v = Vacancy("Vice President", p)
     assert v.is_vacant() is True
     assert p.is_vacant() is False
+
+# ---------- COMPACT REPRESENTATION TESTS ----------
+
+def test_spots_have_no_instance_dict():
+    e = Employee("Alice", "Supervisor", None)
+    vac = Vacancy("Worker", e)
+    assert not hasattr(e, "__dict__")
+    assert not hasattr(vac, "__dict__")
+    with pytest.raises(AttributeError):
+        e.nickname = "Al"
+
+def test_role_is_stored_as_code():
+    e = Employee("Alice", "Supervisor", None)
+    assert e.role_code == ROLES.index("Supervisor")
+    e.role = "Vice President"
+    assert e.role_code == ROLES.index("Vice President")
+    assert e.max_reports == ROLE_CAPACITY["Vice President"]
+
+def test_worker_gets_own_reports_list_on_promotion():
+    sup = Employee("S1", "Supervisor", None)
+    w1 = Employee("W1", "Worker", sup)
+    w2 = Employee("W2", "Worker", sup)
+    assert len(w1.reports) == 0
+    w1.promote()
+    w1.reports.append(Employee("W3", "Worker", w1))
+    assert len(w1.reports) == 1
+    assert len(w2.reports) == 0
@@ -0,0 +1,97 @@
+import random
+from array import array
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from snapshot import VACANT_FLAG, write_snapshot
+from sinks import BufferedSink
+from helpers import CHANGES, random_command, chart
+
+# ---------- VACANCY COMPACTION TESTS ----------
+
+BACKENDS = [OrganizationManager, ArrayOrganizationManager]
+MIX = {**CHANGES, "hire_employee": 2, "employee_quits": 0}
+
+
+def empty_vacancies(org):
+    roles, report_counts, _ = org._export_preorder()
+    return sum(1 for code, count in zip(roles, report_counts) if code & VACANT_FLAG and not count)
+
+
+def build(backend):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("P", "V2")
+    org.hire_employee("V1", "S1")
+    org.hire_employee("S1", "W1")
+    org.hire_employee("V2", "S2")
+    return org
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_last_report_leaving_removes_vacancy(backend):
+    org = build(backend)
+    org.fire_employee("P", "S1")
+    assert "\t\tVACANCY: Supervisor" in chart(org).splitlines()
+    assert org.employee_quits("W1").ok
+    assert chart(org).splitlines() == ["President: P", "\tVice President: V1", "\tVice President: V2", "\t\tSupervisor: S2"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_removal_cascades_up_through_empty_vacancies(backend):
+    org = build(backend)
+    org.fire_employee("P", "V1")
+    org.fire_employee("P", "S1")
+    assert org.layoff_employee("P", "W1").ok
+    assert chart(org).splitlines() == ["President: P", "\tVice President: V2", "\t\tSupervisor: S2", "\t\t\tWorker: W1"]
+    assert org.subtree_vacancies("P") == 0
+    # The President has a free slot again, so a hire appends
+    assert org.hire_employee("P", "V3").ok
+    assert chart(org).splitlines()[-1] == "\tVice President: V3"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_transfer_and_promotion_leave_no_empty_vacancy(backend):
+    org = build(backend)
+    org.fire_employee("P", "S1")
+    assert org.transfer_employee("P", "W1", "S2").ok
+    assert empty_vacancies(org) == 0
+    org.hire_employee("V1", "S3")
+    org.hire_employee("S3", "W2")
+    org.fire_employee("P", "S3")
+    assert org.promote_employee("V1", "W2").ok
+    assert empty_vacancies(org) == 0
+    assert "VACANCY" not in chart(org)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_churn_never_leaves_empty_vacancies(seed):
+    orgs = [backend(sink=BufferedSink()) for backend in BACKENDS]
+    for org in orgs:
+        org.initialize_president("P")
+    rng = random.Random(seed)
+    for step in range(400):
+        command = random_command(orgs[0], rng, step, MIX)
+        statuses = {getattr(org, command[0])(*command[1:]).status for org in orgs}
+        assert len(statuses) == 1, command
+        assert [empty_vacancies(org) for org in orgs] == [0, 0], command
+        assert chart(orgs[0]) == chart(orgs[1]), command
+    assert orgs[0].subtree_vacancies("P") == chart(orgs[0]).count("VACANCY")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_load_compacts_old_snapshots(tmp_path, backend):
+    # President, an empty Vice President Vacancy, a Vice President with a Supervisor Vacancy holding only an empty one
+    path = str(tmp_path / "old.snap")
+    vacant_vp = 1 | VACANT_FLAG
+    vacant_supervisor = 2 | VACANT_FLAG
+    roles = array("B", [0, vacant_vp, 1, vacant_supervisor, 2])
+    report_counts = array("I", [2, 0, 2, 0, 0])
+    write_snapshot(path, roles, report_counts, ["P", "V1", "S1"])
+    org = backend(sink=BufferedSink())
+    assert org.load(path).ok
+    assert chart(org).splitlines() == ["President: P", "\tVice President: V1", "\t\tSupervisor: S1"]
+    assert empty_vacancies(org) == 0
+    assert org.compact_vacancies() == 0
+    assert org.hire_employee("P", "V2").ok
@@ -0,0 +1,123 @@
+import random
+import threading
+import pytest
+from organization_manager import OrganizationManager
+from array_organization import ArrayOrganizationManager
+from results import Status
+from sinks import BufferedSink
+from helpers import CHANGES, random_command, chart
+
+# ---------- VIEW TESTS ----------
+
+BACKENDS = [OrganizationManager, ArrayOrganizationManager]
+MIX = {**CHANGES, "hire_employee": 3, "layoff_employee": 0, "undo": 1}
+
+
+def count_message(org, name):
+    return org.count_employees(name).message
+
+
+def random_change(org, rng, step):
+    method, *args = random_command(org, rng, step, MIX)
+    getattr(org, method)(*args)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(4))
+def test_views_keep_the_organization_they_were_taken_from(backend, seed):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    rng = random.Random(seed)
+    taken = []
+    for step in range(300):
+        random_change(org, rng, step)
+        if step % 25 == 0:
+            name = rng.choice(sorted(org.employee_lookup))
+            taken.append((org.view(sink=BufferedSink()), chart(org), name, count_message(org, name)))
+        if step == 150:
+            org.begin()
+        if step == 200:
+            org.rollback()
+    for view, text, name, counted in taken:
+        assert chart(view) == text
+        assert count_message(view, name) == counted
+    latest = org.view(sink=BufferedSink())
+    assert chart(latest) == chart(org)
+    for name in list(org.employee_lookup)[:20]:
+        assert count_message(latest, name) == count_message(org, name)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_views_share_branches_that_did_not_change(backend):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    for manager, name in (("P", "V1"), ("P", "V2"), ("V1", "S1"), ("V2", "S2")):
+        org.hire_employee(manager, name)
+    first = org.view()
+    assert org.view().president is first.president
+    org.hire_employee("S2", "W1")
+    second = org.view()
+    v1_before, v2_before = first.president.reports
+    v1_after, v2_after = second.president.reports
+    assert v1_after is v1_before
+    assert v2_after is not v2_before
+    assert [spot.name for spot in v2_before.reports[0].reports] == []
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_view_find_save_and_errors(tmp_path, backend):
+    org = backend(sink=BufferedSink())
+    assert org.view().display_organization().status == Status.EMPTY
+    org.initialize_president("Nelson")
+    org.hire_employee("Nelson", "Ned")
+    view = org.view(sink=BufferedSink())
+    org.fire_employee("Nelson", "Ned")
+    org.hire_employee("Nelson", "Nora")
+    assert view.find_employees("N").message == "Found 2 names starting with N."
+    assert "".join(view.sink.text) == "Vice President: Ned\nPresident: Nelson\n"
+    assert view.count_employees("Nora").message == "Error: Employee name Nora does not exist."
+    assert view.display_organization("Nedd").message == "Error: Employee name Nedd does not exist. Did you mean Ned?"
+    path = str(tmp_path / "view.snap")
+    assert view.save(path).ok
+    loaded = backend(sink=BufferedSink())
+    loaded.load(path)
+    assert chart(loaded) == "President: Nelson\n\tVice President: Ned\n"
+
+
+def test_view_reads_while_changes_continue():
+    org = OrganizationManager(sink=BufferedSink())
+    org.initialize_president("P")
+    rng = random.Random(1)
+    for step in range(200):
+        random_change(org, rng, step)
+    view = org.view(sink=BufferedSink())
+    expected = chart(view)
+    charts = []
+
+    def read():
+        for _ in range(50):
+            view.sink.clear()
+            view.display_organization()
+            charts.append("".join(view.sink.text))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for step in range(200, 600):
+        random_change(org, rng, step)
+    reader.join()
+    assert set(charts) == {expected}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_names_given_to_view_skip_the_index(backend):
+    org = backend(sink=BufferedSink())
+    org.initialize_president("P")
+    org.hire_employee("P", "V1")
+    org.hire_employee("V1", "S1")
+    view = org.view(sink=BufferedSink(), names=["V1", "Nobody"])
+    org.hire_employee("V1", "S2")
+    result, chunks = view.chart_chunks("V1")
+    assert result.ok
+    assert "".join(chunks) == "Vice President: V1\n\tSupervisor: S1\n"
+    assert view._names is None
+    assert view.display_organization("Nobody").status == Status.NOT_FOUND
@@ -0,0 +1,83 @@
+from chart_reports import ChartReports
+from name_index import NameIndex
+
+# Read-only views of an organization as it was at one point in time.
+#
+# A view is a tree of FrozenSpots, which are never changed once built. The organization keeps the frozen copy of
+# every spot it has made one for and drops it, along with the copies of everyone above, whenever the spot changes,
+# the same way it drops cached chart text. Taking a view only builds copies for the dropped spots, so views share
+# every branch that did not change between them, and memory grows with the changes made, not with the views taken.
+# Nothing a view reads is ever written again, so it can be displayed, counted or saved while the live organization
+# keeps changing, from another thread too. Charts, FIND, COUNT and SAVE come from ChartReports, as they do on the live
+# organization.
+
+class FrozenSpot:
+    __slots__ = ("name", "role", "role_code", "reports", "tally")
+
+    def __init__(self, name, role, role_code, reports):
+        self.name = name            # None for a Vacancy
+        self.role = role
+        self.role_code = role_code
+        self.reports = reports      # Tuple of FrozenSpots in report order
+        self.tally = None           # (counts below, spots per level below), worked out the first time a view asks
+
+class OrganizationView(ChartReports):
+    def __init__(self, president, ladder, sink, known=None):
+        self.president = president  # FrozenSpot, None for an empty organization
+        self.ladder = ladder
+        self.sink = sink
+        self._known = known or {}   # Name to FrozenSpot of the names looked up while the view was taken
+        self._names = None          # NameIndex of the view, built the first time another name is looked up
+
+    @property
+    def employee_lookup(self):
+        # Name to FrozenSpot. A view is not told which names changed, so the first lookup walks the whole tree.
+        if self._names is None:
+            names = {}
+            stack = [self.president] if self.president is not None else []
+            while stack:
+                spot = stack.pop()
+                if spot.name is not None:
+                    names[spot.name] = spot
+                stack.extend(spot.reports)
+            self._names = NameIndex(names)
+        return self._names
+
+    def _find_employee(self, name: str):
+        spot = self._known.get(name)
+        return spot if spot is not None else self.employee_lookup.get(name)
+
+    def _tally(self, root):
+        # Counts below root by role code with vacancies last, and spots on each level below it.
+        # Each FrozenSpot works its own out once, for every view that holds it.
+        columns = len(self.ladder.roles) + 1
+        stack = [(root, False)]
+        while stack:
+            spot, reports_ready = stack.pop()
+            if spot.tally is not None:
+                continue
+            if not reports_ready:
+                stack.append((spot, True))
+                stack.extend((report, False) for report in spot.reports)
+                continue
+            below = [0] * columns
+            levels = [len(spot.reports)] if spot.reports else []
+            for report in spot.reports:
+                below[-1 if report.name is None else report.role_code] += 1
+                report_below, report_levels = report.tally
+                for index, count in enumerate(report_below):
+                    below[index] += count
+                if len(levels) <= len(report_levels):
+                    levels.extend([0] * (len(report_levels) + 1 - len(levels)))
+                for index, count in enumerate(report_levels, 1):
+                    levels[index] += count
+            spot.tally = (below, levels)
+        return root.tally
+
+    def _counts_below(self, spot):
+        # Employees of each role code below spot, vacancies last, from its tally.
+        return list(self._tally(spot)[0])
+
+    def _levels_below(self, spot):
+        # Spots 1, 2, ... levels below spot, from its tally.
+        return list(self._tally(spot)[1])